@@ -1,23 +1,52 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
+from sqlalchemy.orm import selectinload
 from dotenv import load_dotenv
 import os
+import json
 import uuid
+import base64
 from datetime import datetime, date, time
-from database import db, init_db, User, Project, Evaluation, GeneratedIdea, Task, Subtask, SavedProject, TaskInteraction, ScheduleBlock
+from database import db, init_db, User, Project, Evaluation, GeneratedIdea, Task, Subtask, SavedProject, TaskInteraction, ScheduleBlock, AIBatch, json_loads
 from services.evaluation_service import EvaluationService
 from services.idea_generation_service import IdeaGenerationService
-from auth import hash_password, verify_password, generate_token, require_auth, optional_auth
+from services.judging_service import JudgingService
+from services.batch_service import BatchService
+from services.speculative_service import SpeculativeIdeaService
+from services.score_stats import METRICS as SCORE_METRICS
+from services.scheduler import ai_scheduler, SchedulerOverloaded
+from services.rate_limiter import rate_limit
+from services.idempotency import idempotent
+from services.response_cache import ResponseCache
+from services.upload_streams import UploadRequest, receive_uploads, MAX_FILE_SIZE
+from services.upload_cache import UploadCache
+from services.parser_pool import parser_pool
+from services.pdf_extraction import pool_stats as pdf_pool_stats
+from services.github_client import github_client
+from services.summarizer import summarize
+from services.upload_bundle import build_bundle, is_archive
+from services.file_parser import MIN_DESCRIPTION_WORDS
+from auth import hash_password, verify_password, generate_token, require_auth, optional_auth, require_metrics_token
 
 # Load environment variables from parent directory's .env file
 env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
 load_dotenv(dotenv_path=env_path)
 
 app = Flask(__name__)
+app.request_class = UploadRequest  # spools, size-checks and hashes uploads as they arrive
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_REQUEST_SIZE_MB', 100)) * 1024 * 1024
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///hackathon_helper.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
 
+# Behind a reverse proxy, take the client IP (rate limits, idempotency keys) from X-Forwarded-For.
+# Only trust as many hops as there are proxies in front of the app, or clients can spoof their IP.
+proxy_hops = int(os.getenv('PROXY_FIX_HOPS', 0))
+if proxy_hops:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops, x_host=proxy_hops)
+
 
 CORS(app, resources={r"/api/*": {"origins": ["http://localhost:3001", "http://localhost:3000", "http://localhost:3002", "http://localhost:3004"]}}, supports_credentials=True)
 
@@ -27,6 +56,60 @@ init_db(app)
 # Initialize services
 eval_service = EvaluationService()
 idea_service = IdeaGenerationService()
+judging_service = JudgingService()
+batch_service = BatchService(eval_service, idea_service)
+speculative_service = SpeculativeIdeaService(idea_service)
+
+response_cache = ResponseCache()
+upload_cache = UploadCache()
+
+def request_owner() -> str:
+    """Identify the caller: the user when logged in, else the client IP"""
+    if getattr(request, 'user_id', None):
+        return f"user:{request.user_id}"
+    return f"ip:{request.remote_addr}"
+
+def cached_response(cache_key: str, loader, cache_control: str):
+    """
+    Serve a stored record from the LRU of serialized bodies: strong ETag,
+    the given Cache-Control, 304 on If-None-Match. Records that can change
+    must put their version in cache_key, so a stale body is never served.
+    """
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        payload = loader()
+        if payload is None:
+            return jsonify({'error': 'Not found'}), 404
+        entry = response_cache.put(cache_key, payload)
+    body, etag = entry
+
+    headers = {'ETag': etag, 'Cache-Control': cache_control}
+    if request.if_none_match.contains(etag.strip('"')):
+        return Response(status=304, headers=headers)
+    return Response(body, status=200, mimetype='application/json', headers=headers)
+
+def overloaded_response(e: SchedulerOverloaded):
+    """503 with Retry-After for requests shed by the AI scheduler"""
+    response = jsonify({'error': str(e)})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 503
+
+@app.before_request
+def reject_oversized_bodies():
+    """
+    Reject oversized bodies from Content-Length before reading anything.
+    Multipart bodies are only parsed by the upload routes (receive_uploads),
+    after authentication and rate limiting.
+    """
+    if request.content_length and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        raise RequestEntityTooLarge()
+
+@app.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e):
+    description = e.description if e.description != RequestEntityTooLarge.description else None
+    return jsonify({
+        'error': description or f"Request too large. Max size: {app.config['MAX_CONTENT_LENGTH'] // (1024*1024)}MB"
+    }), 413
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -37,7 +120,23 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/api/metrics', methods=['GET'])
+@require_metrics_token
+def get_metrics():
+    """Operational metrics for capacity tuning (needs METRICS_TOKEN)"""
+    return jsonify({
+        'scheduler': ai_scheduler.stats(),
+        'response_cache': response_cache.stats(),
+        'upload_cache': upload_cache.stats(),
+        'parser_pool': parser_pool.stats(),
+        'pdf_page_pool': pdf_pool_stats(),
+        'github': github_client.stats()
+    })
+
 @app.route('/api/evaluate', methods=['POST'])
+@optional_auth
+@rate_limit('evaluate')
+@idempotent
 def evaluate_project():
     """Evaluate a hackathon project"""
     try:
@@ -48,19 +147,105 @@ def evaluate_project():
             return jsonify({'error': 'Project name and description are required'}), 400
         
         # Check description length
-        if len(data['description'].split()) < 100:
-            return jsonify({'error': 'Description must be at least 100 words'}), 400
+        if len(data['description'].split()) < MIN_DESCRIPTION_WORDS:
+            return jsonify({'error': f'Description must be at least {MIN_DESCRIPTION_WORDS} words'}), 400
         
         # Perform evaluation
-        result = eval_service.evaluate_project(data)
+        result = eval_service.evaluate_project(data, request_owner())
         
         return jsonify(result), 200
         
+    except SchedulerOverloaded as e:
+        return overloaded_response(e)
     except Exception as e:
         print(f"Error in evaluate_project: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def format_event(event: dict, sse: bool) -> str:
+    """One progress event as a Server-Sent Event or an NDJSON line"""
+    if sse:
+        return f"event: {event.get('phase', 'message')}\ndata: {json.dumps(event)}\n\n"
+    return json.dumps(event) + "\n"
+
+@app.route('/api/evaluate/pipeline', methods=['POST'])
+@optional_auth
+@rate_limit('evaluate')
+@receive_uploads
+def evaluate_pipeline():
+    """Parse uploaded files or a GitHub repo and evaluate them in one request, streaming progress"""
+    try:
+        project_data = request.form.to_dict()
+        files = [f for f in request.files.getlist('file') if f.filename]
+        github_url = project_data.pop('github_url', None)
+        
+        # Validate required fields
+        if not project_data.get('name'):
+            return jsonify({'error': 'Project name is required'}), 400
+        if not files and not github_url:
+            return jsonify({'error': 'A file or GitHub URL is required'}), 400
+        
+        sse = 'text/event-stream' in request.headers.get('Accept', '')
+        owner = request_owner()
+    except Exception as e:
+        print(f"Error in evaluate_pipeline: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    
+    def generate():
+        try:
+            # 1. Parse (same rules as the browser flow: uploads or README become the description)
+            yield format_event({'phase': 'parse', 'status': 'started'}, sse)
+            from services.file_parser import fetch_github_repo
+            texts = []
+            if len(files) > 1 or (files and is_archive(files[0].filename)):
+                bundle = build_bundle(files, upload_cache.parse)
+                texts.append(bundle['text'])
+                for row in bundle['manifest']:
+                    yield format_event({'phase': 'parse', 'status': 'file_done', **row}, sse)
+            elif files:
+                text, cached = upload_cache.parse(files[0])
+                texts.append(text)
+                yield format_event({'phase': 'parse', 'status': 'file_done', 'file': files[0].filename, 'chars': len(text), 'cached': cached}, sse)
+            
+            input_type = 'file'
+            if github_url:
+                repo = fetch_github_repo(github_url)
+                texts.append(repo['readme'])
+                project_data['tech_stack'] = ', '.join(repo['languages']) or project_data.get('tech_stack', '')
+                project_data['github_url'] = github_url  # the evaluation profiles the repo from it
+                input_type = 'github'
+            
+            # Each document is already condensed; several of them together may still be over budget
+            condensed = summarize('\n\n'.join(texts))
+            project_data['description'] = condensed['text']
+            word_count = len(project_data['description'].split())
+            yield format_event({'phase': 'parse', 'status': 'done', 'chars': len(project_data['description']), 'words': word_count,
+                                'summarized': condensed['summarized']}, sse)
+            
+            if word_count < MIN_DESCRIPTION_WORDS:
+                yield format_event({'phase': 'error', 'error': f'Description must be at least {MIN_DESCRIPTION_WORDS} words (currently {word_count} words)'}, sse)
+                return
+            
+            # 2-3. Prompt and model, then save
+            for event in eval_service.evaluate_project_stream(project_data, owner, input_type):
+                yield format_event(event, sse)
+        
+        except SchedulerOverloaded as e:
+            yield format_event({'phase': 'error', 'error': str(e), 'retry_after': e.retry_after}, sse)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error in evaluate_pipeline: {str(e)}")
+            yield format_event({'phase': 'error', 'error': str(e)}, sse)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream' if sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/generate-ideas', methods=['POST'])
+@optional_auth
+@rate_limit('ideas')
+@idempotent
 def generate_ideas():
     """Generate personalized project ideas"""
     try:
@@ -72,47 +257,124 @@ def generate_ideas():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        # Reuse a compatible speculative generation if one was started
+        result = speculative_service.take(request_owner(), data)
+        
         # Generate ideas
-        result = idea_service.generate_ideas(data)
+        if result is None:
+            result = idea_service.generate_ideas(data, request_owner())
         
         return jsonify(result), 200
         
+    except SchedulerOverloaded as e:
+        return overloaded_response(e)
     except Exception as e:
         print(f"Error in generate_ideas: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/generate-ideas/speculate', methods=['POST'])
+@optional_auth
+def speculate_ideas():
+    """Start generating ideas from a partially completed questionnaire"""
+    try:
+        data = request.json or {}
+        
+        result = speculative_service.speculate(request_owner(), data)
+        
+        if result['status'] == 'cap_reached':
+            response = jsonify(result)
+            response.headers['Retry-After'] = str(result['retry_after'])
+            return response, 429
+        
+        return jsonify(result), 202 if result['status'] == 'started' else 200
+        
+    except Exception as e:
+        print(f"Error in speculate_ideas: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/generate-ideas/speculate', methods=['DELETE'])
+@optional_auth
+def cancel_speculation():
+    """Cancel the current speculative generation"""
+    try:
+        cancelled = speculative_service.cancel(request_owner())
+        return jsonify({'cancelled': cancelled}), 200
+        
+    except Exception as e:
+        print(f"Error in cancel_speculation: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/recommend-ideas', methods=['POST'])
+@optional_auth
+@rate_limit('ideas')
+def recommend_ideas():
+    """Recommend stored ideas for a questionnaire (falls back to generation)"""
+    try:
+        data = request.json
+        
+        # Validate required fields
+        required_fields = ['skill_level', 'primary_skill', 'languages', 'time_available', 'primary_goal']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'error': f'Missing required field: {field}'}), 400
+        
+        top_k = min(int(request.args.get('top_k', 4)), 20)
+        result = idea_service.recommend_ideas(data, top_k, request_owner())
+        
+        return jsonify(result), 200
+        
+    except SchedulerOverloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        print(f"Error in recommend_ideas: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/upload', methods=['POST'])
+@optional_auth
+@rate_limit('upload')
+@receive_uploads
 def upload_file():
     """Handle file uploads"""
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
         
-        file = request.files['file']
+        files = [f for f in request.files.getlist('file') if f.filename]
         
-        if file.filename == '':
+        if not files:
             return jsonify({'error': 'No file selected'}), 400
         
-        # Check file size
-        max_size = int(os.getenv('MAX_FILE_SIZE_MB', 25)) * 1024 * 1024
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
+        # File size (MAX_FILE_SIZE_MB) is enforced while the upload is received, see UploadRequest
         
-        if file_size > max_size:
-            return jsonify({'error': f'File too large. Max size: {max_size // (1024*1024)}MB'}), 413
+        # Several files or an archive: parse every document in parallel into one budgeted bundle
+        if len(files) > 1 or is_archive(files[0].filename):
+            bundle = build_bundle(files, upload_cache.parse)
+            return jsonify(bundle), 200
         
-        # Parse file based on extension
-        from services.file_parser import parse_file
-        text = parse_file(file)
+        # Parse file based on extension (same bytes + parser version -> cached text)
+        text, cached = upload_cache.parse(files[0])
         
-        return jsonify({'text': text}), 200
+        return jsonify({'text': text, 'cached': cached}), 200
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
         print(f"Error in upload_file: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/upload/limits', methods=['GET'])
+def get_upload_limits():
+    """Upload size limits, so the upload form checks the numbers the server enforces"""
+    response = jsonify({
+        'max_file_mb': MAX_FILE_SIZE // (1024*1024),
+        'max_request_mb': app.config['MAX_CONTENT_LENGTH'] // (1024*1024)
+    })
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response, 200
+
 @app.route('/api/github-fetch', methods=['POST'])
+@optional_auth
+@rate_limit('github')
 def fetch_github():
     """Fetch GitHub repository information"""
     try:
@@ -131,6 +393,188 @@ def fetch_github():
         print(f"Error in fetch_github: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# ============================================
+# STORED RESULT ENDPOINTS
+# ============================================
+
+@app.route('/api/evaluations/<evaluation_id>', methods=['GET'])
+def get_evaluation(evaluation_id):
+    """Fetch a stored evaluation (re-scoring rewrites it, so clients revalidate)"""
+    try:
+        # Stored results are public by id and identical for every caller, so CDNs may cache them
+        # updated_at changes on every re-score, so a rescored row gets a new cache entry and ETag
+        version = db.session.query(Evaluation.updated_at).filter(Evaluation.id == evaluation_id).first()
+        if version is None:
+            return jsonify({'error': 'Not found'}), 404
+        updated_at = version[0].isoformat() if version[0] else 'original'
+        return cached_response(f"evaluation:{evaluation_id}:{updated_at}",
+                               lambda: eval_service.get_evaluation(evaluation_id),
+                               f"public, max-age={os.getenv('EVALUATION_MAX_AGE_SECONDS', 60)}, must-revalidate")
+    except Exception as e:
+        print(f"Error in get_evaluation: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ideas/<idea_id>', methods=['GET'])
+def get_ideas(idea_id):
+    """Fetch a stored idea set (immutable once written)"""
+    try:
+        return cached_response(f"ideas:{idea_id}",
+                               lambda: idea_service.get_ideas(idea_id),
+                               f"public, max-age={os.getenv('IMMUTABLE_MAX_AGE_SECONDS', 31536000)}, immutable")
+    except Exception as e:
+        print(f"Error in get_ideas: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# ============================================
+# SCORE STATISTICS ENDPOINTS
+# ============================================
+
+@app.route('/api/scores/percentile', methods=['GET'])
+def get_score_percentile():
+    """Share of evaluated projects scoring below the given score"""
+    try:
+        score = request.args.get('score', type=float)
+        metric = request.args.get('metric', 'overall')
+        if score is None:
+            return jsonify({'error': 'Score is required'}), 400
+        if metric not in SCORE_METRICS:
+            return jsonify({'error': f'Metric must be one of: {", ".join(SCORE_METRICS)}'}), 400
+        
+        result = eval_service.score_stats.percentile(score, metric, request.args.get('domain'))
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        print(f"Error in get_score_percentile: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/scores/distribution', methods=['GET'])
+def get_score_distribution():
+    """Approximate score quantiles, globally or for one domain"""
+    try:
+        metric = request.args.get('metric', 'overall')
+        if metric not in SCORE_METRICS:
+            return jsonify({'error': f'Metric must be one of: {", ".join(SCORE_METRICS)}'}), 400
+        
+        result = eval_service.score_stats.distribution(metric, request.args.get('domain'))
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        print(f"Error in get_score_distribution: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Top evaluated projects by overall score"""
+    try:
+        limit = min(request.args.get('limit', 10, type=int), 100)
+        
+        leaderboard = eval_service.score_stats.leaderboard(limit, request.args.get('domain'))
+        
+        return jsonify({'leaderboard': leaderboard}), 200
+        
+    except Exception as e:
+        print(f"Error in get_leaderboard: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# ============================================
+# JUDGING ENDPOINTS
+# ============================================
+
+@app.route('/api/judge', methods=['POST'])
+@require_auth
+def judge_projects():
+    """Rank stored projects against each other"""
+    try:
+        data = request.json
+        
+        project_ids = data.get('project_ids')
+        if not isinstance(project_ids, list) or len(project_ids) < 2:
+            return jsonify({'error': 'At least 2 project_ids are required'}), 400
+        
+        result = judging_service.judge_projects(project_ids, data.get('criteria'), request.user_id)
+        
+        return jsonify(result), 201
+        
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except SchedulerOverloaded as e:
+        db.session.rollback()
+        return overloaded_response(e)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in judge_projects: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/judge/<session_id>', methods=['GET'])
+@require_auth
+def get_judging_session(session_id):
+    """Get a stored ranking"""
+    try:
+        result = judging_service.get_session(session_id, request.user_id)
+        if not result:
+            return jsonify({'error': 'Judging session not found'}), 404
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        print(f"Error in get_judging_session: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# ============================================
+# BATCH (DEFERRED) ENDPOINTS
+# ============================================
+
+@app.route('/api/batches', methods=['POST'])
+@require_auth
+def submit_batch():
+    """Submit evaluations or idea generation for deferred bulk processing"""
+    try:
+        data = request.json
+        
+        kind = data.get('kind')
+        items = data.get('items')
+        if kind not in ['evaluation', 'ideas']:
+            return jsonify({'error': 'Kind must be "evaluation" or "ideas"'}), 400
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'Items must be a non-empty list'}), 400
+        
+        if kind == 'evaluation':
+            result = batch_service.submit_evaluations(items, request.user_id, data.get('provider'))
+        else:
+            result = batch_service.submit_idea_generation(items, request.user_id, data.get('provider'))
+        
+        return jsonify(result), 202
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in submit_batch: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/batches/<batch_id>', methods=['GET'])
+@require_auth
+def get_batch(batch_id):
+    """Get batch status (polls the provider while pending)"""
+    try:
+        batch = AIBatch.query.get(batch_id)
+        if not batch:
+            return jsonify({'error': 'Batch not found'}), 404
+        
+        # Verify ownership
+        if batch.user_id != request.user_id:
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        return jsonify(batch_service.get_batch(batch_id)), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in get_batch: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # ============================================
 # AUTHENTICATION ENDPOINTS
 # ============================================
@@ -270,7 +714,18 @@ def logout():
 def get_tasks():
     """Get all tasks for current user"""
     try:
-        tasks = Task.query.filter_by(user_id=request.user_id).order_by(Task.created_at.desc()).all()
+        # Subtasks in one extra SELECT ... IN query instead of one lazy load per task
+        tasks = (Task.query.options(selectinload(Task.subtasks))
+                 .filter_by(user_id=request.user_id).order_by(Task.created_at.desc()).all())
+        
+        # Interaction counts for every task on the board in one grouped query
+        counts = {}
+        rows = (db.session.query(TaskInteraction.task_id, TaskInteraction.type, db.func.count(TaskInteraction.id))
+                .join(Task, Task.id == TaskInteraction.task_id)
+                .filter(Task.user_id == request.user_id)
+                .group_by(TaskInteraction.task_id, TaskInteraction.type).all())
+        for task_id, interaction_type, count in rows:
+            counts[(task_id, interaction_type)] = count
         
         result = []
         for task in tasks:
@@ -285,9 +740,9 @@ def get_tasks():
             } for st in task.subtasks]
             
             # Get interaction counts
-            comments_count = TaskInteraction.query.filter_by(task_id=task.id, type='comment').count()
-            views_count = TaskInteraction.query.filter_by(task_id=task.id, type='view').count()
-            attachments_count = TaskInteraction.query.filter_by(task_id=task.id, type='attachment').count()
+            comments_count = counts.get((task.id, 'comment'), 0)
+            views_count = counts.get((task.id, 'view'), 0)
+            attachments_count = counts.get((task.id, 'attachment'), 0)
             
             result.append({
                 'id': task.id,
@@ -506,6 +961,7 @@ def update_subtask(subtask_id):
 
 @app.route('/api/saved-projects', methods=['POST'])
 @require_auth
+@idempotent
 def save_project():
     """Save an evaluation or idea to user's dashboard"""
     try:
@@ -684,26 +1140,69 @@ def save_project():
         print(f"Error in save_project: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def encode_cursor(created_at, row_id: str) -> str:
+    """Opaque keyset cursor: the (created_at, id) of the last row on a page"""
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple:
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+    created_at, row_id = raw.split('|', 1)
+    return (datetime.fromisoformat(created_at) if created_at else None), row_id
+
+def first_idea_name():
+    """SQL expression for ideas[0].name of a GeneratedIdea, or None when the database has no JSON functions"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return db.func.json_extract(GeneratedIdea.ideas, '$[0].name')
+    if dialect == 'postgresql':
+        return db.func.json_extract_path_text(db.cast(GeneratedIdea.ideas, db.JSON), '0', 'name')
+    return None
+
 @app.route('/api/saved-projects', methods=['GET'])
 @require_auth
 def get_saved_projects():
-    """Get all saved projects for current user"""
+    """Get saved projects for current user, newest first (cursor paginated)"""
     try:
-        saved_projects = SavedProject.query.filter_by(user_id=request.user_id).order_by(SavedProject.created_at.desc()).all()
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+        cursor = request.args.get('cursor')
+        
+        # Names come from outer joins in the same query; the idea name is read
+        # inside the database so the whole ideas blob never reaches Python
+        idea_name = first_idea_name()
+        query = (db.session.query(
+                    SavedProject,
+                    Project.name,
+                    idea_name.label('idea_name') if idea_name is not None else GeneratedIdea.ideas)
+                 .outerjoin(Project, db.and_(SavedProject.saved_type == 'evaluation', Project.id == SavedProject.project_id))
+                 .outerjoin(GeneratedIdea, db.and_(SavedProject.saved_type == 'idea', GeneratedIdea.id == SavedProject.idea_id))
+                 .filter(SavedProject.user_id == request.user_id))
+        
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except (ValueError, UnicodeDecodeError):
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(db.or_(
+                SavedProject.created_at < cursor_created_at,
+                db.and_(SavedProject.created_at == cursor_created_at, SavedProject.id < cursor_id)
+            ))
+        
+        rows = query.order_by(SavedProject.created_at.desc(), SavedProject.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         
         result = []
-        for sp in saved_projects:
+        for sp, project_name, idea_value in rows:
             name = 'Untitled'
-            if sp.saved_type == 'evaluation' and sp.project_id:
-                project = Project.query.get(sp.project_id)
-                if project:
-                    name = project.name
-            elif sp.saved_type == 'idea' and sp.idea_id:
-                generated_idea = GeneratedIdea.query.get(sp.idea_id)
-                if generated_idea:
-                    ideas = generated_idea.get_ideas()
-                    if ideas:
-                        name = ideas[0].get('name', 'Untitled Idea')
+            if sp.saved_type == 'evaluation' and project_name:
+                name = project_name
+            elif sp.saved_type == 'idea' and idea_value is not None:
+                if idea_name is None:
+                    # No JSON support in this database: decode the blob for this page only
+                    ideas = json_loads(idea_value) if idea_value else []
+                    idea_value = ideas[0].get('name') if ideas else None
+                name = idea_value or 'Untitled Idea'
             
             result.append({
                 'id': sp.id,
@@ -715,7 +1214,8 @@ def get_saved_projects():
                 'created_at': sp.created_at.isoformat() if sp.created_at else None
             })
         
-        return jsonify({'saved_projects': result}), 200
+        next_cursor = encode_cursor(rows[-1][0].created_at, rows[-1][0].id) if has_more else None
+        return jsonify({'saved_projects': result, 'next_cursor': next_cursor}), 200
         
     except Exception as e:
         print(f"Error in get_saved_projects: {str(e)}")
@@ -1,4 +1,5 @@
 import jwt
+import hmac
 import bcrypt
 import os
 from datetime import datetime, timedelta
@@ -95,3 +96,21 @@ def optional_auth(f):
         return f(*args, **kwargs)
     
     return decorated_function
+
+def require_metrics_token(f):
+    """Decorator for operational endpoints: requires Authorization: Bearer <METRICS_TOKEN>"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        expected = os.getenv('METRICS_TOKEN')
+        if not expected:
+            # Not configured: the endpoint stays closed
+            return jsonify({'error': 'Not found'}), 404
+        
+        auth_header = request.headers.get('Authorization', '')
+        scheme, _, token = auth_header.partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode('utf-8'), expected.encode('utf-8')):
+            return jsonify({'error': 'Invalid metrics token'}), 401
+        
+        return f(*args, **kwargs)
+    
+    return decorated_function
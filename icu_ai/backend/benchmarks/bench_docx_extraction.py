@@ -0,0 +1,89 @@
+"""
+Compare DOCX extraction time and memory: python-docx vs the streaming
+extractor.
+
+Each (mode, document) run happens in a fresh subprocess so peak RSS is
+measured in isolation. Modes:
+  legacy    - the old parse_docx (python-docx object model, paragraphs only)
+  budget    - extract_docx_text, stopping at the char budget (DOCX_MAX_CHARS)
+  full      - extract_docx_text with no budget (whole document, tables included)
+
+Usage:
+    python benchmarks/make_docx_corpus.py
+    python benchmarks/bench_docx_extraction.py [--repeat 3]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+MODES = ['legacy', 'budget', 'full']
+
+def legacy_extract(path: str) -> str:
+    """The pre-streaming implementation, kept here as the baseline"""
+    import docx
+    doc = docx.Document(path)
+    return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+
+def run_child(mode: str, path: str, repeat: int) -> dict:
+    from services.docx_extraction import extract_docx_text
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if mode == 'legacy':
+            text = legacy_extract(path)
+        elif mode == 'full':
+            text = extract_docx_text(path, max_chars=10 ** 12)['text']
+        else:
+            text = extract_docx_text(path)['text']
+        timings.append(time.perf_counter() - started)
+
+    return {
+        'seconds': min(timings),
+        'chars': len(text),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DOCX extraction')
+    parser.add_argument('--corpus', default=os.path.join(os.path.dirname(__file__), 'corpus'))
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child, args.repeat)))
+        return
+
+    documents = sorted(os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+                       if name.endswith('.docx')) if os.path.isdir(args.corpus) else []
+    if not documents:
+        print(f"No DOCX files in {args.corpus}; run benchmarks/make_docx_corpus.py first")
+        sys.exit(1)
+
+    print(f"{'document':<16} {'KB':>7} {'mode':<7} {'ms':>9} {'chars':>9} {'rss MB':>7}")
+    for path in documents:
+        for mode in args.modes.split(','):
+            completed = subprocess.run(
+                [sys.executable, __file__, '--child', mode, path, '--repeat', str(args.repeat)],
+                capture_output=True, text=True
+            )
+            name = os.path.basename(path)[:-5]
+            size = os.path.getsize(path) // 1024
+            if completed.returncode != 0:
+                error = (completed.stderr.strip().splitlines() or ['failed'])[-1]
+                print(f"{name:<16} {size:>7} {mode:<7} skipped: {error[:60]}")
+                continue
+            r = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"{name:<16} {size:>7} {mode:<7} {r['seconds'] * 1000:>9.1f} {r['chars']:>9} {r['peak_rss_mb']:>7}")
+
+if __name__ == '__main__':
+    main()
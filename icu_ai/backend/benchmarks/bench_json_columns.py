@@ -0,0 +1,177 @@
+"""
+Measure JSON column decode cost on the hot endpoint paths.
+
+Fills a scratch SQLite database with synthetic evaluations and generated
+ideas, loads them through the models, then times only the JSON work each
+endpoint does per request:
+  get_evaluation    - scores + analysis + recommendations of one evaluation
+  save_project      - recommendations (evaluation) or ideas (idea) of one row
+  leaderboard       - analysis of every row, to filter by domain (a raw
+                      column scan in score_stats, so there is no instance to memoize on)
+  repeated_access   - get_analysis() 10 times on the same loaded instance
+  encode            - scores + analysis + recommendations of one evaluation on save
+Modes:
+  legacy    - stdlib json.loads/json.dumps on every access (the old helpers)
+  codec     - database.json_loads/json_dumps on every access, no memo
+  memo      - the model helpers (codec + per-instance memo)
+
+Usage:
+    python benchmarks/bench_json_columns.py [--rows 2000] [--repeat 5]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from make_pdf_corpus import WORDS
+
+MODES = ['legacy', 'codec', 'memo']
+METRICS = ['innovation', 'technical_complexity', 'market_potential', 'feasibility', 'presentation']
+DOMAINS = ['HealthTech', 'EdTech', 'FinTech', 'ClimateTech', 'DevTools']
+
+def sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def make_evaluation(rng: random.Random) -> tuple:
+    """(scores, analysis, recommendations) shaped like evaluation_service output"""
+    scores = {metric: rng.randint(30, 95) for metric in METRICS}
+    scores['overall'] = sum(scores.values()) // len(METRICS)
+    analysis = {
+        'classification': {'primary_domain': rng.choice(DOMAINS), 'secondary_domains': rng.sample(DOMAINS, 2)},
+        'summary': sentence(rng, 120),
+        'scores': {metric: {'score': scores[metric], 'reasoning': sentence(rng, 60)} for metric in METRICS},
+        'strengths': [sentence(rng, 25) for _ in range(6)],
+        'weaknesses': [sentence(rng, 25) for _ in range(6)],
+        'quick_wins': [sentence(rng, 15) for _ in range(5)],
+        'improvements': [{'title': sentence(rng, 6), 'detail': sentence(rng, 40), 'effort': rng.choice(['low', 'medium', 'high'])}
+                         for _ in range(8)],
+        'pitch_suggestions': {'hook': sentence(rng, 20), 'demo_flow': [sentence(rng, 12) for _ in range(5)]}
+    }
+    recommendations = {
+        'quick_wins': analysis['quick_wins'],
+        'improvements': analysis['improvements'],
+        'strengths': analysis['strengths'],
+        'pitch': analysis['pitch_suggestions']
+    }
+    return scores, analysis, recommendations
+
+def make_ideas(rng: random.Random) -> list:
+    return [{
+        'name': sentence(rng, 3),
+        'tagline': sentence(rng, 8),
+        'domain': rng.choice(DOMAINS),
+        'problem': {'statement': sentence(rng, 40), 'audience': sentence(rng, 10)},
+        'solution': {'description': sentence(rng, 80), 'key_features': [sentence(rng, 10) for _ in range(4)]},
+        'technical': {'tech_stack': rng.sample(WORDS, 6)},
+        'milestones': [{'day': day, 'goal': sentence(rng, 15)} for day in range(1, 4)]
+    } for _ in range(5)]
+
+def populate(db, Evaluation, GeneratedIdea, Project, User, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    db.session.add(User(id='bench-user', email='bench@example.com', name='Bench', password_hash='-'))
+    for i in range(rows):
+        project_id = f"bench-project-{i:06d}"
+        db.session.add(Project(id=project_id, user_id='bench-user', name=f"Project {i}", input_type='text'))
+        scores, analysis, recommendations = make_evaluation(rng)
+        evaluation = Evaluation(id=f"bench-eval-{i:06d}", project_id=project_id, overall_score=scores['overall'])
+        evaluation.set_scores(scores)
+        evaluation.set_analysis(analysis)
+        evaluation.set_recommendations(recommendations)
+        db.session.add(evaluation)
+        idea = GeneratedIdea(id=f"bench-idea-{i:06d}", user_id='bench-user')
+        idea.set_questionnaire_data({'skill_level': 'intermediate', 'primary_skill': 'backend'})
+        idea.set_ideas(make_ideas(rng))
+        db.session.add(idea)
+    db.session.commit()
+
+def reader(mode: str, json_loads):
+    """column accessor for a mode: (instance, column, default) -> decoded value"""
+    if mode == 'legacy':
+        return lambda obj, column, default: json.loads(getattr(obj, column)) if getattr(obj, column) else default()
+    if mode == 'codec':
+        return lambda obj, column, default: json_loads(getattr(obj, column)) if getattr(obj, column) else default()
+    return lambda obj, column, default: obj._get_json(column, default)
+
+def time_scenario(fn, instances: list, repeat: int) -> float:
+    """Best-of-repeat seconds for fn over all instances, memo cleared before each pass"""
+    best = None
+    for _ in range(repeat):
+        for obj in instances:
+            obj.__dict__.pop('_json_cache', None)
+        started = time.perf_counter()
+        for obj in instances:
+            fn(obj)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON column decoding')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    scratch.close()
+    os.environ['DATABASE_URL'] = f"sqlite:///{scratch.name}"
+    os.environ['AUTO_MIGRATE'] = 'false'
+
+    from app import app
+    from database import db, Evaluation, GeneratedIdea, Project, User, json_loads, json_dumps, orjson
+
+    try:
+        with app.app_context():
+            populate(db, Evaluation, GeneratedIdea, Project, User, args.rows, args.seed)
+            db.session.expunge_all()
+            evaluations = Evaluation.query.all()
+            ideas = GeneratedIdea.query.all()
+
+            sizes = [len(e.scores) + len(e.analysis) + len(e.recommendations) for e in evaluations]
+            print(f"codec: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+            print(f"{len(evaluations)} evaluations, avg {sum(sizes) / len(sizes) / 1024:.1f} KB JSON; "
+                  f"{len(ideas)} ideas, avg {sum(len(i.ideas) for i in ideas) / len(ideas) / 1024:.1f} KB\n")
+
+            results = {}
+            for mode in MODES:
+                get = reader(mode, json_loads)
+                loads = json.loads if mode == 'legacy' else json_loads
+                scenarios = {
+                    'get_evaluation': (evaluations, lambda e: (get(e, 'scores', dict), get(e, 'analysis', dict),
+                                                              get(e, 'recommendations', dict))),
+                    'save_project (evaluation)': (evaluations, lambda e: get(e, 'recommendations', dict)),
+                    'save_project (idea)': (ideas, lambda i: get(i, 'ideas', list)),
+                    'leaderboard (per row)': (evaluations, lambda e: loads(e.analysis).get('classification')),
+                    'repeated_access (x10)': (evaluations, lambda e: [get(e, 'analysis', dict) for _ in range(10)])
+                }
+                for name, (instances, fn) in scenarios.items():
+                    results.setdefault(name, {})[mode] = time_scenario(fn, instances, args.repeat) / len(instances)
+
+                dumps = json.dumps if mode == 'legacy' else json_dumps
+                decoded = [(e, e.get_scores(), e.get_analysis(), e.get_recommendations()) for e in evaluations]
+                started = time.perf_counter()
+                for e, scores, analysis, recommendations in decoded:
+                    if mode == 'memo':
+                        e.set_scores(scores)
+                        e.set_analysis(analysis)
+                        e.set_recommendations(recommendations)
+                    else:
+                        dumps(scores), dumps(analysis), dumps(recommendations)
+                results.setdefault('encode (per evaluation)', {})[mode] = (time.perf_counter() - started) / len(decoded)
+                db.session.rollback()
+
+            print(f"{'scenario':<28}" + ''.join(f"{mode + ' us':>12}" for mode in MODES) + f"{'speedup':>10}")
+            for name, by_mode in results.items():
+                speedup = by_mode['legacy'] / by_mode['memo'] if by_mode['memo'] else float('inf')
+                print(f"{name:<28}" + ''.join(f"{by_mode[mode] * 1e6:>12.1f}" for mode in MODES) + f"{speedup:>9.1f}x")
+    finally:
+        os.unlink(scratch.name)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Compare PDF extraction throughput and memory across backends.
+
+Each (backend, mode, document) run happens in a fresh subprocess so peak
+RSS is measured in isolation. Modes:
+  legacy    - the old parse_pdf loop (PyPDF2, text +=, first 10 pages)
+  budget    - extract_pdf_text in-process, stopping at the char budget
+  parallel  - extract_pdf_text with the process pool forced on
+  full      - extract_pdf_text with no budget (every page), for raw throughput
+
+Usage:
+    python benchmarks/make_pdf_corpus.py
+    python benchmarks/bench_pdf_extraction.py [--backends pypdf2,pypdf,pymupdf] [--repeat 3]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+MODES = ['legacy', 'budget', 'parallel', 'full']
+
+def legacy_extract(path: str) -> dict:
+    """The pre-engine implementation, kept here as the baseline"""
+    import PyPDF2
+    with open(path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        text = ""
+        pages = 0
+        for page in reader.pages:
+            if pages >= 10:
+                break
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+            pages += 1
+    text = text.strip()[:15000]
+    return {'text': text, 'pages_read': pages}
+
+def run_child(backend: str, mode: str, path: str, repeat: int) -> dict:
+    from services.pdf_extraction import extract_pdf_text
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if mode == 'legacy':
+            result = legacy_extract(path)
+        elif mode == 'parallel':
+            os.environ['PDF_PARALLEL_MIN_PAGES'] = '1'
+            result = extract_pdf_text(path, backend=backend, max_pages=10000)
+        elif mode == 'full':
+            result = extract_pdf_text(path, backend=backend, max_chars=10 ** 9, max_pages=10000, parallel=False)
+        else:
+            result = extract_pdf_text(path, backend=backend, max_pages=10000, parallel=False)
+        timings.append(time.perf_counter() - started)
+
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        'seconds': min(timings),
+        'chars': len(result['text']),
+        'pages_read': result['pages_read'],
+        'peak_rss_mb': round(max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, children) / 1024, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF extraction backends')
+    parser.add_argument('--corpus', default=os.path.join(os.path.dirname(__file__), 'corpus'))
+    parser.add_argument('--backends', default='pypdf2,pypdf,pymupdf')
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', nargs=3, metavar=('BACKEND', 'MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child, args.repeat)))
+        return
+
+    if not os.path.isdir(args.corpus):
+        print(f"Corpus not found at {args.corpus}; run benchmarks/make_pdf_corpus.py first")
+        sys.exit(1)
+    documents = sorted(os.path.join(args.corpus, name) for name in os.listdir(args.corpus) if name.endswith('.pdf'))
+
+    print(f"{'document':<20} {'backend':<9} {'mode':<9} {'ms':>9} {'pages':>6} {'chars':>8} {'pages/s':>9} {'rss MB':>7}")
+    for path in documents:
+        for backend in args.backends.split(','):
+            for mode in args.modes.split(','):
+                if mode == 'legacy' and backend != 'pypdf2':
+                    continue
+                completed = subprocess.run(
+                    [sys.executable, __file__, '--child', backend, mode, path, '--repeat', str(args.repeat)],
+                    capture_output=True, text=True
+                )
+                name = os.path.basename(path)[:-4]
+                if completed.returncode != 0:
+                    error = (completed.stderr.strip().splitlines() or ['failed'])[-1]
+                    print(f"{name:<20} {backend:<9} {mode:<9} skipped: {error[:60]}")
+                    continue
+                r = json.loads(completed.stdout.strip().splitlines()[-1])
+                rate = r['pages_read'] / r['seconds'] if r['seconds'] else 0
+                print(f"{name:<20} {backend:<9} {mode:<9} {r['seconds'] * 1000:>9.1f} {r['pages_read']:>6} "
+                      f"{r['chars']:>8} {rate:>9.0f} {r['peak_rss_mb']:>7}")
+
+if __name__ == '__main__':
+    main()
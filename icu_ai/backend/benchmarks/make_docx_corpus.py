@@ -0,0 +1,92 @@
+"""
+Generate a synthetic DOCX corpus for the extraction benchmarks.
+
+The documents are minimal WordprocessingML packages written with zipfile
+(paragraphs plus tech-stack / timeline style tables), so no DOCX-writing
+library is needed and the corpus is identical for a given seed.
+
+Usage:
+    python benchmarks/make_docx_corpus.py [--out benchmarks/corpus] [--seed 7]
+"""
+import os
+import random
+import zipfile
+import argparse
+from xml.sax.saxutils import escape
+from make_pdf_corpus import WORDS
+
+# name -> (paragraphs, words per paragraph, tables, rows per table)
+DOCUMENTS = {
+    'small_writeup': (60, 40, 1, 6),
+    'design_doc': (2000, 60, 20, 12),
+    'long_report': (20000, 60, 100, 20)
+}
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+def _paragraph(text: str) -> str:
+    # Split into two runs like a real editor would
+    middle = len(text) // 2
+    return (f'<w:p><w:r><w:t xml:space="preserve">{escape(text[:middle])}</w:t></w:r>'
+            f'<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{escape(text[middle:])}</w:t></w:r></w:p>')
+
+def _table(rng: random.Random, rows: int) -> str:
+    cells = []
+    for _ in range(rows):
+        row = ''.join(
+            f'<w:tc><w:tcPr><w:tcW w:w="2000" w:type="dxa"/></w:tcPr>{_paragraph(" ".join(rng.choice(WORDS) for _ in range(3)))}</w:tc>'
+            for _ in range(4)
+        )
+        cells.append(f'<w:tr>{row}</w:tr>')
+    return f'<w:tbl><w:tblPr><w:tblW w:w="0" w:type="auto"/></w:tblPr>{"".join(cells)}</w:tbl>'
+
+def build_docx(path: str, paragraphs: int, words: int, tables: int, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    table_every = max(paragraphs // max(tables, 1), 1)
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        with archive.open('word/document.xml', 'w') as part:
+            part.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                       b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+            for i in range(paragraphs):
+                part.write(_paragraph(' '.join(rng.choice(WORDS) for _ in range(words))).encode('utf-8'))
+                if tables and i % table_every == table_every - 1:
+                    part.write(_table(rng, rows).encode('utf-8'))
+            part.write(b'<w:sectPr/></w:body></w:document>')
+
+def make_corpus(out_dir: str, seed: int = 7) -> list:
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i, (name, (paragraphs, words, tables, rows)) in enumerate(DOCUMENTS.items()):
+        path = os.path.join(out_dir, f"{name}.docx")
+        build_docx(path, paragraphs, words, tables, rows, seed + i)
+        paths.append(path)
+        print(f"  {path}: {paragraphs} paragraphs, {tables} tables, {os.path.getsize(path) // 1024} KB")
+    return paths
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the DOCX benchmark corpus')
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(__file__), 'corpus'))
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"Writing DOCX corpus to {args.out}")
+    make_corpus(args.out, args.seed)
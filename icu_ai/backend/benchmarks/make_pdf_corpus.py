@@ -0,0 +1,97 @@
+"""
+Generate a synthetic PDF corpus for the extraction benchmarks.
+
+The PDFs are written by hand (plain PDF 1.4 objects with Helvetica text
+streams), so no PDF-writing library is needed and the corpus is identical
+on every machine for a given seed.
+
+Usage:
+    python benchmarks/make_pdf_corpus.py [--out benchmarks/corpus] [--seed 7]
+"""
+import os
+import random
+import argparse
+
+WORDS = (
+    "hackathon prototype users latency model dataset api frontend backend deploy "
+    "judges demo pitch impact scalable secure realtime dashboard onboarding mobile "
+    "accessibility pipeline embeddings inference cache queue sensor payments health "
+    "climate education community open source analytics workflow privacy feedback"
+).split()
+
+# name -> (pages, lines per page, words per line)
+DOCUMENTS = {
+    'small_writeup': (3, 45, 12),
+    'pitch_deck': (24, 8, 6),
+    'design_doc': (40, 50, 13),
+    'long_report': (200, 50, 13)
+}
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def _page_stream(rng: random.Random, lines: int, words_per_line: int) -> bytes:
+    rows = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+    for _ in range(lines):
+        line = ' '.join(rng.choice(WORDS) for _ in range(words_per_line))
+        rows.append(f"({_escape(line)}) Tj T*")
+    rows.append("ET")
+    return "\n".join(rows).encode('latin-1')
+
+def build_pdf(pages: int, lines: int, words_per_line: int, seed: int) -> bytes:
+    """Return the bytes of a text-only PDF"""
+    rng = random.Random(seed)
+    objects = []  # object bodies; object number = index + 1
+
+    # 1: catalog, 2: page tree, 3: font, then (page, content) pairs
+    page_numbers = [4 + 2 * i for i in range(pages)]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = ' '.join(f"{n} 0 R" for n in page_numbers)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_number in page_numbers:
+        stream = _page_stream(rng, lines, words_per_line)
+        objects.append((
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>"
+        ).encode())
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    parts = [b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"]
+    offsets = []
+    position = len(parts[0])
+    for number, body in enumerate(objects, start=1):
+        chunk = f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+        offsets.append(position)
+        parts.append(chunk)
+        position += len(chunk)
+
+    xref = [f"xref\n0 {len(objects) + 1}\n", "0000000000 65535 f \n"]
+    xref += [f"{offset:010d} 00000 n \n" for offset in offsets]
+    parts.append(''.join(xref).encode())
+    parts.append((
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{position}\n%%EOF\n"
+    ).encode())
+    return b''.join(parts)
+
+def make_corpus(out_dir: str, seed: int = 7) -> list:
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i, (name, (pages, lines, words_per_line)) in enumerate(DOCUMENTS.items()):
+        path = os.path.join(out_dir, f"{name}.pdf")
+        with open(path, 'wb') as f:
+            f.write(build_pdf(pages, lines, words_per_line, seed + i))
+        paths.append(path)
+        print(f"  {path}: {pages} pages, {os.path.getsize(path) // 1024} KB")
+    return paths
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the PDF benchmark corpus')
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(__file__), 'corpus'))
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"Writing PDF corpus to {args.out}")
+    make_corpus(args.out, args.seed)
@@ -0,0 +1,203 @@
+"""
+Check that the hot endpoint queries use indexes.
+
+Calls the endpoints behind the task board, saved projects, today's
+schedule, analytics, leaderboard and evaluation lookups through the Flask
+test client, captures every SELECT they send to the database, and runs
+EXPLAIN on exactly that SQL. Exits with status 1 if any of them has to scan
+a whole table. On PostgreSQL sequential scans are disabled for the session,
+so a Seq Scan in the plan means no usable index exists (not just that the
+table is small).
+
+The requests run against a few placeholder rows inside one transaction
+that is rolled back at the end (route commits become savepoints), so the
+database is left as it was.
+
+Usage:
+    python check_query_plans.py [--verbose]
+"""
+import os
+import re
+import sys
+import json
+from datetime import date, datetime, time, timedelta
+
+os.environ.setdefault('AUTO_MIGRATE', 'false')
+
+from sqlalchemy import event, text
+from app import app, encode_cursor
+from auth import generate_token
+from database import db, User, Task, Project, Evaluation, GeneratedIdea, SavedProject, ScheduleBlock
+
+USER_ID = '00000000-0000-0000-0000-000000000000'
+IDS = {
+    'task_id': '00000000-0000-0000-0000-000000000001',
+    'project_id': '00000000-0000-0000-0000-000000000002',
+    'evaluation_id': '00000000-0000-0000-0000-000000000003',
+    'idea_id': '00000000-0000-0000-0000-000000000004'
+}
+
+# (method, path, JSON body); {placeholders} are filled from IDS and the seeded cursor
+HOT_REQUESTS = [
+    ('GET', '/api/tasks', None),
+    ('GET', '/api/saved-projects', None),
+    ('GET', '/api/saved-projects?limit=1&cursor={cursor}', None),
+    ('GET', '/api/schedule', None),
+    ('GET', '/api/analytics/completed', None),
+    ('GET', '/api/analytics/efficiency', None),
+    ('GET', '/api/evaluations/{evaluation_id}', None),
+    ('GET', '/api/leaderboard', None),
+    ('GET', '/api/leaderboard?domain=EdTech', None),
+    ('POST', '/api/saved-projects', {'type': 'evaluation', 'project_id': '{project_id}', 'create_task': False}),
+    ('POST', '/api/tasks/{task_id}/subtasks', {'title': 'Query plan check'})
+]
+
+def seed(session) -> dict:
+    """Placeholder rows so every request reaches its queries; returns the path values"""
+    now = datetime.utcnow()
+    session.add(User(id=USER_ID, email='query-plan-check@example.invalid', password_hash='-', name='Query plan check'))
+    session.add(Task(id=IDS['task_id'], user_id=USER_ID, title='Query plan check'))
+    session.add(Project(id=IDS['project_id'], user_id=USER_ID, name='Query plan check', input_type='text'))
+    evaluation = Evaluation(id=IDS['evaluation_id'], project_id=IDS['project_id'], overall_score=50, primary_domain='EdTech')
+    evaluation.set_scores({'overall': 50})
+    evaluation.set_analysis({'classification': {'primary_domain': 'EdTech'}})
+    evaluation.set_recommendations({})
+    session.add(evaluation)
+    idea = GeneratedIdea(id=IDS['idea_id'], user_id=USER_ID)
+    idea.set_questionnaire_data({})
+    idea.set_ideas([{'name': 'Query plan check'}])
+    session.add(idea)
+    newest = SavedProject(id='00000000-0000-0000-0000-000000000005', user_id=USER_ID, saved_type='idea',
+                          idea_id=IDS['idea_id'], created_at=now)
+    session.add(newest)
+    session.add(SavedProject(id='00000000-0000-0000-0000-000000000006', user_id=USER_ID, saved_type='evaluation',
+                             project_id=IDS['project_id'], created_at=now - timedelta(minutes=1)))
+    session.add(ScheduleBlock(id='00000000-0000-0000-0000-000000000007', user_id=USER_ID, title='Query plan check',
+                              start_time=time(9), end_time=time(10), date=date.today()))
+    session.commit()
+    return {**IDS, 'cursor': encode_cursor(newest.created_at, newest.id)}
+
+def fill(value, values: dict):
+    if isinstance(value, str):
+        return value.format(**values)
+    if isinstance(value, dict):
+        return {k: fill(v, values) for k, v in value.items()}
+    return value
+
+def capture_queries(conn) -> list:
+    """Run HOT_REQUESTS on `conn`; returns (request, statement, parameters) for each distinct SELECT"""
+    captured = []
+    current = {'request': None}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current['request'] and statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            captured.append((current['request'], statement, parameters))
+    event.listen(conn, 'before_cursor_execute', before_cursor_execute)
+
+    # Flask-SQLAlchemy resolves the session's bind from db.engines, so point the default bind at
+    # our connection; the session joins the outer transaction and its commits only release savepoints
+    engines = db.engines
+    engine = engines[None]
+    engines[None] = conn
+    db.session.remove()
+    db.session.configure(join_transaction_mode='create_savepoint')
+    try:
+        values = seed(db.session)
+        headers = {'Authorization': f"Bearer {generate_token(USER_ID, 'query-plan-check@example.invalid')}"}
+        client = app.test_client()
+        for method, template, body in HOT_REQUESTS:
+            path, body = fill(template, values), fill(body, values)
+            current['request'] = method + ' ' + re.sub(r'{(\w+)}', r'<\1>', template)
+            response = client.open(path, method=method, json=body, headers=headers)
+            current['request'] = None
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.get_data(as_text=True)}")
+    finally:
+        event.remove(conn, 'before_cursor_execute', before_cursor_execute)
+        db.session.remove()
+        db.session.configure(join_transaction_mode='conservative_savepoint')
+        engines[None] = engine
+
+    distinct = []
+    seen = set()
+    for request_name, statement, parameters in captured:
+        if (request_name, statement) not in seen:
+            seen.add((request_name, statement))
+            distinct.append((request_name, statement, parameters))
+    return distinct
+
+def sqlite_full_scans(conn, sql: str, parameters) -> tuple:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    plan = [row[-1] for row in rows]
+    scans = []
+    for detail in plan:
+        match = re.match(r'^SCAN (?:TABLE )?(\w+)', detail)
+        if match and 'USING' not in detail:
+            scans.append(match.group(1))
+    return scans, plan
+
+def postgres_full_scans(conn, sql: str, parameters) -> tuple:
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+    def walk(node):
+        if node.get('Node Type') == 'Seq Scan':
+            scans.append(node.get('Relation Name'))
+        for child in node.get('Plans', []):
+            walk(child)
+    walk(plan[0]['Plan'])
+    return scans, [json.dumps(plan[0]['Plan'])]
+
+def main():
+    verbose = '--verbose' in sys.argv
+    failures = 0
+    with app.app_context():
+        dialect = db.engine.dialect
+        if dialect.name not in ('sqlite', 'postgresql'):
+            print(f"Unsupported database: {dialect.name}")
+            sys.exit(2)
+
+        conn = db.engine.connect()
+        sqlite_isolation = None
+        if dialect.name == 'sqlite':
+            # pysqlite defers BEGIN until the first write, which would make the route savepoints
+            # outermost (their RELEASE commits); emit BEGIN ourselves, as SQLAlchemy documents
+            raw = conn.connection.driver_connection
+            sqlite_isolation, raw.isolation_level = raw.isolation_level, None
+            event.listen(conn, 'begin', lambda c: c.exec_driver_sql('BEGIN'))
+
+        outer = conn.begin()
+        try:
+            queries = capture_queries(conn)
+            check = sqlite_full_scans if dialect.name == 'sqlite' else postgres_full_scans
+            for request_name, statement, parameters in queries:
+                with conn.begin_nested():
+                    scans, plan = check(conn, statement, parameters)
+
+                tables = re.search(r'\bFROM\s+"?(\w+)', statement, re.IGNORECASE)
+                name = f"{request_name} ({tables.group(1) if tables else 'query'})"
+                if scans:
+                    failures += 1
+                    print(f"[FULL SCAN] {name}: {', '.join(sorted(set(scans)))}")
+                else:
+                    print(f"[OK] {name}")
+                if verbose or scans:
+                    print(f"      {' '.join(statement.split())}")
+                    for line in plan:
+                        print(f"      {line}")
+        finally:
+            outer.rollback()
+            if sqlite_isolation is not None:
+                conn.connection.driver_connection.isolation_level = sqlite_isolation
+            conn.close()
+
+    if failures:
+        print(f"\n{failures} hot quer{'y' if failures == 1 else 'ies'} scan whole tables; run `python migrate.py` or add an index")
+        sys.exit(1)
+    print("\nAll hot queries use indexes")
+
+if __name__ == '__main__':
+    main()
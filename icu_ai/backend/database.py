@@ -1,9 +1,98 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy import types
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects.postgresql import JSONB
+import os
 import json
 
+try:
+    import orjson
+except ImportError:  # optional: the stdlib codec is used instead
+    orjson = None
+
 db = SQLAlchemy()
 
+def json_dumps(value) -> str:
+    """Encode a JSON column value (orjson when installed, stdlib json otherwise)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except TypeError:
+            pass  # e.g. ints larger than 64 bits; the stdlib handles them
+    return json.dumps(value)
+
+def json_loads(raw):
+    """Decode a JSON column value; raises ValueError on bad JSON with either codec"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+class _json_as_text(FunctionElement):
+    """A JSON column read back as text (see JSONText.column_expression)"""
+    type = types.Text()
+    name = 'json_as_text'
+    inherit_cache = True
+
+@compiles(_json_as_text)
+def _compile_json_as_text(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+@compiles(_json_as_text, 'postgresql')
+def _compile_json_as_text_postgresql(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS TEXT)"
+
+class JSONText(types.TypeDecorator):
+    """
+    A JSON document column: JSONB on PostgreSQL, text elsewhere.
+
+    The mapped attribute always holds the encoded string, on every database,
+    so loading a row never decodes it; the model's get_ helpers decode on
+    first access and memoize (see JSONColumns). On PostgreSQL values are
+    read back as text and bound with a ::JSONB cast, which also keeps
+    writes working on a column that is still TEXT (before migration 0002).
+    """
+    impl = types.Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(types.Text())
+
+    def bind_processor(self, dialect):
+        return None
+
+    def result_processor(self, dialect, coltype):
+        return None
+
+    def column_expression(self, column):
+        return _json_as_text(column)
+
+class JSONColumns:
+    """
+    Memoized decoding for JSON columns. The decoded value is cached per
+    instance together with the string it came from, so any change to the
+    column (set_ helper, assignment, refresh after commit) invalidates it.
+    Callers must treat returned values as read-only and write through set_.
+    """
+
+    def _get_json(self, column: str, default):
+        raw = getattr(self, column)
+        if not raw:
+            return default()
+        cache = self.__dict__.setdefault('_json_cache', {})
+        cached = cache.get(column)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        value = json_loads(raw)
+        cache[column] = (raw, value)
+        return value
+
+    def _set_json(self, column: str, value) -> None:
+        raw = json_dumps(value)
+        setattr(self, column, raw)
+        self.__dict__.setdefault('_json_cache', {})[column] = (raw, value)
+
 def init_db(app):
     """Initialize database with app"""
     db.init_app(app)
@@ -20,6 +109,11 @@ def init_db(app):
                 cursor.close()
         
         db.create_all()
+        
+        # Changes to existing tables (indexes etc.) come from versioned migrations
+        if os.getenv('AUTO_MIGRATE', 'true').lower() == 'true':
+            from migrations import run_migrations
+            run_migrations(db.engine)
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -30,6 +124,7 @@ class User(db.Model):
     name = db.Column(db.String(255), nullable=False)
     avatar_url = db.Column(db.Text)
     status_message = db.Column(db.String(255))
+    plan = db.Column(db.String(20), nullable=False, default='free')  # Rate limit plan (see services/rate_limiter.py)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -56,43 +151,49 @@ class Project(db.Model):
     tasks = db.relationship('Task', backref='project', lazy=True)
     saved_projects = db.relationship('SavedProject', backref='project', lazy=True)
 
-class Evaluation(db.Model):
+class Evaluation(JSONColumns, db.Model):
     __tablename__ = 'evaluations'
+    __table_args__ = (
+        db.Index('ix_evaluations_project_id', 'project_id'),
+        db.Index('ix_evaluations_primary_domain_overall_score', 'primary_domain', 'overall_score')
+    )
     
     id = db.Column(db.String(36), primary_key=True)
     project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False)
-    overall_score = db.Column(db.Integer)
-    scores = db.Column(db.Text)  # JSON string
-    analysis = db.Column(db.Text)  # JSON string
-    recommendations = db.Column(db.Text)  # JSON string
+    overall_score = db.Column(db.Integer, index=True)
+    scores = db.Column(JSONText)
+    analysis = db.Column(JSONText)
+    recommendations = db.Column(JSONText)
     readiness_level = db.Column(db.String(50))
+    primary_domain = db.Column(db.String(100))  # analysis.classification.primary_domain, for per-domain leaderboards
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime)  # set when re-scoring rewrites the row; part of the response cache key
     
     def set_scores(self, scores_dict):
-        self.scores = json.dumps(scores_dict)
+        self._set_json('scores', scores_dict)
     
     def get_scores(self):
-        return json.loads(self.scores) if self.scores else {}
+        return self._get_json('scores', dict)
     
     def set_analysis(self, analysis_dict):
-        self.analysis = json.dumps(analysis_dict)
+        self._set_json('analysis', analysis_dict)
     
     def get_analysis(self):
-        return json.loads(self.analysis) if self.analysis else {}
+        return self._get_json('analysis', dict)
     
     def set_recommendations(self, recommendations_dict):
-        self.recommendations = json.dumps(recommendations_dict)
+        self._set_json('recommendations', recommendations_dict)
     
     def get_recommendations(self):
-        return json.loads(self.recommendations) if self.recommendations else {}
+        return self._get_json('recommendations', dict)
 
-class GeneratedIdea(db.Model):
+class GeneratedIdea(JSONColumns, db.Model):
     __tablename__ = 'generated_ideas'
     
     id = db.Column(db.String(36), primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
-    questionnaire_data = db.Column(db.Text)  # JSON string
-    ideas = db.Column(db.Text)  # JSON string
+    questionnaire_data = db.Column(JSONText)
+    ideas = db.Column(JSONText)
     selected_idea_index = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -101,19 +202,20 @@ class GeneratedIdea(db.Model):
     saved_projects = db.relationship('SavedProject', backref='idea', lazy=True)
     
     def set_questionnaire_data(self, data_dict):
-        self.questionnaire_data = json.dumps(data_dict)
+        self._set_json('questionnaire_data', data_dict)
     
     def get_questionnaire_data(self):
-        return json.loads(self.questionnaire_data) if self.questionnaire_data else {}
+        return self._get_json('questionnaire_data', dict)
     
     def set_ideas(self, ideas_list):
-        self.ideas = json.dumps(ideas_list)
+        self._set_json('ideas', ideas_list)
     
     def get_ideas(self):
-        return json.loads(self.ideas) if self.ideas else []
+        return self._get_json('ideas', list)
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (db.Index('ix_tasks_user_id_created_at', 'user_id', 'created_at'),)
     
     id = db.Column(db.String(36), primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -135,6 +237,7 @@ class Task(db.Model):
 
 class Subtask(db.Model):
     __tablename__ = 'subtasks'
+    __table_args__ = (db.Index('ix_subtasks_task_id_order_index', 'task_id', 'order_index'),)
     
     id = db.Column(db.String(36), primary_key=True)
     task_id = db.Column(db.String(36), db.ForeignKey('tasks.id'), nullable=False)
@@ -147,6 +250,7 @@ class Subtask(db.Model):
 
 class SavedProject(db.Model):
     __tablename__ = 'saved_projects'
+    __table_args__ = (db.Index('ix_saved_projects_user_id_created_at', 'user_id', 'created_at'),)
     
     id = db.Column(db.String(36), primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -160,6 +264,7 @@ class SavedProject(db.Model):
 
 class TaskInteraction(db.Model):
     __tablename__ = 'task_interactions'
+    __table_args__ = (db.Index('ix_task_interactions_task_id_type', 'task_id', 'type'),)
     
     id = db.Column(db.String(36), primary_key=True)
     task_id = db.Column(db.String(36), db.ForeignKey('tasks.id'), nullable=False)
@@ -173,6 +278,7 @@ class TaskInteraction(db.Model):
 
 class ScheduleBlock(db.Model):
     __tablename__ = 'schedule_blocks'
+    __table_args__ = (db.Index('ix_schedule_blocks_user_id_date_start_time', 'user_id', 'date', 'start_time'),)
     
     id = db.Column(db.String(36), primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -188,3 +294,147 @@ class ScheduleBlock(db.Model):
     user = db.relationship('User', backref='schedule_blocks', lazy=True)
     task = db.relationship('Task', backref='schedule_blocks', lazy=True)
 
+
+class JudgingSession(db.Model):
+    __tablename__ = 'judging_sessions'
+    
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    criteria = db.Column(db.Text)
+    status = db.Column(db.String(20), default='completed')  # completed, failed
+    comparison_count = db.Column(db.Integer, default=0)
+    comparisons = db.Column(db.Text)  # JSON string (comparison log)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    results = db.relationship('JudgingResult', backref='session', lazy=True, cascade='all, delete-orphan',
+                              order_by='JudgingResult.rank')
+    
+    def set_comparisons(self, comparisons_list):
+        self.comparisons = json_dumps(comparisons_list)
+    
+    def get_comparisons(self):
+        return json_loads(self.comparisons) if self.comparisons else []
+
+class JudgingResult(db.Model):
+    __tablename__ = 'judging_results'
+    
+    id = db.Column(db.String(36), primary_key=True)
+    session_id = db.Column(db.String(36), db.ForeignKey('judging_sessions.id'), nullable=False, index=True)
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)  # 1 = best
+    confidence = db.Column(db.Float)  # 0-1, mean confidence of the comparisons involving this project
+    wins = db.Column(db.Integer, default=0)
+    losses = db.Column(db.Integer, default=0)
+    
+    # Relationships
+    project = db.relationship('Project', lazy=True)
+
+class AIBatch(db.Model):
+    __tablename__ = 'ai_batches'
+    
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    kind = db.Column(db.String(20), nullable=False)  # evaluation, ideas
+    provider = db.Column(db.String(20), nullable=False)  # gemini, claude, openai, mock
+    provider_batch_id = db.Column(db.String(255))
+    status = db.Column(db.String(20), default='submitted', index=True)  # submitted, in_progress, fanning_out, completed, failed
+    provider_status = db.Column(db.String(50))
+    request_count = db.Column(db.Integer, default=0)
+    succeeded_count = db.Column(db.Integer, default=0)
+    failed_count = db.Column(db.Integer, default=0)
+    requests = db.Column(db.Text)  # JSON string: custom_id -> original input
+    results = db.Column(db.Text)  # JSON string: custom_id -> {status, result_id | error}
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_polled_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    
+    def set_requests(self, requests_dict):
+        self.requests = json_dumps(requests_dict)
+    
+    def get_requests(self):
+        return json_loads(self.requests) if self.requests else {}
+    
+    def set_results(self, results_dict):
+        self.results = json_dumps(results_dict)
+    
+    def get_results(self):
+        return json_loads(self.results) if self.results else {}
+
+class RescoreJob(db.Model):
+    __tablename__ = 'rescore_jobs'
+    
+    id = db.Column(db.String(36), primary_key=True)
+    profile = db.Column(db.String(100), nullable=False)
+    profile_hash = db.Column(db.String(64))  # sha256 of the profile's weights when the job started
+    status = db.Column(db.String(20), default='running')  # running, completed, superseded
+    last_evaluation_id = db.Column(db.String(36))  # keyset checkpoint
+    processed_count = db.Column(db.Integer, default=0)
+    updated_count = db.Column(db.Integer, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+
+class ScoreSketch(db.Model):
+    __tablename__ = 'score_sketches'
+    
+    key = db.Column(db.String(150), primary_key=True)  # "<generation>:<metric>|<domain or *>"
+    generation = db.Column(db.Integer, nullable=False, default=0, index=True)  # bumped by each rebuild
+    metric = db.Column(db.String(50), nullable=False)
+    domain = db.Column(db.String(100), nullable=False)  # '*' = all domains
+    count = db.Column(db.Integer, default=0)
+    data = db.Column(db.Text)  # JSON string (serialized KLL sketch)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def set_data(self, data_dict):
+        self.data = json_dumps(data_dict)
+    
+    def get_data(self):
+        return json_loads(self.data) if self.data else {}
+
+class RateLimitCounter(db.Model):
+    __tablename__ = 'rate_limit_counters'
+    
+    key = db.Column(db.String(255), primary_key=True)  # "<route class>|<identity>|<window start>"
+    count = db.Column(db.Integer, default=0, nullable=False)
+    expires_at = db.Column(db.Integer, nullable=False, index=True)  # unix seconds
+
+class IdempotencyRecord(db.Model):
+    __tablename__ = 'idempotency_records'
+    
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of caller + endpoint + Idempotency-Key
+    request_hash = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # 'in_progress', 'completed'
+    response_status = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
+    response_mimetype = db.Column(db.String(100))
+    locked_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class GitHubCacheEntry(db.Model):
+    __tablename__ = 'github_cache'
+    
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of "<url>|<accept>"
+    url = db.Column(db.Text, nullable=False)
+    etag = db.Column(db.String(255))
+    status = db.Column(db.Integer)
+    body = db.Column(db.Text)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    validated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class RepoProfile(db.Model):
+    __tablename__ = 'repo_profiles'
+    
+    key = db.Column(db.String(255), primary_key=True)  # "<owner>/<repo>@<commit sha>"
+    owner = db.Column(db.String(100), nullable=False)
+    repo = db.Column(db.String(100), nullable=False)
+    sha = db.Column(db.String(64), nullable=False)
+    profile = db.Column(db.Text)  # JSON string
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def set_profile(self, profile_dict):
+        self.profile = json_dumps(profile_dict)
+    
+    def get_profile(self):
+        return json_loads(self.profile) if self.profile else {}
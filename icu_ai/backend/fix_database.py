@@ -2,18 +2,27 @@
 Script to fix database schema issues by recreating tables with correct schema.
 WARNING: This will delete all existing data!
 """
+import os
+
+# Migrations are re-run (and recorded) explicitly below
+os.environ['AUTO_MIGRATE'] = 'false'
+
 from app import app
+from migrations import run_migrations
+from sqlalchemy import text
 from database import db, User, Project, Evaluation, GeneratedIdea, Task, Subtask, SavedProject, TaskInteraction, ScheduleBlock
-import os
 
 def fix_database():
     """Drop all tables and recreate them with the correct schema"""
     with app.app_context():
         print("Dropping all existing tables...")
         db.drop_all()
+        with db.engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
         
         print("Creating tables with correct schema...")
         db.create_all()
+        run_migrations(db.engine)
         
         print("Database schema fixed successfully!")
         print("\nTables created:")
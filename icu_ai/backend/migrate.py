@@ -0,0 +1,32 @@
+"""
+Apply pending schema migrations (see migrations/__init__.py).
+
+Usage:
+    python migrate.py            # apply everything pending
+    python migrate.py --status   # list migrations and whether they are applied
+"""
+import os
+import sys
+
+# Run the migrations here, with output, instead of silently during app start-up
+os.environ['AUTO_MIGRATE'] = 'false'
+
+from app import app
+from database import db
+from migrations import run_migrations, status
+
+def main():
+    with app.app_context():
+        if '--status' in sys.argv:
+            for version, description, applied in status(db.engine):
+                print(f"[{'x' if applied else ' '}] {version:04d} {description}")
+            return
+
+        applied = run_migrations(db.engine)
+        if applied:
+            print(f"Applied {len(applied)} migration(s): {', '.join(f'{v:04d}' for v in applied)}")
+        else:
+            print("Database is up to date")
+
+if __name__ == '__main__':
+    main()
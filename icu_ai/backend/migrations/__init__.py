@@ -0,0 +1,118 @@
+"""
+Versioned schema migrations.
+
+db.create_all() only creates missing tables; it never changes a table that
+already exists. Changes to existing tables (indexes, columns, types) go in
+a module in this package named mNNNN_<slug>.py that defines VERSION,
+DESCRIPTION and upgrade(migrator). Applied versions are recorded in the
+schema_migrations table; run them with `python migrate.py` (or at startup
+with AUTO_MIGRATE=true).
+
+Each migration runs on an autocommit connection so PostgreSQL can build
+indexes CONCURRENTLY (without blocking writes), which means a migration is
+not atomic: write every step so it can be re-run (IF NOT EXISTS etc.).
+"""
+import re
+import pkgutil
+import importlib
+from datetime import datetime
+from sqlalchemy import text, inspect
+
+MIGRATION_MODULE = re.compile(r'^m(\d{4})_\w+$')
+
+# Arbitrary key for pg_advisory_lock: one migrating process at a time
+ADVISORY_LOCK_KEY = 7418230
+
+class Migrator:
+    """What a migration's upgrade() gets: the connection plus dialect-aware helpers"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.dialect = conn.dialect.name
+
+    def execute(self, sql: str, **params):
+        return self.conn.execute(text(sql), params)
+
+    def table_exists(self, table: str) -> bool:
+        return inspect(self.conn).has_table(table)
+
+    def column_type(self, table: str, column: str):
+        for info in inspect(self.conn).get_columns(table):
+            if info['name'] == column:
+                return info['type']
+        return None
+
+    def create_index(self, name: str, table: str, columns: list, unique: bool = False) -> None:
+        """Create an index without blocking writes where the database supports it"""
+        if not self.table_exists(table):
+            return
+        column_list = ', '.join(columns)
+        unique_sql = 'UNIQUE ' if unique else ''
+
+        if self.dialect == 'postgresql':
+            # A failed CONCURRENTLY build leaves an INVALID index behind that IF NOT EXISTS would keep
+            valid = self.execute(
+                "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name",
+                name=name
+            ).scalar()
+            if valid is False:
+                print(f"  dropping invalid index {name}")
+                self.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            self.execute(f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column_list})")
+        else:
+            self.execute(f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({column_list})")
+        print(f"  index {name} on {table} ({column_list})")
+
+def discover() -> list:
+    """[(version, module)] for every migration in this package, in version order"""
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        match = MIGRATION_MODULE.match(info.name)
+        if match:
+            module = importlib.import_module(f"{__name__}.{info.name}")
+            if module.VERSION != int(match.group(1)):
+                raise ValueError(f"Migration {info.name} declares VERSION {module.VERSION}")
+            migrations.append((module.VERSION, module))
+    migrations.sort(key=lambda item: item[0])
+    return migrations
+
+def _ensure_table(conn) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, description VARCHAR(255), applied_at TIMESTAMP)"
+    ))
+
+def _applied(conn) -> set:
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+def status(engine) -> list:
+    """[(version, description, applied)] for every known migration"""
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        _ensure_table(conn)
+        applied = _applied(conn)
+    return [(version, module.DESCRIPTION, version in applied) for version, module in discover()]
+
+def run_migrations(engine) -> list:
+    """Apply pending migrations in order; returns the versions applied"""
+    done = []
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        postgres = conn.dialect.name == 'postgresql'
+        if postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {'key': ADVISORY_LOCK_KEY})
+        try:
+            _ensure_table(conn)
+            applied = _applied(conn)
+            for version, module in discover():
+                if version in applied:
+                    continue
+                print(f"Applying migration {version:04d}: {module.DESCRIPTION}")
+                module.upgrade(Migrator(conn))
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:version, :description, :applied_at)"),
+                    {'version': version, 'description': module.DESCRIPTION[:255], 'applied_at': datetime.utcnow()}
+                )
+                done.append(version)
+        finally:
+            if postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': ADVISORY_LOCK_KEY})
+    return done
@@ -0,0 +1,21 @@
+"""
+Secondary indexes for the hot read paths: task board, saved projects,
+today's schedule, evaluation lookup by project and subtask ordering.
+The same indexes are declared on the models for new databases.
+"""
+
+VERSION = 1
+DESCRIPTION = 'Secondary indexes for task, schedule, saved-project and evaluation queries'
+
+INDEXES = [
+    ('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at']),
+    ('ix_task_interactions_task_id_type', 'task_interactions', ['task_id', 'type']),
+    ('ix_schedule_blocks_user_id_date_start_time', 'schedule_blocks', ['user_id', 'date', 'start_time']),
+    ('ix_saved_projects_user_id_created_at', 'saved_projects', ['user_id', 'created_at']),
+    ('ix_evaluations_project_id', 'evaluations', ['project_id']),
+    ('ix_subtasks_task_id_order_index', 'subtasks', ['task_id', 'order_index'])
+]
+
+def upgrade(migrator):
+    for name, table, columns in INDEXES:
+        migrator.create_index(name, table, columns)
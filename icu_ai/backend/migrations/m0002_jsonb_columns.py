@@ -0,0 +1,35 @@
+"""
+Store evaluation and generated-idea JSON as JSONB on PostgreSQL (the
+columns were TEXT holding JSON strings). Other databases keep text, which
+database.JSONText reads and writes the same way, so this is a no-op there.
+
+ALTER COLUMN ... TYPE rewrites the table under an exclusive lock; the
+tables are small enough for that, but run it off-peak on a large database.
+"""
+
+VERSION = 2
+DESCRIPTION = 'JSONB for evaluation scores/analysis/recommendations and generated ideas'
+
+COLUMNS = [
+    ('evaluations', 'scores'),
+    ('evaluations', 'analysis'),
+    ('evaluations', 'recommendations'),
+    ('generated_ideas', 'questionnaire_data'),
+    ('generated_ideas', 'ideas')
+]
+
+def upgrade(migrator):
+    if migrator.dialect != 'postgresql':
+        return
+    for table, column in COLUMNS:
+        if not migrator.table_exists(table):
+            continue
+        current = migrator.column_type(table, column)
+        if current is None or current.__class__.__name__ == 'JSONB':
+            continue
+        # An empty string is not valid JSON; the get_ helpers already read it as no value
+        migrator.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB "
+            f"USING NULLIF({column}, '')::jsonb"
+        )
+        print(f"  {table}.{column}: {current} -> JSONB")
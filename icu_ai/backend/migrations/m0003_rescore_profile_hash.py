@@ -0,0 +1,12 @@
+"""
+Record the scoring profile's hash on rescore jobs so an interrupted job is
+not resumed with different weights.
+"""
+
+VERSION = 3
+DESCRIPTION = 'profile_hash on rescore_jobs'
+
+def upgrade(migrator):
+    if migrator.table_exists('rescore_jobs') and migrator.column_type('rescore_jobs', 'profile_hash') is None:
+        migrator.execute("ALTER TABLE rescore_jobs ADD COLUMN profile_hash VARCHAR(64)")
+        print("  column rescore_jobs.profile_hash")
@@ -0,0 +1,45 @@
+"""
+Store classification.primary_domain on evaluations (indexed with
+overall_score) so per-domain leaderboards filter in SQL instead of
+decoding every row's analysis. Existing rows are backfilled in chunks.
+"""
+from database import json_loads
+from services.score_stats import normalize_domain
+
+VERSION = 4
+DESCRIPTION = 'primary_domain column and index on evaluations'
+
+CHUNK_SIZE = 2000
+
+def upgrade(migrator):
+    if not migrator.table_exists('evaluations'):
+        return
+    if migrator.column_type('evaluations', 'primary_domain') is None:
+        migrator.execute("ALTER TABLE evaluations ADD COLUMN primary_domain VARCHAR(100)")
+        print("  column evaluations.primary_domain")
+
+    # Keyset walk over rows not backfilled yet (re-runnable after an interruption)
+    last_id = ''
+    filled = 0
+    while True:
+        rows = migrator.execute(
+            "SELECT id, CAST(analysis AS TEXT) FROM evaluations WHERE primary_domain IS NULL AND id > :last_id "
+            "ORDER BY id LIMIT :limit",
+            last_id=last_id, limit=CHUNK_SIZE
+        ).fetchall()
+        if not rows:
+            break
+        for evaluation_id, analysis in rows:
+            try:
+                classification = (json_loads(analysis) if analysis else {}).get('classification') or {}
+                domain = normalize_domain(classification.get('primary_domain'))
+            except (ValueError, AttributeError):
+                domain = None
+            if domain:
+                migrator.execute("UPDATE evaluations SET primary_domain = :domain WHERE id = :id",
+                                 domain=domain, id=evaluation_id)
+                filled += 1
+        last_id = rows[-1][0]
+    print(f"  backfilled primary_domain on {filled} evaluations")
+
+    migrator.create_index('ix_evaluations_primary_domain_overall_score', 'evaluations', ['primary_domain', 'overall_score'])
@@ -0,0 +1,18 @@
+"""
+Generations for score sketches: rebuilds write a new generation instead of
+deleting the live rows. Existing rows become generation 0 and their keys
+get the "0:" prefix.
+"""
+
+VERSION = 5
+DESCRIPTION = 'generation column on score_sketches'
+
+def upgrade(migrator):
+    if not migrator.table_exists('score_sketches'):
+        return
+    if migrator.column_type('score_sketches', 'generation') is None:
+        migrator.execute("ALTER TABLE score_sketches ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+        print("  column score_sketches.generation")
+    # Metric names never contain ':', so unprefixed keys are exactly the pre-generation rows
+    migrator.execute("UPDATE score_sketches SET key = '0:' || key WHERE key NOT LIKE '%:%|%'")
+    migrator.create_index('ix_score_sketches_generation', 'score_sketches', ['generation'])
@@ -0,0 +1,16 @@
+"""
+updated_at on evaluations, set by re-scoring. GET /api/evaluations/<id>
+keys its response cache and ETag on it, so a re-scored evaluation is never
+served from a stale entry. Existing rows keep NULL (never re-scored).
+"""
+
+VERSION = 6
+DESCRIPTION = 'updated_at column on evaluations'
+
+def upgrade(migrator):
+    if not migrator.table_exists('evaluations'):
+        return
+    if migrator.column_type('evaluations', 'updated_at') is None:
+        type_name = 'TIMESTAMP' if migrator.dialect == 'postgresql' else 'DATETIME'
+        migrator.execute(f"ALTER TABLE evaluations ADD COLUMN updated_at {type_name}")
+        print("  column evaluations.updated_at")
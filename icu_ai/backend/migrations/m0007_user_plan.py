@@ -0,0 +1,14 @@
+"""
+Rate limit plan on users (was a claim baked into the JWT for 7 days).
+Existing users get the free plan.
+"""
+
+VERSION = 7
+DESCRIPTION = 'plan column on users'
+
+def upgrade(migrator):
+    if not migrator.table_exists('users'):
+        return
+    if migrator.column_type('users', 'plan') is None:
+        migrator.execute("ALTER TABLE users ADD COLUMN plan VARCHAR(20) NOT NULL DEFAULT 'free'")
+        print("  column users.plan")
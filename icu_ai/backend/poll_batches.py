@@ -0,0 +1,21 @@
+"""
+Poll all pending AI batches and store their results.
+Run periodically (e.g. from cron) while deferred batches are in flight.
+"""
+from app import app, batch_service
+
+def poll_batches():
+    """Poll every submitted/in-progress batch once"""
+    with app.app_context():
+        batches = batch_service.poll_pending()
+        
+        if not batches:
+            print("No pending batches.")
+            return
+        
+        for batch in batches:
+            print(f"{batch['id']} [{batch['provider']}] {batch['status']} "
+                  f"({batch['succeeded_count']} ok / {batch['failed_count']} failed of {batch['request_count']})")
+
+if __name__ == '__main__':
+    poll_batches()
@@ -0,0 +1,39 @@
+"""
+Script to recompute overall_score / readiness_level of all stored evaluations
+after the scoring weights change. Safe to interrupt: re-running resumes the
+unfinished job for the same profile (or starts over if that profile's
+weights changed since the job began).
+
+Usage:
+    python rescore_evaluations.py [--profile NAME] [--chunk-size N] [--restart]
+"""
+import argparse
+from app import app
+from services.rescoring_service import BulkRescorer
+from services.score_stats import ScoreStatsService
+
+def rescore_evaluations():
+    parser = argparse.ArgumentParser(description='Bulk re-score stored evaluations')
+    parser.add_argument('--profile', help='Scoring profile name (default: SCORING_PROFILE or "default")')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per chunk')
+    parser.add_argument('--restart', action='store_true', help='Ignore any unfinished job and start over')
+    args = parser.parse_args()
+    
+    with app.app_context():
+        rescorer = BulkRescorer(args.profile, args.chunk_size)
+        print(f"Re-scoring evaluations with profile '{rescorer.profile_name}'...")
+        
+        result = rescorer.run(restart=args.restart)
+        
+        print("\nRe-scoring complete!")
+        print(f"  Job:        {result['job_id']}")
+        print(f"  Processed:  {result['processed']}")
+        print(f"  Updated:    {result['updated']}")
+        print(f"  Time:       {result['seconds']}s ({result['rows_per_second']} rows/s)")
+        
+        if result['updated']:
+            print("\nRebuilding score distributions...")
+            ScoreStatsService().rebuild(args.chunk_size)
+
+if __name__ == '__main__':
+    rescore_evaluations()
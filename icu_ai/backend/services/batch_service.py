@@ -0,0 +1,245 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from database import db, AIBatch, Evaluation
+
+class BatchService:
+    """
+    Deferred bulk mode for evaluations and idea generation.
+
+    Prompts are submitted through AIClient.submit_batch, tracked in the
+    ai_batches table and fanned back into Evaluation / GeneratedIdea rows
+    once the provider reports the batch as finished. A status request never
+    fans out itself: it claims the batch and hands the fan-out to a
+    background thread (poll_batches.py fans out in its own process).
+    """
+
+    def __init__(self, evaluation_service, idea_service):
+        self.evaluation_service = evaluation_service
+        self.idea_service = idea_service
+        self.ai_client = evaluation_service.ai_client
+        self.max_items = int(os.getenv('BATCH_MAX_ITEMS', 1000))
+        self.poll_interval = int(os.getenv('BATCH_POLL_INTERVAL_SECONDS', 60))
+        # A fan-out that has not committed progress for this long is taken over by the next poll
+        self.fan_out_timeout = int(os.getenv('BATCH_FAN_OUT_TIMEOUT_SECONDS', 900))
+        self.executor = ThreadPoolExecutor(max_workers=int(os.getenv('BATCH_FAN_OUT_WORKERS', 2)))
+
+    def submit_evaluations(self, projects: list, user_id: str = None, provider: str = None) -> dict:
+        """Queue project evaluations for deferred processing"""
+        for project_data in projects:
+            if not project_data.get('name') or not project_data.get('description'):
+                raise ValueError('Project name and description are required for every item')
+
+        prompts = [self.evaluation_service._build_evaluation_prompt(p) for p in projects]
+        return self._submit('evaluation', projects, prompts, user_id, provider)
+
+    def submit_idea_generation(self, questionnaires: list, user_id: str = None, provider: str = None) -> dict:
+        """Queue idea generation for deferred processing"""
+        required_fields = ['skill_level', 'primary_skill', 'languages', 'time_available', 'primary_goal']
+        for questionnaire in questionnaires:
+            for field in required_fields:
+                if field not in questionnaire:
+                    raise ValueError(f'Missing required field in questionnaire: {field}')
+
+        prompts = [
+            self.idea_service._build_generation_prompt(self.idea_service._build_user_profile(q))
+            for q in questionnaires
+        ]
+        return self._submit('ideas', questionnaires, prompts, user_id, provider)
+
+    def _submit(self, kind: str, items: list, prompts: list, user_id: str, provider: str) -> dict:
+        if not items:
+            raise ValueError('Batch must contain at least one item')
+        if len(items) > self.max_items:
+            raise ValueError(f'Too many items in batch. Max: {self.max_items}')
+
+        custom_ids = [f'item-{i}' for i in range(len(items))]
+        submitted = self.ai_client.submit_batch(
+            [{'custom_id': cid, 'prompt': prompt} for cid, prompt in zip(custom_ids, prompts)],
+            provider=provider
+        )
+
+        batch = AIBatch(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            kind=kind,
+            provider=submitted['provider'],
+            provider_batch_id=submitted['batch_id'],
+            status='submitted',
+            request_count=len(items)
+        )
+        batch.set_requests(dict(zip(custom_ids, items)))
+        batch.set_results({})
+
+        db.session.add(batch)
+        db.session.commit()
+
+        return self._serialize(batch)
+
+    def get_batch(self, batch_id: str, poll: bool = True) -> dict:
+        """Get a batch, polling the provider first if it is still pending"""
+        batch = AIBatch.query.get(batch_id)
+        if not batch:
+            return None
+
+        if poll and batch.status in ('submitted', 'in_progress', 'fanning_out'):
+            stale_before = datetime.utcnow() - timedelta(seconds=self.poll_interval)
+            if not batch.last_polled_at or batch.last_polled_at <= stale_before:
+                self.poll_batch(batch, background=True)
+
+        return self._serialize(batch)
+
+    def poll_pending(self) -> list:
+        """Poll every unfinished batch (for the cron / nightly job)"""
+        pending = AIBatch.query.filter(AIBatch.status.in_(['submitted', 'in_progress', 'fanning_out'])).all()
+        return [self._serialize(self.poll_batch(batch)) for batch in pending]
+
+    def poll_batch(self, batch: AIBatch, background: bool = False) -> AIBatch:
+        """Check the provider and fan results out into rows once finished (in a thread if background)"""
+        try:
+            status = self.ai_client.get_batch_status(batch.provider, batch.provider_batch_id)
+        except Exception as e:
+            print(f"Error polling batch {batch.id}: {str(e)}")
+            if batch.status != 'fanning_out':
+                batch.last_polled_at = datetime.utcnow()
+                db.session.commit()
+            return batch
+
+        if status['status'] == 'completed':
+            # Only one poller (request or cron) may turn results into rows
+            if self._claim(batch):
+                batch.provider_status = status['provider_status']
+                if background:
+                    db.session.commit()
+                    self.executor.submit(self._fan_out_in_background, current_app._get_current_object(),
+                                         batch.id, status.get('result_ref'))
+                else:
+                    self._fan_out(batch, status.get('result_ref'))
+            return batch
+
+        if batch.status == 'fanning_out':
+            return batch
+
+        batch.provider_status = status['provider_status']
+        batch.last_polled_at = datetime.utcnow()
+
+        if status['status'] == 'in_progress':
+            batch.status = 'in_progress'
+            db.session.commit()
+        elif status['status'] == 'failed':
+            batch.status = 'failed'
+            batch.error = f"Provider reported batch as {status['provider_status']}"
+            batch.completed_at = datetime.utcnow()
+            db.session.commit()
+
+        return batch
+
+    def _claim(self, batch: AIBatch) -> bool:
+        """
+        Compare-and-set the batch to 'fanning_out'. Succeeds for a pending
+        batch, or for a fan-out whose worker stopped committing progress
+        (last_polled_at is refreshed after every stored item).
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.fan_out_timeout)
+        claimed = db.session.execute(
+            db.update(AIBatch)
+            .where(AIBatch.id == batch.id, db.or_(
+                AIBatch.status.in_(['submitted', 'in_progress']),
+                db.and_(AIBatch.status == 'fanning_out', AIBatch.last_polled_at <= stale_before)
+            ))
+            .values(status='fanning_out', last_polled_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+        db.session.commit()
+        db.session.refresh(batch)
+        return claimed
+
+    def _fan_out_in_background(self, app, batch_id: str, result_ref) -> None:
+        with app.app_context():
+            try:
+                self._fan_out(db.session.get(AIBatch, batch_id), result_ref)
+            except Exception as e:
+                # The claim goes stale after BATCH_FAN_OUT_TIMEOUT_SECONDS and the next poll takes over
+                db.session.rollback()
+                print(f"Error fanning out batch {batch_id}: {str(e)}")
+
+    def _fan_out(self, batch: AIBatch, result_ref) -> None:
+        """Turn provider results into Evaluation / GeneratedIdea rows"""
+        try:
+            provider_results = self.ai_client.get_batch_results(batch.provider, batch.provider_batch_id, result_ref)
+        except Exception as e:
+            print(f"Error fetching results for batch {batch.id}: {str(e)}")
+            batch.error = str(e)
+            # Release the claim so the next poll retries
+            batch.status = 'in_progress'
+            db.session.commit()
+            return
+
+        requests_by_id = batch.get_requests()
+        results = batch.get_results()
+
+        for custom_id, item in requests_by_id.items():
+            # Already stored on an earlier, interrupted fan-out
+            if custom_id in results:
+                continue
+
+            outcome = provider_results.get(custom_id, {'error': 'Missing from provider results'})
+            result = None
+            try:
+                if 'error' in outcome:
+                    raise Exception(outcome['error'])
+                result = self._store_result(batch.kind, item, outcome['text'])
+                results[custom_id] = {'status': 'succeeded', 'result_id': result['id']}
+            except Exception as e:
+                db.session.rollback()
+                results[custom_id] = {'status': 'failed', 'error': str(e)}
+
+            # The stored row and its checkpoint commit together, so a crash cannot store an item twice
+            batch.set_results(results)
+            batch.last_polled_at = datetime.utcnow()
+            db.session.commit()
+            if result:
+                self._after_store(batch.kind, result)
+
+        batch.succeeded_count = sum(1 for r in results.values() if r['status'] == 'succeeded')
+        batch.failed_count = sum(1 for r in results.values() if r['status'] == 'failed')
+        batch.status = 'completed'
+        batch.completed_at = datetime.utcnow()
+        db.session.commit()
+
+    def _store_result(self, kind: str, item: dict, response_text: str) -> dict:
+        """Add the item's rows to the session; _fan_out commits them with the checkpoint"""
+        if kind == 'evaluation':
+            analysis = self.evaluation_service._parse_response(response_text)
+            return self.evaluation_service._save_evaluation(item, analysis, commit=False)
+
+        profile = self.idea_service._build_user_profile(item)
+        ideas = self.idea_service._parse_ideas(response_text)
+        return self.idea_service._save_ideas(item, profile, ideas, commit=False)
+
+    def _after_store(self, kind: str, result: dict) -> None:
+        """Bookkeeping _save_evaluation / _save_ideas do after their own commit"""
+        if kind == 'evaluation':
+            evaluation = db.session.get(Evaluation, result['id'])
+            self.evaluation_service.score_stats.record(result['scores'], evaluation.primary_domain)
+        else:
+            self.idea_service._index_ideas(result['id'], result['ideas'])
+
+    def _serialize(self, batch: AIBatch) -> dict:
+        return {
+            'id': batch.id,
+            'kind': batch.kind,
+            'provider': batch.provider,
+            'status': batch.status,
+            'provider_status': batch.provider_status,
+            'request_count': batch.request_count,
+            'succeeded_count': batch.succeeded_count,
+            'failed_count': batch.failed_count,
+            'results': batch.get_results(),
+            'error': batch.error,
+            'created_at': batch.created_at.isoformat() if batch.created_at else None,
+            'completed_at': batch.completed_at.isoformat() if batch.completed_at else None
+        }
@@ -0,0 +1,381 @@
+import io
+import os
+import re
+import ast
+import tokenize
+
+PYTHON_EXTENSIONS = ('.py',)
+C_LIKE_EXTENSIONS = ('.js', '.jsx', '.mjs', '.ts', '.tsx', '.java', '.c', '.h', '.cpp', '.cc', '.hpp', '.cs', '.go', '.kt', '.swift')
+
+LANGUAGE_NAMES = {
+    '.py': 'Python', '.js': 'JavaScript', '.jsx': 'JavaScript (JSX)', '.mjs': 'JavaScript', '.ts': 'TypeScript',
+    '.tsx': 'TypeScript (TSX)', '.java': 'Java', '.c': 'C', '.h': 'C/C++ header', '.cpp': 'C++', '.cc': 'C++',
+    '.hpp': 'C++ header', '.cs': 'C#', '.go': 'Go', '.kt': 'Kotlin', '.swift': 'Swift'
+}
+
+# Limits on what goes into the rendered summary
+MAX_FUNCTIONS = 15
+MAX_CLASSES = 10
+MAX_IMPORTS = 20
+
+TEST_FILE_PATTERN = re.compile(r'(^test_.*\.py$|_test\.(py|go)$|\.(test|spec)\.(js|jsx|ts|tsx|mjs)$|Tests?\.(java|kt|cs)$|_test\.(cpp|cc)$)')
+
+def can_analyze(filename: str) -> bool:
+    return (filename or '').lower().endswith(PYTHON_EXTENSIONS + C_LIKE_EXTENSIONS)
+
+# ============================================
+# Python (ast)
+# ============================================
+
+class _ComplexityVisitor(ast.NodeVisitor):
+    """McCabe-style count of decision points, not descending into nested functions or classes"""
+
+    BRANCHES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler, ast.Assert, ast.comprehension)
+
+    def __init__(self):
+        self.complexity = 1
+
+    def generic_visit(self, node):
+        if isinstance(node, self.BRANCHES):
+            self.complexity += 1
+            if isinstance(node, ast.comprehension):
+                self.complexity += len(node.ifs)
+        elif isinstance(node, ast.BoolOp):
+            self.complexity += len(node.values) - 1
+        elif hasattr(ast, 'match_case') and isinstance(node, ast.match_case):
+            self.complexity += 1
+        super().generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        pass
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+    visit_Lambda = visit_FunctionDef
+
+def _function_info(node, prefix: str = '') -> dict:
+    visitor = _ComplexityVisitor()
+    for child in node.body:
+        visitor.visit(child)
+    args = node.args
+    arg_count = len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs) + bool(args.vararg) + bool(args.kwarg)
+    return {
+        'name': f"{prefix}{node.name}",
+        'line': node.lineno,
+        'lines': (getattr(node, 'end_lineno', None) or node.lineno) - node.lineno + 1,
+        'args': arg_count,
+        'complexity': visitor.complexity,
+        'documented': ast.get_docstring(node) is not None,
+        'async': isinstance(node, ast.AsyncFunctionDef)
+    }
+
+def analyze_python(text: str) -> dict:
+    """Outline and metrics of a Python module; raises SyntaxError if it doesn't parse"""
+    tree = ast.parse(text)
+
+    functions = []
+    classes = []
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            imports.append('.' * node.level + (node.module or ''))
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(_function_info(node))
+        elif isinstance(node, ast.ClassDef):
+            methods = [_function_info(item, f"{node.name}.") for item in node.body
+                       if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            functions += methods
+            classes.append({
+                'name': node.name,
+                'line': node.lineno,
+                'bases': [ast.unparse(base) for base in node.bases] if hasattr(ast, 'unparse') else [],
+                'methods': [method['name'].split('.', 1)[1] for method in methods],
+                'documented': ast.get_docstring(node) is not None
+            })
+
+    comment_lines = 0
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(text).readline):
+            if token.type == tokenize.COMMENT:
+                comment_lines += 1
+    except (tokenize.TokenError, IndentationError):
+        comment_lines = sum(1 for line in text.splitlines() if line.strip().startswith('#'))
+
+    docstring = ast.get_docstring(tree)
+    return {
+        'functions': functions,
+        'classes': classes,
+        'imports': list(dict.fromkeys(name for name in imports if name)),
+        'comment_lines': comment_lines,
+        'module_doc': docstring.strip().splitlines()[0] if docstring else None,
+        'test_functions': sum(1 for f in functions if f['name'].split('.')[-1].startswith('test'))
+    }
+
+# ============================================
+# JavaScript / TypeScript / Java / C++ (tokenizer)
+# ============================================
+
+# Comments, strings and template literals are matched first so braces and keywords inside them are ignored
+TOKEN_PATTERN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)
+  | (?P<preprocessor>^[ \t]*\#[^\n]*)
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<op>&&|\|\||\?\?|=>|[{}()\[\];?:=,<>.@])
+  | (?P<newline>\n)
+  | (?P<other>\S)
+''', re.S | re.M | re.X)
+
+KEYWORDS = {
+    'if', 'for', 'while', 'switch', 'catch', 'return', 'function', 'new', 'else', 'do', 'try', 'typeof',
+    'sizeof', 'throw', 'await', 'async', 'delete', 'in', 'of', 'case', 'super', 'this', 'synchronized', 'using'
+}
+DECISIONS = {'if', 'for', 'while', 'case', 'catch', '&&', '||', '??', '?'}
+CLASS_WORDS = {'class', 'interface', 'struct', 'enum'}
+TEST_CALLS = {'describe', 'it', 'test'}
+
+def _tokenize_c_like(text: str) -> tuple:
+    """Code tokens as (kind, value, line), plus the number of lines holding a comment"""
+    tokens = []
+    comment_lines = set()
+    line = 1
+    for match in TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'newline':
+            line += 1
+            continue
+        if kind == 'comment':
+            comment_lines.update(range(line, line + value.count('\n') + 1))
+        elif kind == 'preprocessor':
+            tokens.append((kind, value.strip(), line))
+        elif kind != 'other' or value not in ' \t\r':
+            tokens.append((kind, value, line))
+        line += value.count('\n')
+    return tokens, len(comment_lines)
+
+def _matching(tokens: list, start: int, open_value: str, close_value: str) -> int:
+    """Index of the token closing the bracket at `start` (or the last token)"""
+    depth = 0
+    for i in range(start, len(tokens)):
+        value = tokens[i][1]
+        if value == open_value:
+            depth += 1
+        elif value == close_value:
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(tokens) - 1
+
+def _body_after(tokens: list, i: int) -> int:
+    """Index of the '{' opening a body shortly after position i, or -1 (declarations, calls)"""
+    for j in range(i, min(i + 12, len(tokens))):
+        value = tokens[j][1]
+        if value == '{':
+            return j
+        if value in (';', '}', '='):
+            return -1
+    return -1
+
+def _after_annotation(tokens: list, i: int) -> int:
+    """Index past a `: Type` annotation (TypeScript return types, C++ initializer lists) starting at i"""
+    if i >= len(tokens) or tokens[i][1] != ':':
+        return i
+    depth = 0
+    for j in range(i + 1, min(i + 80, len(tokens))):
+        value = tokens[j][1]
+        if value in ('<', '(', '[') or (value == '{' and (depth or j == i + 1)):
+            depth += 1
+        elif value in ('>', ')', ']', '}'):
+            depth -= 1
+        elif depth <= 0 and value in ('=>', '{', ';', '='):
+            return j
+    return i
+
+def analyze_c_like(text: str) -> dict:
+    """Outline and metrics from a lightweight tokenizer (no full parse)"""
+    tokens, comment_lines = _tokenize_c_like(text)
+    source_lines = text.splitlines()
+
+    functions = []
+    classes = []
+    imports = []
+    test_calls = 0
+    class_stack = []  # (name, closing token index)
+    function_stack = []  # closing token index of the enclosing function bodies
+
+    i = 0
+    while i < len(tokens):
+        kind, value, line = tokens[i]
+        while class_stack and i > class_stack[-1][1]:
+            class_stack.pop()
+        while function_stack and i > function_stack[-1]:
+            function_stack.pop()
+        # Closures inside a function body are counted as functions, but not as methods
+        in_function = bool(function_stack) and (not class_stack or function_stack[-1] < class_stack[-1][1])
+        prefix = f"{class_stack[-1][0]}." if class_stack and not in_function else ''
+        following = tokens[i + 1][1] if i + 1 < len(tokens) else ''
+
+        if kind == 'preprocessor':
+            include = re.match(r'#\s*include\s*[<"]([^>"]+)', value)
+            if include:
+                imports.append(include.group(1))
+        elif kind == 'word' and value == 'import' and following != '.':
+            # import x from 'y' / import 'y' / import a.b.C;
+            j = i + 1
+            while j < len(tokens) and tokens[j][1] != ';' and tokens[j][2] == line and tokens[j][0] != 'string':
+                j += 1
+            if j < len(tokens) and tokens[j][0] == 'string':
+                imports.append(tokens[j][1][1:-1])
+            else:
+                imports.append(''.join(t[1] for t in tokens[i + 1:j]).replace('static', '', 1))
+        elif kind == 'word' and value == 'require' and following == '(' and i + 2 < len(tokens) and tokens[i + 2][0] == 'string':
+            imports.append(tokens[i + 2][1][1:-1])
+        elif kind == 'word' and value in CLASS_WORDS and tokens[i + 1:i + 2] and tokens[i + 1][0] == 'word':
+            body = _body_after(tokens, i + 2)
+            if body != -1:
+                name = tokens[i + 1][1]
+                classes.append({'name': name, 'line': line, 'kind': value, 'methods': []})
+                class_stack.append((name, _matching(tokens, body, '{', '}')))
+        elif kind == 'word' and value in TEST_CALLS and following == '(':
+            test_calls += 1
+        elif kind == 'op' and value == '@' and following == 'Test':
+            test_calls += 1
+
+        # Function shapes: `function name(`, `name(...) {` (methods, C/Java), `name = (...) =>` / `name = async (`
+        name = None
+        params_start = None
+        if kind == 'word' and value == 'function' and tokens[i + 1:i + 2] and tokens[i + 1][0] == 'word':
+            name, params_start = tokens[i + 1][1], i + 2
+        elif kind == 'word' and value not in KEYWORDS and following == '(' and (i == 0 or tokens[i - 1][1] not in ('.', 'new', 'function')):
+            name, params_start = value, i + 1
+        elif kind == 'word' and following == '=' and i + 2 < len(tokens):
+            j = i + 2
+            if tokens[j][1] == 'async':
+                j += 1
+            if j < len(tokens) and tokens[j][1] == '(':
+                close = _matching(tokens, j, '(', ')')
+                arrow = _after_annotation(tokens, close + 1)
+                if arrow < len(tokens) and tokens[arrow][1] == '=>':
+                    name, params_start = value, j
+
+        if name and params_start < len(tokens) and tokens[params_start][1] == '(':
+            params_end = _matching(tokens, params_start, '(', ')')
+            # Between ')' and '{' only a return type, `throws`, `const` or `=>` can appear
+            body = _body_after(tokens, _after_annotation(tokens, params_end + 1))
+            if body != -1:
+                body_end = _matching(tokens, body, '{', '}')
+                body_tokens = tokens[body:body_end + 1]
+                params = [t for t in tokens[params_start + 1:params_end] if t[1] == ',']
+                has_params = params_end > params_start + 1
+                functions.append({
+                    'name': f"{prefix}{name}",
+                    'line': line,
+                    'lines': tokens[body_end][2] - line + 1,
+                    'args': len(params) + 1 if has_params else 0,
+                    'complexity': 1 + sum(1 for t in body_tokens if t[1] in DECISIONS and t[0] != 'string'),
+                    'documented': line - 1 in _doc_comment_lines(source_lines, line)
+                })
+                if class_stack and not in_function:
+                    next(c for c in reversed(classes) if c['name'] == class_stack[-1][0])['methods'].append(name)
+                function_stack.append(body_end)
+                # Nested functions are still picked up: continue inside the body
+                i = body + 1
+                continue
+        i += 1
+
+    return {
+        'functions': functions,
+        'classes': classes,
+        'imports': list(dict.fromkeys(name.strip() for name in imports if name.strip())),
+        'comment_lines': comment_lines,
+        'module_doc': None,
+        'test_functions': test_calls
+    }
+
+def _doc_comment_lines(lines: list, line: int) -> set:
+    """Lines just above `line` that end a comment block (JSDoc / Javadoc / //)"""
+    above = lines[line - 2].strip() if line >= 2 and line - 2 < len(lines) else ''
+    return {line - 1} if above.endswith('*/') or above.startswith('//') else set()
+
+# ============================================
+# Summary
+# ============================================
+
+def analyze_source(filename: str, text: str) -> dict:
+    """Language-aware outline and metrics of one source file"""
+    extension = os.path.splitext((filename or '').lower())[1]
+    lines = text.splitlines()
+    blank = sum(1 for line in lines if not line.strip())
+
+    result = None
+    if extension in PYTHON_EXTENSIONS:
+        try:
+            result = analyze_python(text)
+        except (SyntaxError, ValueError, RecursionError) as e:
+            print(f"Python parse failed for {filename}, using tokenizer: {str(e)}")
+    if result is None:
+        result = analyze_c_like(text)
+
+    functions = result['functions']
+    complexities = [f['complexity'] for f in functions]
+    code_lines = max(len(lines) - blank - result['comment_lines'], 0)
+    base = os.path.basename(filename or '')
+    return {
+        'file': filename,
+        'language': LANGUAGE_NAMES.get(extension, extension.lstrip('.') or 'unknown'),
+        'lines': len(lines),
+        'code_lines': code_lines,
+        'comment_lines': result['comment_lines'],
+        'blank_lines': blank,
+        'comment_ratio': round(result['comment_lines'] / max(code_lines + result['comment_lines'], 1), 3),
+        'documented_ratio': round(sum(1 for f in functions if f['documented']) / len(functions), 3) if functions else None,
+        'functions': functions,
+        'classes': result['classes'],
+        'imports': result['imports'],
+        'module_doc': result['module_doc'],
+        'avg_complexity': round(sum(complexities) / len(complexities), 1) if complexities else None,
+        'max_complexity': max(complexities) if complexities else None,
+        'is_test': bool(TEST_FILE_PATTERN.search(base)) or result['test_functions'] > 0,
+        'test_functions': result['test_functions']
+    }
+
+def render_analysis(analysis: dict) -> str:
+    """Compact text form of analyze_source output, sent to the model instead of the source"""
+    a = analysis
+    out = [f"[Code summary: {a['file']} - {a['language']}, {a['lines']} lines "
+           f"({a['code_lines']} code, {a['comment_lines']} comment, {a['blank_lines']} blank)]"]
+    if a['module_doc']:
+        out.append(f"Module: {a['module_doc'][:200]}")
+    if a['imports']:
+        extra = len(a['imports']) - MAX_IMPORTS
+        out.append("Imports: " + ', '.join(a['imports'][:MAX_IMPORTS]) + (f" (+{extra} more)" if extra > 0 else ''))
+    for cls in a['classes'][:MAX_CLASSES]:
+        methods = cls['methods']
+        listed = ', '.join(methods[:8]) + (f", +{len(methods) - 8} more" if len(methods) > 8 else '')
+        bases = f"({', '.join(cls['bases'])})" if cls.get('bases') else ''
+        kind = cls.get('kind', 'class')
+        if methods or kind == 'class':
+            out.append(f"{kind.capitalize()} {cls['name']}{bases}: {len(methods)} methods" + (f" [{listed}]" if methods else ''))
+        else:
+            out.append(f"{kind.capitalize()} {cls['name']}")
+    if len(a['classes']) > MAX_CLASSES:
+        out.append(f"(+{len(a['classes']) - MAX_CLASSES} more classes)")
+
+    functions = a['functions']
+    if functions:
+        out.append(f"Functions: {len(functions)}, avg complexity {a['avg_complexity']}, max {a['max_complexity']}")
+        # Most complex first: that's where the interesting logic (and the risk) is
+        for f in sorted(functions, key=lambda f: (-f['complexity'], f['line']))[:MAX_FUNCTIONS]:
+            out.append(f"  - {f['name']}({f['args']} args) line {f['line']}, {f['lines']} lines, complexity {f['complexity']}"
+                       + (', async' if f.get('async') else '') + ('' if f['documented'] else ', undocumented'))
+        if len(functions) > MAX_FUNCTIONS:
+            out.append(f"  (+{len(functions) - MAX_FUNCTIONS} smaller functions)")
+    documented = f"{round(a['documented_ratio'] * 100)}% of functions documented, " if a['documented_ratio'] is not None else ''
+    out.append(f"Documentation: {documented}comment ratio {round(a['comment_ratio'] * 100)}%")
+    out.append(f"Tests: {'yes' if a['is_test'] else 'no'}" + (f" ({a['test_functions']} test cases)" if a['test_functions'] else ''))
+    return '\n'.join(out)
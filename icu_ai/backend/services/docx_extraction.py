@@ -0,0 +1,118 @@
+import os
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+
+# Raw text ceiling; the summarizer then condenses it to the prompt budget
+DOCX_MAX_CHARS = int(os.getenv('DOCX_MAX_CHARS', 120000))
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCUMENT_PART = 'word/document.xml'
+
+def iter_docx_blocks(source):
+    """
+    Yield ('paragraph', text) and ('row', [cell texts]) from a DOCX in
+    document order, reading word/document.xml straight out of the zip with
+    iterparse. Finished body elements are dropped as soon as they are
+    emitted, so memory stays flat however long the document is.
+
+    `source` is a file path, bytes or a binary file object.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    with zipfile.ZipFile(source) as archive:
+        try:
+            part = archive.open(DOCUMENT_PART)
+        except KeyError:
+            raise ValueError('Not a Word document (word/document.xml is missing)')
+
+        with part:
+            body = None
+            runs = []     # stack of open paragraphs (text boxes nest them): text pieces
+            cells = []    # stack of open table cells: paragraphs per cell
+            rows = []     # stack of open table rows: cell texts per row
+            for event, elem in ET.iterparse(part, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == W + 'body':
+                        body = elem
+                    elif tag == W + 'p':
+                        runs.append([])
+                    elif tag == W + 'tr':
+                        rows.append([])
+                    elif tag == W + 'tc':
+                        cells.append([])
+                    continue
+
+                if tag == W + 't' and runs:
+                    runs[-1].append(elem.text or '')
+                elif tag == W + 'tab' and runs:
+                    runs[-1].append('\t')
+                elif tag in (W + 'br', W + 'cr') and runs:
+                    runs[-1].append('\n')
+                elif tag == W + 'p' and runs:
+                    text = ''.join(runs.pop()).strip()
+                    if runs:
+                        # Text box inside a paragraph: keep its text with the outer paragraph
+                        if text:
+                            runs[-1].append(f" {text} ")
+                    elif cells:
+                        if text:
+                            cells[-1].append(text)
+                    elif text:
+                        yield 'paragraph', text
+                elif tag == W + 'tc' and cells:
+                    cell_text = ' '.join(cells.pop())
+                    if rows:
+                        rows[-1].append(cell_text)
+                    elif cells:
+                        cells[-1].append(cell_text)
+                elif tag == W + 'tr' and rows:
+                    row = rows.pop()
+                    if cells:
+                        # Nested table: flatten the row into the enclosing cell
+                        cells[-1].append(' | '.join(c for c in row if c))
+                    elif any(row):
+                        yield 'row', row
+
+                # Body-level block finished: nothing in it is needed any more
+                if body is not None and not cells and not rows and tag in (W + 'p', W + 'tbl', W + 'sectPr'):
+                    body.clear()
+
+def extract_docx_text(source, max_chars: int = None) -> dict:
+    """
+    Paragraph and table text of a DOCX, stopping once the character budget
+    is met (the rest of the XML is never decompressed). Table rows become
+    "cell | cell | cell" lines.
+    """
+    max_chars = max_chars or DOCX_MAX_CHARS
+
+    parts = []
+    total = 0
+    paragraphs = 0
+    table_rows = 0
+    truncated = False
+    for kind, value in iter_docx_blocks(source):
+        if total >= max_chars:
+            truncated = True
+            break
+        if kind == 'row':
+            table_rows += 1
+            value = ' | '.join(value)
+        else:
+            paragraphs += 1
+        parts.append(value)
+        total += len(value) + 1
+
+    text = '\n'.join(parts)
+    if len(text) > max_chars:
+        truncated = True
+        text = text[:max_chars]
+
+    return {
+        'text': text,
+        'paragraphs': paragraphs,
+        'table_rows': table_rows,
+        'truncated': truncated
+    }
@@ -1,14 +1,22 @@
 import os
 import json
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from database import db, Project, Evaluation
 from services.ai_client import AIClient
+from services.scheduler import SchedulerOverloaded
+from services.repo_profile import repo_profiler, render_profile
+from services.github_client import parse_repo_url
+from services.score_stats import ScoreStatsService, analysis_domain
+from services.scoring_profiles import get_profile, CATEGORY_CRITERIA, CRITERION_DEFAULT, READINESS_LEVELS
 
 class EvaluationService:
     def __init__(self):
         self.ai_client = AIClient()
+        self.score_stats = ScoreStatsService()
     
-    def evaluate_project(self, project_data: dict) -> dict:
+    def evaluate_project(self, project_data: dict, user_id: str = None) -> dict:
         """Main evaluation function"""
         
         # 1. Build comprehensive prompt
@@ -16,10 +24,52 @@ class EvaluationService:
         
         # 2. Call AI with automatic provider fallback
         try:
-            response_text = self.ai_client.generate_content(prompt)
+            response_text = self.ai_client.generate_content(prompt, user_id=user_id)
             print(f"DEBUG: AI Response: {response_text[:500]}...") # Log first 500 chars
-            
-            # 3. Extract JSON from response (more robustly)
+        except SchedulerOverloaded:
+            raise
+        except Exception as e:
+            print(f"Error in evaluate_project: {str(e)}")
+            raise Exception(f"Failed to evaluate project: {str(e)}")
+        
+        # 3. Parse the response and persist
+        analysis = self._parse_response(response_text)
+        return self._save_evaluation(project_data, analysis)
+    
+    def evaluate_project_stream(self, project_data: dict, user_id: str = None, input_type: str = 'text',
+                                heartbeat_seconds: float = 10):
+        """Same steps as evaluate_project, yielding a progress event after each phase"""
+        
+        yield {'phase': 'prompt', 'status': 'started'}
+        prompt = self._build_evaluation_prompt(project_data)
+        yield {'phase': 'prompt', 'status': 'done', 'chars': len(prompt)}
+        
+        # The model call blocks for a while; keep the stream alive with heartbeats
+        yield {'phase': 'model', 'status': 'started'}
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.ai_client.generate_content, prompt, 1, user_id)
+            while True:
+                try:
+                    response_text = future.result(timeout=heartbeat_seconds)
+                    break
+                except FutureTimeout:
+                    yield {'phase': 'model', 'status': 'running', 'elapsed_seconds': round(time.time() - started, 1)}
+                except SchedulerOverloaded:
+                    raise
+                except Exception as e:
+                    print(f"Error in evaluate_project_stream: {str(e)}")
+                    raise Exception(f"Failed to evaluate project: {str(e)}")
+        yield {'phase': 'model', 'status': 'done', 'elapsed_seconds': round(time.time() - started, 1)}
+        
+        analysis = self._parse_response(response_text)
+        result = self._save_evaluation(project_data, analysis, input_type)
+        yield {'phase': 'done', 'result': result}
+    
+    def _parse_response(self, response_text: str) -> dict:
+        """Extract the analysis JSON from a model response"""
+        try:
+            # Extract JSON from response (more robustly)
             import re
             json_match = re.search(r'(\{.*\})', response_text, re.DOTALL)
             if json_match:
@@ -37,23 +87,29 @@ class EvaluationService:
             response_text = response_text.strip()
             
             # Parse JSON
-            analysis = json.loads(response_text)
+            return json.loads(response_text)
             
         except Exception as e:
             print(f"Error in evaluate_project: {str(e)}")
-            if 'response_text' in locals():
-                print(f"Failed response text: {response_text}")
+            print(f"Failed response text: {response_text}")
             raise Exception(f"Failed to evaluate project: {str(e)}")
+    
+    def _save_evaluation(self, project_data: dict, analysis: dict, input_type: str = 'text', commit: bool = True) -> dict:
+        """
+        Score an analysis and store the project and evaluation. With
+        commit=False the rows are only added to the session; the caller
+        commits them and then records the scores in score_stats.
+        """
         
         # 4. Calculate scores
-        scores = self._calculate_scores(analysis.get('scores', {}))
+        scores = self._calculate_scores(analysis.get('scores') or {})
         
         # 5. Generate recommendations
         recommendations = {
             'quick_wins': analysis.get('quick_wins', []),
             'improvements': analysis.get('improvements', []),
             'strengths': analysis.get('strengths', []),
-            'pitch': analysis.get('pitch_suggestions', {})
+            'pitch': analysis.get('pitch_suggestions') or {}
         }
         
         # 6. Save to database
@@ -64,15 +120,17 @@ class EvaluationService:
             id=project_id,
             name=project_data['name'],
             description=project_data['description'],
-            input_type='text',
+            input_type=input_type,
             input_data=json.dumps(project_data)
         )
         
+        primary_domain = analysis_domain(analysis)
         evaluation = Evaluation(
             id=eval_id,
             project_id=project_id,
             overall_score=scores['overall'],
-            readiness_level=self._classify_readiness(scores['overall'])
+            readiness_level=self._classify_readiness(scores['overall']),
+            primary_domain=primary_domain
         )
         evaluation.set_scores(scores)
         evaluation.set_analysis(analysis)
@@ -80,7 +138,11 @@ class EvaluationService:
         
         db.session.add(project)
         db.session.add(evaluation)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+            
+            # 7. Update score distributions (percentiles / leaderboard)
+            self.score_stats.record(scores, primary_domain)
         
         return {
             'id': eval_id,
@@ -91,6 +153,51 @@ class EvaluationService:
             'readiness_level': evaluation.readiness_level
         }
     
+    def get_evaluation(self, evaluation_id: str) -> dict:
+        """Load a stored evaluation in the same shape evaluate_project returns"""
+        evaluation = Evaluation.query.get(evaluation_id)
+        if not evaluation:
+            return None
+        
+        return {
+            'id': evaluation.id,
+            'project_id': evaluation.project_id,
+            'overall_score': evaluation.overall_score,
+            'scores': evaluation.get_scores(),
+            'analysis': evaluation.get_analysis(),
+            'recommendations': evaluation.get_recommendations(),
+            'readiness_level': evaluation.readiness_level,
+            'created_at': evaluation.created_at.isoformat() if evaluation.created_at else None
+        }
+    
+    def _repo_profile(self, github_url: str) -> dict:
+        """
+        Profile of the project's GitHub repo, measured here (cached per commit
+        SHA). A profile sent in the request body is never used: the prompt
+        tells the model to trust it over the description.
+        """
+        if not github_url:
+            return None
+        try:
+            owner, repo = parse_repo_url(github_url)
+            return repo_profiler.profile(owner, repo)
+        except Exception as e:
+            print(f"Error profiling GitHub repo: {str(e)}")
+            return None
+    
+    def _repo_profile_section(self, project_data: dict) -> str:
+        """Code-level facts from the GitHub repo, when the project came with one"""
+        profile = self._repo_profile(project_data.get('github_url'))
+        if not isinstance(profile, dict):
+            return ''
+        rendered = render_profile(profile)
+        if not rendered:
+            return ''
+        return f"""
+REPOSITORY PROFILE (measured from the code, trust it over the description):
+{rendered}
+"""
+    
     def _build_evaluation_prompt(self, project_data: dict) -> str:
         """Construct detailed evaluation prompt"""
         return f"""
@@ -102,7 +209,7 @@ TECH STACK: {project_data.get('tech_stack', 'Not specified')}
 TEAM SIZE: {project_data.get('team_size', 1)}
 TIME: {project_data.get('time_available', 'Not specified')} hours
 THEME: {project_data.get('theme', 'Open-ended')}
-
+{self._repo_profile_section(project_data)}
 CRITICAL SCORING GUIDELINES - BE BRUTALLY HARSH:
 - Novelty/joke projects (smart dustbins, meme generators): 10-25 MAX
 - Simple CRUD apps or basic prototypes: 20-40 MAX
@@ -189,65 +296,38 @@ Provide evaluation in this EXACT JSON structure:
 Be specific, actionable, and constructive. Focus on improvement paths.
 """
     
-    def _calculate_scores(self, scores_dict: dict) -> dict:
-        """Calculate weighted overall score"""
-        
-        # Technical Excellence (25%)
-        technical = (
-            scores_dict.get('code_quality', 5) +
-            scores_dict.get('technical_complexity', 5) +
-            scores_dict.get('tech_stack_modernity', 5) +
-            scores_dict.get('implementation_quality', 5)
-        ) / 4
-        
-        # Innovation (25%)
-        innovation = (
-            scores_dict.get('originality', 5) +
-            scores_dict.get('creative_problem_solving', 5) +
-            scores_dict.get('feature_innovation', 5)
-        ) / 3
-        
-        # Impact (25%)
-        impact = (
-            scores_dict.get('real_world_applicability', 5) +
-            scores_dict.get('market_potential', 5) +
-            scores_dict.get('social_impact', 5) +
-            scores_dict.get('scalability', 5)
-        ) / 4
-        
-        # Execution (25%)
-        execution = (
-            scores_dict.get('completeness', 5) +
-            scores_dict.get('user_experience', 5) +
-            scores_dict.get('presentation_quality', 5) +
-            scores_dict.get('documentation', 5)
-        ) / 4
-        
-        overall = (technical * 0.25 + innovation * 0.25 + 
-                   impact * 0.25 + execution * 0.25) * 10
-        
-        # Add wow factor bonus (up to +5)
-        wow_bonus = min(scores_dict.get('wow_factor', 5) * 0.5, 5)
+    def _calculate_scores(self, scores_dict: dict, profile_name: str = None) -> dict:
+        """Calculate weighted overall score using a named weighting profile"""
+        profile_name, profile = get_profile(profile_name)
+        
+        # Category averages (Technical, Innovation, Impact, Execution)
+        categories = {}
+        for category, criteria in CATEGORY_CRITERIA.items():
+            categories[category] = sum(
+                scores_dict.get(criterion, CRITERION_DEFAULT) for criterion in criteria
+            ) / len(criteria)
+        
+        overall = sum(
+            categories[category] * profile['weights'][category] for category in CATEGORY_CRITERIA
+        ) * 10
+        
+        # Add wow factor bonus (up to +wow_cap)
+        wow_bonus = min(scores_dict.get('wow_factor', CRITERION_DEFAULT) * profile['wow_multiplier'], profile['wow_cap'])
         overall = min(overall + wow_bonus, 100)
         
         return {
-            'technical': round(technical, 1),
-            'innovation': round(innovation, 1),
-            'impact': round(impact, 1),
-            'execution': round(execution, 1),
+            'technical': round(categories['technical'], 1),
+            'innovation': round(categories['innovation'], 1),
+            'impact': round(categories['impact'], 1),
+            'execution': round(categories['execution'], 1),
             'overall': round(overall, 0),
-            'detailed': scores_dict
+            'detailed': scores_dict,
+            'profile': profile_name
         }
     
     def _classify_readiness(self, overall_score: float) -> str:
         """Classify project readiness level"""
-        if overall_score >= 90:
-            return 'exceptional'
-        elif overall_score >= 76:
-            return 'winner_potential'
-        elif overall_score >= 61:
-            return 'competition_ready'
-        elif overall_score >= 41:
-            return 'demo_ready'
-        else:
-            return 'early_prototype'
+        for threshold, level in READINESS_LEVELS:
+            if overall_score >= threshold:
+                return level
+        return READINESS_LEVELS[-1][1]
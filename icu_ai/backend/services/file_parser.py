@@ -1,56 +1,90 @@
-import PyPDF2
-import docx
+import os
 import markdown
-import requests
 import re
 from werkzeug.datastructures import FileStorage
+from services.pdf_extraction import extract_pdf_text
+from services.docx_extraction import extract_docx_text
+from services.upload_streams import spooled_path, read_upload_bytes
+from services.parser_pool import parser_pool
+from services.github_client import github_client, parse_repo_url
+from services.summarizer import summarize
+from services.code_analyzer import analyze_source, render_analysis
+
+# Bump whenever parsing output changes; cached upload text is keyed on it
+PARSER_VERSION = '8'
+
+# Plain text / code / markdown uploads are read up to this many bytes
+TEXT_MAX_BYTES = int(os.getenv('TEXT_MAX_KB', 1024)) * 1024
+
+# /api/evaluate rejects descriptions shorter than this
+MIN_DESCRIPTION_WORDS = 100
 
 def parse_file(file: FileStorage) -> str:
     """Parse uploaded file and extract text"""
     filename = file.filename.lower()
     
+    # Document and source parsers run in the sandboxed worker pool (time and memory limits)
     if filename.endswith('.pdf'):
-        return parse_pdf(file)
+        return parser_pool.parse('parse_pdf', file)
     elif filename.endswith('.docx'):
-        return parse_docx(file)
+        return parser_pool.parse('parse_docx', file)
     elif filename.endswith('.md'):
-        return parse_markdown(file)
+        return parser_pool.parse('parse_markdown', file)
     elif filename.endswith('.txt'):
-        return file.read().decode('utf-8')
-    elif filename.endswith(('.py', '.js', '.java', '.cpp', '.html', '.css', '.tsx', '.jsx')):
-        return file.read().decode('utf-8')
+        return condense(read_text(file))
+    elif filename.endswith(('.py', '.js', '.java', '.cpp', '.ts', '.tsx', '.jsx')):
+        return parser_pool.parse('parse_code', file)
+    elif filename.endswith(('.html', '.css')):
+        return read_text(file)
     else:
         raise ValueError(f"Unsupported file type: {filename}")
 
+def read_text(file: FileStorage) -> str:
+    """Decode a text upload, reading at most TEXT_MAX_BYTES of it"""
+    data = read_upload_bytes(file, TEXT_MAX_BYTES + 1)
+    if len(data) > TEXT_MAX_BYTES:
+        # Cutting may split a multi-byte character; drop the partial tail
+        return data[:TEXT_MAX_BYTES].decode('utf-8', errors='ignore') + "\n\n[Content truncated to fit API limits]"
+    return data.decode('utf-8')
+
+def condense(text: str) -> str:
+    """Fit a long document into the prompt budget by keeping its most informative segments"""
+    result = summarize(text)
+    if result['summarized']:
+        print(f"Condensed document: {result['tokens_in']} -> {result['tokens_out']} tokens, "
+              f"{result['segments_kept']}/{result['segments']} segments kept")
+    return result['text']
+
+def parse_code(file: FileStorage) -> str:
+    """Outline and metrics of a source file (sent to the model instead of the raw code)"""
+    source = read_text(file)
+    analysis = analyze_source(file.filename, source)
+    summary = render_analysis(analysis)
+    print(f"Code summarized ({analysis['language']}): {len(source)} -> {len(summary)} characters")
+
+    if len(summary.split()) < MIN_DESCRIPTION_WORDS:
+        # Outline of a tiny file: add the (condensed) code so the description passes the word minimum
+        summary += "\n\n[Source]\n" + condense(source)
+    return summary
+
 def parse_pdf(file: FileStorage) -> str:
     """Extract text from PDF"""
     try:
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        page_count = 0
-        max_pages = 10  # Only process first 10 pages
-        
-        for page in pdf_reader.pages:
-            if page_count >= max_pages:
-                text += "\n\n[Remaining pages truncated - only first 10 pages processed]"
-                break
-            
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-            page_count += 1
+        # Spooled uploads are parsed from their temp file instead of a copy in memory
+        result = extract_pdf_text(spooled_path(file) or file.stream)
+        text = result['text']
         
         # Validate extracted text
-        text = text.strip()
         if not text:
             raise ValueError("PDF appears to be empty or contains only images")
         
-        # AGGRESSIVE limit - only 15,000 chars
-        max_chars = 15000
-        if len(text) > max_chars:
-            text = text[:max_chars] + "\n\n[Content truncated to fit API limits]"
+        text = condense(text)
+        if result['truncated']:
+            text += "\n\n[Content truncated to fit API limits]"
+        elif result['pages_skipped']:
+            text += f"\n\n[Remaining pages truncated - only first {result['pages_read']} pages processed]"
         
-        print(f"PDF parsed: {len(text)} characters, {len(text.split())} words")
+        print(f"PDF parsed ({result['backend']}): {len(text)} characters, {result['pages_read']}/{result['page_count']} pages")
         return text
     except Exception as e:
         raise ValueError(f"Failed to parse PDF: {str(e)}")
@@ -58,8 +92,11 @@ def parse_pdf(file: FileStorage) -> str:
 def parse_docx(file: FileStorage) -> str:
     """Extract text from DOCX"""
     try:
-        doc = docx.Document(file)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+        # Streams word/document.xml (paragraphs and table cells) up to the character budget
+        result = extract_docx_text(spooled_path(file) or file.stream)
+        text = condense(result['text'])
+        if result['truncated']:
+            text += "\n\n[Content truncated to fit API limits]"
         return text
     except Exception as e:
         raise ValueError(f"Failed to parse DOCX: {str(e)}")
@@ -67,49 +104,29 @@ def parse_docx(file: FileStorage) -> str:
 def parse_markdown(file: FileStorage) -> str:
     """Parse markdown file"""
     try:
-        md_text = file.read().decode('utf-8')
+        md_text = read_text(file)
         # Convert to plain text (remove markdown syntax)
         html = markdown.markdown(md_text)
         # Simple HTML tag removal
         text = re.sub('<[^<]+?>', '', html)
-        return text
+        return condense(text)
     except Exception as e:
         raise ValueError(f"Failed to parse Markdown: {str(e)}")
 
 def fetch_github_repo(url: str) -> dict:
     """Fetch GitHub repository information"""
     try:
-        # Extract owner and repo from URL
-        # Example: https://github.com/owner/repo
-        match = re.match(r'https?://github\.com/([^/]+)/([^/]+)', url)
-        if not match:
-            raise ValueError("Invalid GitHub URL format")
-        
-        owner, repo = match.groups()
-        repo = repo.replace('.git', '')
-        
-        # Fetch README
-        readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-        headers = {'Accept': 'application/vnd.github.v3.raw'}
-        
-        readme_response = requests.get(readme_url, headers=headers)
-        readme_text = ""
-        
-        if readme_response.status_code == 200:
-            readme_text = readme_response.text
-        
-        # Fetch languages
-        languages_url = f"https://api.github.com/repos/{owner}/{repo}/languages"
-        languages_response = requests.get(languages_url)
-        languages = []
-        
-        if languages_response.status_code == 200:
-            languages = list(languages_response.json().keys())
-        
-        return {
-            'readme': readme_text,
-            'languages': languages
-        }
+        owner, repo = parse_repo_url(url)
+        result = github_client.fetch_repo(owner, repo)
         
     except Exception as e:
         raise ValueError(f"Failed to fetch GitHub repo: {str(e)}")
+    
+    # The code profile is best effort: README and languages are enough to evaluate
+    try:
+        from services.repo_profile import repo_profiler
+        result['profile'] = repo_profiler.profile(owner, repo)
+    except Exception as e:
+        print(f"Error profiling GitHub repo: {str(e)}")
+        result['profile'] = None
+    return result
@@ -0,0 +1,198 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import requests
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from database import db, GitHubCacheEntry
+
+RAW = 'application/vnd.github.raw'
+JSON = 'application/vnd.github+json'
+
+GITHUB_URL_PATTERN = re.compile(r'https?://github\.com/([^/]+)/([^/#?]+)')
+
+def parse_repo_url(url: str) -> tuple:
+    """(owner, repo) from a github.com URL"""
+    match = GITHUB_URL_PATTERN.match(url or '')
+    if not match:
+        raise ValueError("Invalid GitHub URL format")
+    owner, repo = match.groups()
+    if repo.endswith('.git'):
+        repo = repo[:-4]
+    return owner, repo
+
+class GitHubRateLimited(Exception):
+    pass
+
+class GitHubClient:
+    """
+    GitHub REST client shared by the whole process.
+
+    - One pooled requests.Session with connect/read timeouts and optional
+      GITHUB_TOKEN auth; GITHUB_API_URL can point at a local stub.
+    - Independent GETs run in parallel on a small thread pool.
+    - Responses are stored with their ETag in the github_cache table and
+      revalidated with If-None-Match; a 304 doesn't count against the rate
+      limit. Database access stays on the calling thread, workers only do HTTP.
+    - The last seen X-RateLimit-* headers are kept for reporting.
+    """
+
+    def __init__(self):
+        self.api_url = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        self.token = os.getenv('GITHUB_TOKEN')
+        self.timeout = (float(os.getenv('GITHUB_CONNECT_TIMEOUT', 5)), float(os.getenv('GITHUB_READ_TIMEOUT', 20)))
+        max_concurrency = int(os.getenv('GITHUB_MAX_CONCURRENCY', 8))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency, max_retries=1)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'icu-ai-hackathon-helper',
+            'X-GitHub-Api-Version': '2022-11-28'
+        })
+        if self.token:
+            self.session.headers['Authorization'] = f"Bearer {self.token}"
+
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.lock = threading.Lock()
+        self.rate = {'limit': None, 'remaining': None, 'used': None, 'reset': None, 'reset_at': None}
+        self.counters = {'requests': 0, 'not_modified': 0, 'cache_served': 0}
+        self.low_rate_warned_reset = None  # reset time of the window the low-rate warning was logged for
+
+    def _cache_key(self, url: str, accept: str) -> str:
+        return hashlib.sha256(f"{url}|{accept}".encode('utf-8')).hexdigest()
+
+    def _request(self, url: str, accept: str, etag: str = None) -> tuple:
+        """HTTP only (runs on worker threads): returns (status, body, etag)"""
+        headers = {'Accept': accept}
+        if etag:
+            headers['If-None-Match'] = etag
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        self._record_rate(response)
+
+        if response.status_code in (403, 429) and response.headers.get('X-RateLimit-Remaining') == '0':
+            raise GitHubRateLimited(f"GitHub API rate limit exceeded (resets at {self.rate['reset_at']})")
+        return response.status_code, response.text if response.status_code != 304 else None, response.headers.get('ETag')
+
+    def _record_rate(self, response):
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        with self.lock:
+            self.counters['requests'] += 1
+            if response.status_code == 304:
+                self.counters['not_modified'] += 1
+            reset = int(headers['X-RateLimit-Reset']) if 'X-RateLimit-Reset' in headers else self.rate['reset']
+            self.rate = {
+                'limit': int(headers['X-RateLimit-Limit']) if 'X-RateLimit-Limit' in headers else self.rate['limit'],
+                'remaining': int(headers['X-RateLimit-Remaining']),
+                'used': int(headers['X-RateLimit-Used']) if 'X-RateLimit-Used' in headers else self.rate['used'],
+                'reset': reset,
+                'reset_at': datetime.utcfromtimestamp(reset).isoformat() + 'Z' if reset else None
+            }
+            # Warn once per rate limit window, not on every response after the quota runs low
+            warn = self.rate['remaining'] < 10 and self.low_rate_warned_reset != reset
+            if warn:
+                self.low_rate_warned_reset = reset
+            rate = self.rate
+        if warn:
+            print(f"Warning: GitHub rate limit low ({rate['remaining']} remaining, resets at {rate['reset_at']})")
+
+    def get_many(self, requests_list: list) -> list:
+        """
+        Conditional GETs for [(path, accept), ...] in parallel.
+        Returns [(status, body), ...] in the same order; 304s are answered from the cache.
+        """
+        specs = []
+        for path, accept in requests_list:
+            url = path if path.startswith('http') else f"{self.api_url}{path}"
+            specs.append((url, accept, self._cache_key(url, accept)))
+
+        # Cache lookups on this thread (the request's DB session)
+        cached = {row.key: row for row in GitHubCacheEntry.query.filter(
+            GitHubCacheEntry.key.in_([key for _, _, key in specs])
+        ).all()}
+
+        futures = [
+            self.executor.submit(self._request, url, accept, cached[key].etag if key in cached else None)
+            for url, accept, key in specs
+        ]
+
+        results = []
+        now = datetime.utcnow()
+        rate_limited = None
+        try:
+            for (url, accept, key), future in zip(specs, futures):
+                try:
+                    status, body, etag = future.result()
+                except GitHubRateLimited as e:
+                    # Still store the other responses (304 revalidations cost no quota)
+                    rate_limited = rate_limited or e
+                    continue
+                entry = cached.get(key)
+
+                if status == 304 and entry is not None:
+                    entry.validated_at = now
+                    with self.lock:
+                        self.counters['cache_served'] += 1
+                    results.append((entry.status, entry.body))
+                    continue
+
+                if etag and status in (200, 404):
+                    if entry is None:
+                        entry = GitHubCacheEntry(key=key, url=url)
+                        db.session.add(entry)
+                    entry.etag = etag
+                    entry.status = status
+                    entry.body = body
+                    entry.fetched_at = now
+                    entry.validated_at = now
+                results.append((status, body))
+        finally:
+            # Keep what was already revalidated or fetched even if a later request hit the rate limit
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error updating GitHub cache: {str(e)}")
+        if rate_limited:
+            raise rate_limited
+        return results
+
+    def stream(self, path: str, accept: str = JSON) -> requests.Response:
+        """Streaming GET (tarballs); the caller must close the response"""
+        url = path if path.startswith('http') else f"{self.api_url}{path}"
+        response = self.session.get(url, headers={'Accept': accept}, timeout=self.timeout, stream=True)
+        self._record_rate(response)
+        return response
+
+    def fetch_repo(self, owner: str, repo: str) -> dict:
+        """README and languages of a repository, fetched in parallel"""
+        (readme_status, readme), (languages_status, languages) = self.get_many([
+            (f"/repos/{owner}/{repo}/readme", RAW),
+            (f"/repos/{owner}/{repo}/languages", JSON)
+        ])
+
+        return {
+            'readme': readme if readme_status == 200 else '',
+            'languages': list(json.loads(languages).keys()) if languages_status == 200 and languages else [],
+            'rate_limit': self.rate_limit()
+        }
+
+    def rate_limit(self) -> dict:
+        with self.lock:
+            return {**self.rate}
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'rate_limit': {**self.rate},
+                **self.counters,
+                'authenticated': bool(self.token)
+            }
+
+github_client = GitHubClient()
@@ -2,14 +2,37 @@ import os
 import json
 import uuid
 import re
-from database import db, GeneratedIdea
+import threading
+from datetime import datetime, timedelta
+from database import db, GeneratedIdea, json_loads
 from services.ai_client import AIClient
+from services.scheduler import SchedulerOverloaded
+from services.idea_index import IdeaIndex, COMPLEXITY_MATCH, COMPLEXITY_DEFAULT
+
+def as_list(value) -> list:
+    """A questionnaire list field; a plain string is split on commas rather than iterated letter by letter"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(',') if part.strip()]
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
 
 class IdeaGenerationService:
     def __init__(self):
         self.ai_client = AIClient()
+        
+        # Index over previously generated ideas (loaded lazily, refreshed incrementally)
+        self.index = IdeaIndex()
+        self.index_lock = threading.Lock()
+        self.index_watermark = None
+        self.index_refreshed_at = None
+        self.index_refresh_seconds = int(os.getenv('IDEA_INDEX_REFRESH_SECONDS', 300))
+        self.corpus_min_score = int(os.getenv('IDEA_CORPUS_MIN_SCORE', 70))
+        self.corpus_text_weight = float(os.getenv('IDEA_CORPUS_TEXT_WEIGHT', 10))
     
-    def generate_ideas(self, questionnaire: dict) -> dict:
+    def generate_ideas(self, questionnaire: dict, user_id: str = None) -> dict:
         """Generate personalized project ideas"""
         
         # 1. Build profile from questionnaire
@@ -20,37 +43,51 @@ class IdeaGenerationService:
         
         # 3. Call AI with automatic provider fallback
         try:
-            response_text = self.ai_client.generate_content(prompt)
-            
-            # 4. Extract JSON from response (handle markdown code blocks)
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:]
-            
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
-            
-            # Try to find JSON object if wrapped in other text
-            json_match = re.search(r'\{[\s\S]*"ideas"[\s\S]*\}', response_text)
-            if json_match:
-                response_text = json_match.group(0)
-            
-            # Parse JSON
-            try:
-                result = json.loads(response_text)
-                ideas = result.get('ideas', [])
-            except json.JSONDecodeError as json_err:
-                print(f"JSON Parse Error: {json_err}")
-                print(f"Response text (first 500 chars): {response_text[:500]}")
-                raise Exception(f"Failed to parse AI response as JSON: {str(json_err)}")
-                
+            response_text = self.ai_client.generate_content(prompt, user_id=user_id)
+            ideas = self._parse_ideas(response_text)
+        except SchedulerOverloaded:
+            raise
         except Exception as e:
             print(f"Error in generate_ideas: {str(e)}")
             raise Exception(f"Failed to generate ideas: {str(e)}")
         
+        return self._save_ideas(questionnaire, profile, ideas)
+    
+    def _parse_ideas(self, response_text: str) -> list:
+        """Extract the ideas list from a model response"""
+        
+        # Extract JSON from response (handle markdown code blocks)
+        if response_text.startswith('```json'):
+            response_text = response_text[7:]
+        elif response_text.startswith('```'):
+            response_text = response_text[3:]
+        
+        if response_text.endswith('```'):
+            response_text = response_text[:-3]
+        
+        response_text = response_text.strip()
+        
+        # Try to find JSON object if wrapped in other text
+        json_match = re.search(r'\{[\s\S]*"ideas"[\s\S]*\}', response_text)
+        if json_match:
+            response_text = json_match.group(0)
+        
+        # Parse JSON
+        try:
+            result = json.loads(response_text)
+            return result.get('ideas', [])
+        except json.JSONDecodeError as json_err:
+            print(f"JSON Parse Error: {json_err}")
+            print(f"Response text (first 500 chars): {response_text[:500]}")
+            raise Exception(f"Failed to parse AI response as JSON: {str(json_err)}")
+    
+    def _save_ideas(self, questionnaire: dict, profile: dict, ideas: list, commit: bool = True) -> dict:
+        """
+        Score, rank and store a set of generated ideas. With commit=False the
+        row is only added to the session; the caller commits it and then
+        calls _index_ideas.
+        """
+        
         # 5. Calculate match scores
         for idea in ideas:
             idea['match_score'] = self._calculate_match_score(profile, idea)
@@ -68,34 +105,108 @@ class IdeaGenerationService:
         generated_idea.set_ideas(ideas)
         
         db.session.add(generated_idea)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+            self._index_ideas(idea_id, ideas)
         
         return {
             'id': idea_id,
             'ideas': ideas
         }
     
+    def _index_ideas(self, idea_id: str, ideas: list) -> None:
+        """Add committed ideas to the in-memory index (once it has been loaded)"""
+        if self.index_watermark is not None:
+            self.index.add(idea_id, ideas)
+    
+    def get_ideas(self, idea_id: str) -> dict:
+        """Load a stored idea set in the same shape generate_ideas returns"""
+        generated_idea = GeneratedIdea.query.get(idea_id)
+        if not generated_idea:
+            return None
+        
+        return {
+            'id': generated_idea.id,
+            'ideas': generated_idea.get_ideas(),
+            'created_at': generated_idea.created_at.isoformat() if generated_idea.created_at else None
+        }
+    
+    def recommend_ideas(self, questionnaire: dict, top_k: int = 4, user_id: str = None) -> dict:
+        """Return the best stored ideas for a questionnaire, generating only if none fit"""
+        profile = self._build_user_profile(questionnaire)
+        self._refresh_index()
+        
+        query_text = ' '.join([
+            ' '.join(profile['interests']),
+            profile['frustrations'],
+            ' '.join(profile['tech_interests']),
+            profile['theme'],
+            profile['required_tech'],
+            profile['project_type']
+        ])
+        matches = self.index.search(profile, query_text, top_k, self.corpus_text_weight)
+        matches = [m for m in matches if m['match_score'] >= self.corpus_min_score]
+        
+        if not matches:
+            print(f"No corpus match >= {self.corpus_min_score} in {len(self.index)} ideas, generating...")
+            return {'source': 'generated', **self.generate_ideas(questionnaire, user_id)}
+        
+        ideas = []
+        for match in matches:
+            idea = dict(match['idea'])
+            idea['match_score'] = match['match_score']
+            idea['similarity'] = match['similarity']
+            idea['source_id'] = match['source_id']
+            idea['idea_index'] = match['idea_index']
+            ideas.append(idea)
+        
+        return {'source': 'corpus', 'ideas': ideas}
+    
+    def _refresh_index(self):
+        """Load ideas stored since the last refresh (all of them on first use)"""
+        now = datetime.utcnow()
+        if self.index_refreshed_at and now - self.index_refreshed_at < timedelta(seconds=self.index_refresh_seconds):
+            return
+        
+        with self.index_lock:
+            query = db.session.query(GeneratedIdea.id, GeneratedIdea.ideas, GeneratedIdea.created_at)
+            if self.index_watermark is not None:
+                # >= so rows sharing the watermark timestamp are not missed (add() skips duplicates)
+                query = query.filter(GeneratedIdea.created_at >= self.index_watermark)
+            
+            watermark = self.index_watermark or datetime.min
+            for idea_id, ideas_json, created_at in query.yield_per(500):
+                try:
+                    self.index.add(idea_id, json_loads(ideas_json) if ideas_json else [])
+                except ValueError:
+                    continue
+                if created_at and created_at > watermark:
+                    watermark = created_at
+            
+            self.index_watermark = watermark
+            self.index_refreshed_at = now
+    
     def _build_user_profile(self, q: dict) -> dict:
         """Extract key attributes from questionnaire"""
         return {
             'skill_level': q['skill_level'],
             'primary_skill': q['primary_skill'],
-            'languages': q['languages'],
-            'frameworks': q.get('frameworks', []),
+            'languages': as_list(q['languages']),
+            'frameworks': as_list(q.get('frameworks')),
             'team_size': q.get('team_size', 1),
             'time_available': q['time_available'],
-            'theme': q.get('theme', ''),
-            'required_tech': q.get('required_tech', ''),
+            'theme': q.get('theme') or '',
+            'required_tech': q.get('required_tech') or '',
             'goals': q['primary_goal'],
-            'interests': q.get('domain_interests', []),
-            'frustrations': q.get('personal_frustrations', ''),
-            'tech_interests': q.get('emerging_tech', []),
+            'interests': as_list(q.get('domain_interests')),
+            'frustrations': q.get('personal_frustrations') or '',
+            'tech_interests': as_list(q.get('emerging_tech')),
             'project_type': q.get('project_type', ''),
-            'platform': q.get('platform', []),
+            'platform': as_list(q.get('platform')),
             'ui_importance': q.get('ui_importance', 'medium'),
             'ai_preference': q.get('ai_preference', 'optional'),
-            'target_audience': q.get('target_audience', []),
-            'desired_change': q.get('desired_change', [])
+            'target_audience': as_list(q.get('target_audience')),
+            'desired_change': as_list(q.get('desired_change'))
         }
     
     def _build_generation_prompt(self, profile: dict) -> str:
@@ -231,15 +342,7 @@ OTHER REQUIREMENTS:
         complexity = idea.get('feasibility', {}).get('complexity', 'medium')
         skill_level = profile['skill_level']
         
-        complexity_match = {
-            ('beginner', 'low'): 20,
-            ('intermediate', 'medium'): 20,
-            ('advanced', 'high'): 20,
-            ('intermediate', 'low'): 15,
-            ('advanced', 'medium'): 15,
-            ('beginner', 'medium'): 10,
-        }
-        score += complexity_match.get((skill_level, complexity), 5)
+        score += COMPLEXITY_MATCH.get((skill_level, complexity), COMPLEXITY_DEFAULT)
         
         # Interest alignment (25 points)
         idea_domain = idea.get('domain', '')
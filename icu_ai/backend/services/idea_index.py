@@ -0,0 +1,259 @@
+import re
+import math
+import threading
+import numpy as np
+from typing import List
+
+# (skill_level, complexity) -> points, shared with IdeaGenerationService._calculate_match_score
+COMPLEXITY_MATCH = {
+    ('beginner', 'low'): 20,
+    ('intermediate', 'medium'): 20,
+    ('advanced', 'high'): 20,
+    ('intermediate', 'low'): 15,
+    ('advanced', 'medium'): 15,
+    ('beginner', 'medium'): 10,
+}
+COMPLEXITY_DEFAULT = 5
+COMPLEXITIES = ['low', 'medium', 'high']  # anything else is code 3
+
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'of', 'to', 'for', 'in', 'on', 'with', 'by', 'is', 'are',
+    'be', 'it', 'that', 'this', 'as', 'at', 'or', 'from', 'your', 'their', 'can', 'using'
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping tech-ish characters (c++, c#, node.js)"""
+    tokens = re.findall(r'[a-z0-9][a-z0-9+#.]*', (text or '').lower())
+    return [t.rstrip('.') for t in tokens if len(t) > 1 and t not in STOPWORDS]
+
+class IdeaIndex:
+    """
+    In-memory index over every stored idea.
+
+    Tech stack entries, domains and complexities are interned into small
+    vocabularies with posting arrays (vocab id -> ideas), so a query is scored
+    by matching the profile against each vocabulary once and scattering the
+    result to ideas with NumPy. Text similarity is TF-IDF cosine over an
+    inverted index of idea text.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = []  # {'source_id', 'idea_index', 'idea'}
+        self.seen_sources = set()
+
+        # Vocabularies (string -> id)
+        self.tech_vocab = {}
+        self.domain_vocab = {}
+
+        # Per-idea columns (Python lists, frozen into arrays on demand)
+        self._tech_owner = []
+        self._tech_idx = []
+        self._domain_code = []
+        self._complexity_code = []
+        self._time_points = []
+        self._judge_appeal = []
+        self._learning_curve = []
+
+        # Text inverted index: token -> {idea: term frequency}
+        self.text_postings = {}
+        self._text_counts = []
+
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, source_id: str, ideas: list) -> None:
+        """Add all ideas of one GeneratedIdea row"""
+        with self.lock:
+            if source_id in self.seen_sources:
+                return
+            self.seen_sources.add(source_id)
+
+            for idea_index, idea in enumerate(ideas or []):
+                if isinstance(idea, dict):
+                    self._add_idea(source_id, idea_index, idea)
+            self._arrays = None
+
+    def _add_idea(self, source_id: str, idea_index: int, idea: dict) -> None:
+        position = len(self.entries)
+        self.entries.append({'source_id': source_id, 'idea_index': idea_index, 'idea': idea})
+
+        technical = idea.get('technical') or {}
+        feasibility = idea.get('feasibility') or {}
+        differentiation = idea.get('differentiation') or {}
+
+        for tech in technical.get('tech_stack') or []:
+            key = str(tech).lower()
+            self._tech_idx.append(self.tech_vocab.setdefault(key, len(self.tech_vocab)))
+            self._tech_owner.append(position)
+
+        domain = str(idea.get('domain', '')).lower()
+        self._domain_code.append(self.domain_vocab.setdefault(domain, len(self.domain_vocab)))
+
+        complexity = feasibility.get('complexity', 'medium')
+        self._complexity_code.append(COMPLEXITIES.index(complexity) if complexity in COMPLEXITIES else 3)
+
+        time_fit = str(feasibility.get('time_fit', '')).lower()
+        if 'fits' in time_fit or 'perfect' in time_fit:
+            self._time_points.append(15)
+        elif 'tight' in time_fit:
+            self._time_points.append(10)
+        elif 'ambitious' in time_fit:
+            self._time_points.append(5)
+        else:
+            self._time_points.append(0)
+
+        self._judge_appeal.append(bool(differentiation.get('judge_appeal')))
+        self._learning_curve.append(bool(feasibility.get('learning_curve')))
+
+        text = ' '.join([
+            str(idea.get('name', '')),
+            str(idea.get('tagline', '')),
+            str(idea.get('domain', '')),
+            str((idea.get('problem') or {}).get('statement', '')),
+            str((idea.get('solution') or {}).get('description', '')),
+            ' '.join(str(t) for t in technical.get('tech_stack') or [])
+        ])
+        counts = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            self.text_postings.setdefault(token, {})[position] = count
+        self._text_counts.append(counts)
+
+    def _freeze(self) -> dict:
+        """Build NumPy columns (called under the lock after writes)"""
+        if self._arrays is None:
+            n = len(self.entries)
+            doc_freq = {token: len(postings) for token, postings in self.text_postings.items()}
+            norms = np.zeros(n)
+            for position, counts in enumerate(self._text_counts):
+                norms[position] = math.sqrt(sum(
+                    (count * (math.log((1 + n) / (1 + doc_freq[token])) + 1)) ** 2
+                    for token, count in counts.items()
+                )) or 1.0
+
+            self._arrays = {
+                'tech_owner': np.asarray(self._tech_owner, dtype=np.int64),
+                'tech_idx': np.asarray(self._tech_idx, dtype=np.int64),
+                'domain_code': np.asarray(self._domain_code, dtype=np.int64),
+                'complexity_code': np.asarray(self._complexity_code, dtype=np.int64),
+                'time_points': np.asarray(self._time_points, dtype=np.float64),
+                'judge_appeal': np.asarray(self._judge_appeal, dtype=bool),
+                'learning_curve': np.asarray(self._learning_curve, dtype=bool),
+                'text_norms': norms,
+                'tech_terms': list(self.tech_vocab.keys()),
+                'domain_terms': list(self.domain_vocab.keys())
+            }
+        return self._arrays
+
+    def match_scores(self, profile: dict) -> np.ndarray:
+        """Vectorized IdeaGenerationService._calculate_match_score over every idea"""
+        with self.lock:
+            arrays = self._freeze()
+        n = len(arrays['domain_code'])
+        score = np.zeros(n)
+
+        # Skill match (30 points): evaluate each distinct tech string once, then scatter
+        languages = [lang.lower() for lang in profile['languages']]
+        frameworks = [fw.lower() for fw in profile['frameworks']]
+        tech_weight = np.array([
+            any(lang in tech for lang in languages) + any(fw in tech for fw in frameworks)
+            for tech in arrays['tech_terms']
+        ], dtype=np.float64)
+        if len(arrays['tech_idx']):
+            tech_hits = np.bincount(arrays['tech_owner'], weights=tech_weight[arrays['tech_idx']], minlength=n)
+        else:
+            tech_hits = np.zeros(n)
+        score += np.minimum(tech_hits * 5, 30)
+
+        # Complexity vs skill level (20 points)
+        skill_level = profile['skill_level']
+        complexity_points = np.array(
+            [COMPLEXITY_MATCH.get((skill_level, c), COMPLEXITY_DEFAULT) for c in COMPLEXITIES] + [COMPLEXITY_DEFAULT],
+            dtype=np.float64
+        )
+        score += complexity_points[arrays['complexity_code']]
+
+        # Interest alignment (25 points)
+        interests = [interest.lower() for interest in profile['interests']]
+        domain_points = np.array([
+            25 if any(interest in domain for interest in interests) else 10
+            for domain in arrays['domain_terms']
+        ], dtype=np.float64)
+        if n:
+            score += domain_points[arrays['domain_code']]
+
+        # Time feasibility (15 points)
+        score += arrays['time_points']
+
+        # Goal alignment (10 points)
+        goal = profile['goals']
+        if goal == 'win':
+            score += np.where(arrays['judge_appeal'], 10, 5)
+        elif goal == 'learn':
+            score += np.where(arrays['learning_curve'], 10, 5)
+        else:
+            score += 5
+
+        return np.minimum(score, 100)
+
+    def text_similarity(self, query_text: str) -> np.ndarray:
+        """TF-IDF cosine similarity between the query and every idea"""
+        with self.lock:
+            arrays = self._freeze()
+            n = len(self.entries)
+            similarity = np.zeros(n)
+
+            query_counts = {}
+            for token in tokenize(query_text):
+                if token in self.text_postings:
+                    query_counts[token] = query_counts.get(token, 0) + 1
+
+            query_norm = 0.0
+            for token, query_count in query_counts.items():
+                postings = self.text_postings[token]
+                idf = math.log((1 + n) / (1 + len(postings))) + 1
+                positions = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                counts = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+                np.add.at(similarity, positions, counts * idf * query_count * idf)
+                query_norm += (query_count * idf) ** 2
+
+        if query_norm == 0:
+            return similarity
+        return similarity / (arrays['text_norms'] * math.sqrt(query_norm))
+
+    def search(self, profile: dict, query_text: str = '', top_k: int = 4, text_weight: float = 10.0) -> list:
+        """Top-K ideas for a profile, best first"""
+        if not self.entries:
+            return []
+
+        match = self.match_scores(profile)
+        similarity = self.text_similarity(query_text)
+        ranking = match + text_weight * similarity
+
+        # Over-fetch so duplicate idea names can be dropped without a second pass
+        k = min(len(ranking), top_k * 4)
+        candidates = np.argpartition(-ranking, k - 1)[:k]
+        candidates = candidates[np.argsort(-ranking[candidates], kind='stable')]
+
+        results = []
+        seen_names = set()
+        for position in candidates:
+            entry = self.entries[int(position)]
+            name = str(entry['idea'].get('name', '')).lower()
+            if name in seen_names:
+                continue
+            seen_names.add(name)
+            results.append({
+                'source_id': entry['source_id'],
+                'idea_index': entry['idea_index'],
+                'match_score': int(match[position]),
+                'similarity': round(float(similarity[position]), 3),
+                'idea': entry['idea']
+            })
+            if len(results) >= top_k:
+                break
+        return results
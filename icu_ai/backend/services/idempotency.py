@@ -0,0 +1,151 @@
+import os
+import random
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import request, jsonify, make_response, Response
+from sqlalchemy.exc import IntegrityError
+from database import db, IdempotencyRecord
+
+IN_PROGRESS = 'in_progress'
+COMPLETED = 'completed'
+
+class IdempotencyStore:
+    """
+    Durable Idempotency-Key records in the idempotency_records table.
+
+    The first request with a key inserts an in_progress record (the primary
+    key makes that a lock across workers), runs, and stores its response.
+    Repeats replay the stored response; while the first request is still
+    running they get 409 with Retry-After instead of holding a worker.
+    All statements run on their own connection, outside the request session.
+    """
+
+    def __init__(self):
+        self.table = IdempotencyRecord.__table__
+        self.ttl = timedelta(hours=float(os.getenv('IDEMPOTENCY_TTL_HOURS', 24)))
+        # An in_progress record older than this belongs to a crashed worker
+        self.lock_timeout = timedelta(seconds=int(os.getenv('IDEMPOTENCY_LOCK_SECONDS', 300)))
+        self.retry_after = int(os.getenv('IDEMPOTENCY_RETRY_AFTER_SECONDS', 5))
+
+    def acquire(self, key: str, request_hash: str) -> bool:
+        """Insert an in_progress record; False if one already exists"""
+        now = datetime.utcnow()
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(self.table.insert().values(
+                    key=key, request_hash=request_hash, status=IN_PROGRESS,
+                    locked_at=now, expires_at=now + self.ttl
+                ))
+        except IntegrityError:
+            return False
+        self._cleanup()
+        return True
+
+    def get(self, key: str):
+        with db.engine.connect() as conn:
+            return conn.execute(db.select(self.table).where(self.table.c.key == key)).first()
+
+    def take_over(self, record, request_hash: str) -> bool:
+        """Claim an expired or abandoned record for a new request (compare-and-set on locked_at)"""
+        now = datetime.utcnow()
+        with db.engine.begin() as conn:
+            updated = conn.execute(
+                self.table.update()
+                .where(self.table.c.key == record.key, self.table.c.locked_at == record.locked_at)
+                .values(request_hash=request_hash, status=IN_PROGRESS, response_status=None, response_body=None,
+                        response_mimetype=None, locked_at=now, expires_at=now + self.ttl)
+            )
+        return updated.rowcount == 1
+
+    def complete(self, key: str, response: Response) -> None:
+        with db.engine.begin() as conn:
+            conn.execute(
+                self.table.update()
+                .where(self.table.c.key == key)
+                .values(status=COMPLETED, response_status=response.status_code,
+                        response_body=response.get_data(as_text=True),
+                        response_mimetype=response.mimetype)
+            )
+
+    def release(self, key: str) -> None:
+        """Forget a failed attempt so the client can retry with the same key"""
+        with db.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.key == key))
+
+    def is_stale(self, record) -> bool:
+        now = datetime.utcnow()
+        if record.expires_at <= now:
+            return True
+        return record.status == IN_PROGRESS and record.locked_at + self.lock_timeout <= now
+
+    def _cleanup(self):
+        """Occasionally drop expired records (piggybacks on new keys)"""
+        if random.random() < 0.02:
+            with db.engine.begin() as conn:
+                conn.execute(self.table.delete().where(self.table.c.expires_at < datetime.utcnow()))
+
+idempotency_store = IdempotencyStore()
+
+def _replay(record) -> Response:
+    response = Response(record.response_body, status=record.response_status, mimetype=record.response_mimetype)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def idempotent(f):
+    """
+    Decorator honouring an optional Idempotency-Key header. Place it below
+    require_auth / optional_auth (keys are scoped to the caller and endpoint)
+    and below rate_limit, so replays are charged like any other request.
+    Only successful and client-error responses are stored; 5xx and 429 are
+    released so a retry runs the request again.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        client_key = request.headers.get('Idempotency-Key')
+        if not client_key:
+            return f(*args, **kwargs)
+        if len(client_key) > 255:
+            return jsonify({'error': 'Idempotency-Key must be at most 255 characters'}), 400
+
+        user_id = getattr(request, 'user_id', None)
+        caller = f"user:{user_id}" if user_id else f"ip:{request.remote_addr}"
+        key = hashlib.sha256(f"{caller}|{request.method}|{request.path}|{client_key}".encode('utf-8')).hexdigest()
+        request_hash = hashlib.sha256(request.get_data()).hexdigest()
+
+        store = idempotency_store
+        while not store.acquire(key, request_hash):
+            record = store.get(key)
+            if record is None:
+                continue  # released between our insert and read; try again
+
+            if store.is_stale(record):
+                if store.take_over(record, request_hash):
+                    break
+                continue
+
+            if record.request_hash != request_hash:
+                return jsonify({'error': 'Idempotency-Key was already used with a different request body'}), 422
+
+            if record.status == COMPLETED:
+                return _replay(record)
+
+            response = jsonify({'error': 'A request with this Idempotency-Key is still in progress'})
+            response.headers['Retry-After'] = str(store.retry_after)
+            return response, 409
+
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            store.release(key)
+            raise
+
+        try:
+            if response.status_code >= 500 or response.status_code == 429 or response.is_streamed:
+                store.release(key)
+            else:
+                store.complete(key, response)
+        except Exception as e:
+            print(f"Error storing idempotent response: {str(e)}")
+        return response
+    return decorated_function
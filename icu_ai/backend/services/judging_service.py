@@ -0,0 +1,236 @@
+import os
+import json
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from database import db, Project, SavedProject, JudgingSession, JudgingResult
+from services.ai_client import AIClient
+from services.scheduler import SchedulerOverloaded, BULK
+
+class JudgingService:
+    """
+    Ranks a set of stored projects against each other.
+
+    Uses a bottom-up merge sort whose comparator is a small pairwise LLM prompt,
+    so ranking N projects costs about N log2 N calls. All merges on the same level
+    are independent and run concurrently.
+    """
+
+    def __init__(self):
+        self.ai_client = AIClient()
+        self.max_workers = int(os.getenv('JUDGE_MAX_CONCURRENCY', 8))
+        self.max_projects = int(os.getenv('JUDGE_MAX_PROJECTS', 200))
+        self.description_chars = int(os.getenv('JUDGE_DESCRIPTION_CHARS', 800))
+
+    def judge_projects(self, project_ids: list, criteria: str = None, user_id: str = None) -> dict:
+        """Rank the given projects and persist the result"""
+
+        # 1. Load projects (order of the request is kept as the initial order)
+        project_ids = list(dict.fromkeys(project_ids))
+        if len(project_ids) < 2:
+            raise ValueError("At least 2 projects are required for judging")
+        if len(project_ids) > self.max_projects:
+            raise ValueError(f"Too many projects. Max: {self.max_projects}")
+
+        # Only the caller's projects: created by them or saved to their dashboard
+        saved = db.session.query(SavedProject.project_id).filter(SavedProject.user_id == user_id)
+        projects = {p.id: p for p in Project.query.filter(
+            Project.id.in_(project_ids),
+            db.or_(Project.user_id == user_id, Project.id.in_(saved))
+        ).all()} if user_id else {}
+        missing = [pid for pid in project_ids if pid not in projects]
+        if missing:
+            raise ValueError(f"Projects not found: {', '.join(missing)}")
+
+        entries = [self._build_entry(projects[pid]) for pid in project_ids]
+
+        # 2. Sort with concurrent merges (comparisons happen outside the DB session)
+        comparisons = []
+        order = self._merge_sort(entries, criteria, comparisons, user_id)
+
+        # 3. Aggregate per-project stats from the comparison log
+        stats = {pid: {'wins': 0, 'losses': 0, 'confidence': []} for pid in project_ids}
+        for comparison in comparisons:
+            winner, loser = comparison['winner'], comparison['loser']
+            stats[winner]['wins'] += 1
+            stats[loser]['losses'] += 1
+            stats[winner]['confidence'].append(comparison['confidence'])
+            stats[loser]['confidence'].append(comparison['confidence'])
+
+        # 4. Save to database
+        session_id = str(uuid.uuid4())
+        judging_session = JudgingSession(
+            id=session_id,
+            user_id=user_id,
+            criteria=criteria,
+            status='completed',
+            comparison_count=len(comparisons)
+        )
+        judging_session.set_comparisons(comparisons)
+        db.session.add(judging_session)
+
+        rankings = []
+        for rank, entry in enumerate(order, start=1):
+            project_stats = stats[entry['id']]
+            confidences = project_stats['confidence']
+            confidence = round(sum(confidences) / len(confidences), 2) if confidences else 0.0
+
+            db.session.add(JudgingResult(
+                id=str(uuid.uuid4()),
+                session_id=session_id,
+                project_id=entry['id'],
+                rank=rank,
+                confidence=confidence,
+                wins=project_stats['wins'],
+                losses=project_stats['losses']
+            ))
+            rankings.append({
+                'rank': rank,
+                'project_id': entry['id'],
+                'name': entry['name'],
+                'confidence': confidence,
+                'wins': project_stats['wins'],
+                'losses': project_stats['losses']
+            })
+
+        db.session.commit()
+
+        return {
+            'id': session_id,
+            'criteria': criteria,
+            'comparison_count': len(comparisons),
+            'rankings': rankings,
+            'comparisons': comparisons
+        }
+
+    def get_session(self, session_id: str, user_id: str) -> dict:
+        """Load a stored judging session owned by user_id"""
+        judging_session = JudgingSession.query.filter_by(id=session_id, user_id=user_id).first()
+        if not judging_session:
+            return None
+
+        return {
+            'id': judging_session.id,
+            'criteria': judging_session.criteria,
+            'status': judging_session.status,
+            'comparison_count': judging_session.comparison_count,
+            'rankings': [{
+                'rank': result.rank,
+                'project_id': result.project_id,
+                'name': result.project.name if result.project else None,
+                'confidence': result.confidence,
+                'wins': result.wins,
+                'losses': result.losses
+            } for result in judging_session.results],
+            'comparisons': judging_session.get_comparisons(),
+            'created_at': judging_session.created_at.isoformat() if judging_session.created_at else None
+        }
+
+    def _build_entry(self, project: Project) -> dict:
+        """Reduce a project to the fields used in comparison prompts"""
+        tech_stack = 'Not specified'
+        if project.input_data:
+            try:
+                tech_stack = json.loads(project.input_data).get('tech_stack') or tech_stack
+            except (ValueError, AttributeError):
+                pass
+
+        description = (project.description or '').strip()
+        if len(description) > self.description_chars:
+            description = description[:self.description_chars] + '...'
+
+        return {
+            'id': project.id,
+            'name': project.name,
+            'description': description,
+            'tech_stack': tech_stack
+        }
+
+    def _merge_sort(self, entries: list, criteria: str, comparisons: list, user_id: str = None) -> list:
+        """Bottom-up merge sort, best project first"""
+        runs = [[entry] for entry in entries]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(runs) > 1:
+                pairs = [(runs[i], runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+                leftover = [runs[-1]] if len(runs) % 2 else []
+
+                merged = list(executor.map(lambda pair: self._merge(pair[0], pair[1], criteria, user_id), pairs))
+
+                # Keep the log in a deterministic order regardless of thread timing
+                next_runs = []
+                for run, run_log in merged:
+                    next_runs.append(run)
+                    comparisons.extend(run_log)
+                runs = next_runs + leftover
+
+        return runs[0]
+
+    def _merge(self, left: list, right: list, criteria: str, user_id: str = None) -> tuple:
+        """Merge two ranked runs with one comparison per step"""
+        merged = []
+        run_log = []
+        i = j = 0
+
+        while i < len(left) and j < len(right):
+            comparison = self._compare(left[i], right[j], criteria, user_id)
+            run_log.append(comparison)
+            if comparison['winner'] == left[i]['id']:
+                merged.append(left[i])
+                i += 1
+            else:
+                merged.append(right[j])
+                j += 1
+
+        merged.extend(left[i:])
+        merged.extend(right[j:])
+        return merged, run_log
+
+    def _compare(self, a: dict, b: dict, criteria: str, user_id: str = None) -> dict:
+        """Ask the model which of two projects is stronger"""
+        prompt = self._build_comparison_prompt(a, b, criteria)
+
+        try:
+            # Judging is organizer bulk work; it must not starve interactive users
+            response_text = self.ai_client.generate_content(prompt, user_id=user_id, priority=BULK)
+            json_match = re.search(r'(\{.*\})', response_text, re.DOTALL)
+            verdict = json.loads(json_match.group(1) if json_match else response_text)
+
+            choice = str(verdict.get('winner', 'A')).strip().upper()
+            confidence = float(verdict.get('confidence', 0.5))
+            reason = verdict.get('reason', '')
+        except SchedulerOverloaded:
+            raise
+        except Exception as e:
+            # A single failed comparison should not abort the whole ranking;
+            # keep the current order and record the comparison as a coin flip.
+            print(f"Error in judge comparison: {str(e)}")
+            choice, confidence, reason = 'A', 0.5, f"Comparison failed: {str(e)}"
+
+        winner, loser = (a, b) if choice != 'B' else (b, a)
+        return {
+            'a': a['id'],
+            'b': b['id'],
+            'winner': winner['id'],
+            'loser': loser['id'],
+            'confidence': round(min(max(confidence, 0.0), 1.0), 2),
+            'reason': reason
+        }
+
+    def _build_comparison_prompt(self, a: dict, b: dict, criteria: str) -> str:
+        """Construct a compact pairwise comparison prompt"""
+        return f"""
+You are a hackathon judge. Compare these two projects and decide which one is stronger overall.
+JUDGING CRITERIA: {criteria or 'technical execution, innovation, impact and presentation'}
+
+PROJECT A: {a['name']}
+TECH STACK: {a['tech_stack']}
+DESCRIPTION: {a['description']}
+
+PROJECT B: {b['name']}
+TECH STACK: {b['tech_stack']}
+DESCRIPTION: {b['description']}
+
+Return ONLY this JSON:
+{{"winner": "A or B", "confidence": 0.5-1.0, "reason": "one sentence"}}
+"""
@@ -0,0 +1,252 @@
+import os
+import io
+import time
+import threading
+import multiprocessing
+from werkzeug.datastructures import FileStorage
+from services.upload_streams import spooled_path
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, the wall-clock timeout still applies
+    resource = None
+
+def _address_space() -> int:
+    """Current virtual memory size of this process in bytes (Linux), else 0"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+def limit_memory(memory_limit: int):
+    """Limit address space growth beyond what the (forked) process already maps"""
+    if resource and memory_limit:
+        limit = _address_space() + memory_limit
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def arm_cpu_limit(cpu_limit: int):
+    """Allow `cpu_limit` more CPU seconds; RLIMIT_CPU counts the whole process lifetime"""
+    if resource and cpu_limit:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = int(usage.ru_utime + usage.ru_stime) + cpu_limit
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _worker_main(conn, memory_limit: int, cpu_limit: int):
+    """
+    Parser worker loop: receive (parser, filename, path, data), send back
+    ('ok', text) or ('error', message). Runs until it gets None.
+
+    Page ranges of large PDFs are not extracted here: the worker sends
+    ('pages', backend, path, ranges) and the web process runs them on its
+    shared PDF page pool, so there is one page pool per web process.
+    """
+    from services import file_parser, pdf_extraction
+
+    def run_ranges(backend_name: str, path: str, ranges: list) -> list:
+        conn.send(('pages', backend_name, path, ranges))
+        status, payload = conn.recv()
+        if status != 'ok':
+            raise ValueError(payload)
+        return payload
+    pdf_extraction.range_runner = run_ranges
+
+    limit_memory(memory_limit)
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        parser_name, filename, path, data = job
+        arm_cpu_limit(cpu_limit)
+
+        stream = open(path, 'rb') if path else io.BytesIO(data)
+        try:
+            text = getattr(file_parser, parser_name)(FileStorage(stream=stream, filename=filename))
+            conn.send(('ok', text))
+        except MemoryError:
+            conn.send(('error', 'Parser ran out of memory'))
+        except Exception as e:
+            conn.send(('error', str(e)))
+        finally:
+            stream.close()
+
+class _Worker:
+    def __init__(self, context, memory_limit: int, cpu_limit: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit, cpu_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def stop(self, kill: bool = False):
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+class ParserPool:
+    """
+    Pre-forked worker processes that run the document parsers out of the
+    web worker.
+
+    Each job gets a wall-clock timeout (the worker is killed and replaced
+    when it expires) plus RLIMIT_AS / RLIMIT_CPU limits inside the worker,
+    so a hostile PDF or DOCX costs one parser process, not a web worker.
+    Workers are recycled after PARSER_MAX_JOBS_PER_WORKER jobs. Spooled
+    uploads are passed by path; small in-memory uploads by value. Large
+    PDFs fan out to the shared page pool in services/pdf_extraction, whose
+    workers get the same memory and CPU limits.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('PARSER_POOL_ENABLED', 'true').lower() == 'true'
+        self.size = int(os.getenv('PARSER_POOL_SIZE', 2))
+        self.timeout = float(os.getenv('PARSER_JOB_TIMEOUT_SECONDS', 30))
+        self.max_jobs = int(os.getenv('PARSER_MAX_JOBS_PER_WORKER', 100))
+        self.memory_limit = int(os.getenv('PARSER_MEMORY_LIMIT_MB', 512)) * 1024 * 1024
+        self.cpu_limit = int(os.getenv('PARSER_CPU_LIMIT_SECONDS', 30))
+
+        methods = multiprocessing.get_all_start_methods()
+        self.context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+        self.cond = threading.Condition()
+        self.idle = []
+        self.started = False
+        self.pid = None
+        self.waiting = 0
+        self.busy = 0
+        self.counters = {'jobs': 0, 'errors': 0, 'timeouts': 0, 'crashes': 0, 'recycled': 0}
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self.context, self.memory_limit, self.cpu_limit)
+
+    def _ensure_started(self):
+        """Fork the workers on first use, in the process that will use them (caller holds the lock)"""
+        if self.started and self.pid == os.getpid():
+            return
+        self.idle = [self._spawn() for _ in range(self.size)]
+        self.busy = 0
+        self.started = True
+        self.pid = os.getpid()
+
+    def _acquire(self) -> _Worker:
+        deadline = time.time() + self.timeout
+        with self.cond:
+            self._ensure_started()
+            self.waiting += 1
+            try:
+                while not self.idle:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise ValueError('Parser pool is busy, please retry later')
+                    self.cond.wait(remaining)
+                self.busy += 1
+                return self.idle.pop()
+            finally:
+                self.waiting -= 1
+
+    def _release(self, worker: _Worker, failed: bool = False):
+        if failed:
+            worker.stop(kill=True)
+            worker = self._spawn()
+        elif worker.jobs >= self.max_jobs:
+            self._count('recycled')
+            worker.stop()
+            worker = self._spawn()
+        with self.cond:
+            self.busy -= 1
+            self.idle.append(worker)
+            self.cond.notify()
+
+    def parse(self, parser_name: str, file: FileStorage) -> str:
+        """Run file_parser.<parser_name> on an upload in a sandboxed worker"""
+        if not self.enabled:
+            from services import file_parser
+            return getattr(file_parser, parser_name)(file)
+
+        path = spooled_path(file)
+        data = None
+        if not path:
+            file.stream.seek(0)
+            data = file.stream.read()
+            file.stream.seek(0)
+
+        worker = self._acquire()
+        failed = False
+        try:
+            worker.jobs += 1
+            worker.conn.send((parser_name, file.filename, path, data))
+            deadline = time.time() + self.timeout
+            while True:
+                if not worker.conn.poll(max(deadline - time.time(), 0)):
+                    failed = True
+                    self._count('timeouts')
+                    raise ValueError(f"Parsing timed out after {self.timeout:g} seconds")
+                try:
+                    message = worker.conn.recv()
+                except (EOFError, OSError):
+                    # Killed by RLIMIT_CPU (SIGXCPU), the OOM killer or a crash in C code
+                    failed = True
+                    self._count('crashes')
+                    raise ValueError('Parser crashed while reading this file (it may be malformed or too complex)')
+                if message[0] != 'pages':
+                    status, payload = message
+                    break
+                worker.conn.send(self._run_pages(*message[1:], deadline - time.time()))
+        finally:
+            self._release(worker, failed)
+
+        self._count('jobs')
+        if status != 'ok':
+            self._count('errors')
+            raise ValueError(payload)
+        return payload
+
+    def _run_pages(self, backend_name: str, path: str, ranges: list, timeout: float) -> tuple:
+        """Extract page ranges a worker asked for on the shared PDF page pool"""
+        from services import pdf_extraction
+        try:
+            return 'ok', pdf_extraction.run_ranges(backend_name, path, ranges, timeout=max(timeout, 0.001))
+        except Exception as e:
+            return 'error', str(e)
+
+    def _count(self, name: str):
+        with self.cond:
+            self.counters[name] += 1
+
+    def stats(self) -> dict:
+        with self.cond:
+            finished = self.counters['jobs'] + self.counters['timeouts'] + self.counters['crashes']
+            return {
+                'enabled': self.enabled,
+                'size': self.size,
+                'busy': self.busy,
+                'queue_depth': self.waiting,
+                **self.counters,
+                'timeout_rate': round(self.counters['timeouts'] / finished, 3) if finished else None
+            }
+
+    def shutdown(self):
+        with self.cond:
+            workers, self.idle = self.idle, []
+            self.started = False
+        for worker in workers:
+            worker.stop()
+
+parser_pool = ParserPool()
@@ -0,0 +1,279 @@
+import os
+import io
+import tempfile
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+# Raw text ceiling; the summarizer then condenses it to the prompt budget
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', 120000))
+# Reading stops at the character budget; the page cap only bounds image-heavy decks
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 50))
+
+class PyPDF2Backend:
+    name = 'pypdf2'
+
+    def __init__(self):
+        import PyPDF2
+        self.module = PyPDF2
+
+    def open(self, source):
+        return self.module.PdfReader(_as_stream(source))
+
+    def page_count(self, doc) -> int:
+        return len(doc.pages)
+
+    def page_text(self, doc, index: int) -> str:
+        return doc.pages[index].extract_text() or ''
+
+class PyPDFBackend(PyPDF2Backend):
+    """pypdf is the maintained successor of PyPDF2 (same API, faster extraction)"""
+    name = 'pypdf'
+
+    def __init__(self):
+        import pypdf
+        self.module = pypdf
+
+class PyMuPDFBackend:
+    """MuPDF bindings; several times faster than the pure-Python parsers"""
+    name = 'pymupdf'
+
+    def __init__(self):
+        import fitz
+        self.module = fitz
+
+    def open(self, source):
+        if isinstance(source, str):
+            return self.module.open(source)
+        return self.module.open(stream=_as_bytes(source), filetype='pdf')
+
+    def page_count(self, doc) -> int:
+        return doc.page_count
+
+    def page_text(self, doc, index: int) -> str:
+        return doc.load_page(index).get_text() or ''
+
+BACKENDS = {
+    'pymupdf': PyMuPDFBackend,
+    'pypdf': PyPDFBackend,
+    'pypdf2': PyPDF2Backend
+}
+
+_backends = {}
+
+def get_backend(name: str = None):
+    """
+    Resolve PDF_EXTRACT_BACKEND. 'auto' (the default) picks the fastest
+    installed library; an explicitly named backend must be installed.
+    """
+    name = (name or os.getenv('PDF_EXTRACT_BACKEND', 'auto')).lower()
+    if name in _backends:
+        return _backends[name]
+
+    if name == 'auto':
+        for candidate in BACKENDS:
+            try:
+                backend = BACKENDS[candidate]()
+                break
+            except ImportError:
+                continue
+        else:
+            raise ValueError("No PDF library installed (PyMuPDF, pypdf or PyPDF2)")
+    elif name in BACKENDS:
+        backend = BACKENDS[name]()
+    else:
+        raise ValueError(f"Unknown PDF_EXTRACT_BACKEND: {name}")
+
+    _backends[name] = backend
+    return backend
+
+def _as_stream(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+def _as_bytes(source) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+# ============================================
+# Process pool for large documents
+# ============================================
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_counters = {'ranges': 0, 'crashes': 0}
+_pool_pids = set()
+
+# Set inside a parser_pool worker so its page ranges go to the shared pool of the web process
+range_runner = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from services.parser_pool import parser_pool
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers(), initializer=_init_worker,
+                                        initargs=(parser_pool.memory_limit, parser_pool.cpu_limit))
+        return _pool
+
+def _pool_workers() -> int:
+    return int(os.getenv('PDF_EXTRACT_WORKERS', min(4, os.cpu_count() or 1)))
+
+_worker_doc = None  # (backend, path, inode, mtime, document) last opened in this worker
+_worker_cpu_limit = 0
+
+def _init_worker(memory_limit: int, cpu_limit: int):
+    """Page workers parse untrusted PDFs too, so they get the parser sandbox limits"""
+    global _worker_cpu_limit
+    from services.parser_pool import limit_memory
+    limit_memory(memory_limit)
+    _worker_cpu_limit = cpu_limit
+
+def _extract_range(backend_name: str, path: str, start: int, stop: int) -> tuple:
+    """
+    Worker task: extract a contiguous page range; returns (worker pid, page
+    texts). Tasks get the file path, not the document bytes, and a worker
+    keeps the last document it opened, so its later ranges of the same file
+    skip re-reading and re-parsing it.
+    """
+    global _worker_doc
+    from services.parser_pool import arm_cpu_limit
+    arm_cpu_limit(_worker_cpu_limit)
+
+    backend = get_backend(backend_name)
+    stat = os.stat(path)
+    key = (backend.name, path, stat.st_ino, stat.st_mtime_ns)
+    if _worker_doc is None or _worker_doc[:4] != key:
+        _worker_doc = key + (backend.open(path),)
+    doc = _worker_doc[4]
+    return os.getpid(), [backend.page_text(doc, i) for i in range(start, stop)]
+
+def run_ranges(backend_name: str, path: str, ranges: list, timeout: float = None) -> list:
+    """Extract page ranges on the shared pool; returns the page texts of each range in order"""
+    global _pool
+    deadline = time.time() + timeout if timeout else None
+    pool = _get_pool()
+    try:
+        futures = [pool.submit(_extract_range, backend_name, path, a, b) for a, b in ranges]
+        results = []
+        for future in futures:
+            remaining = max(deadline - time.time(), 0) if deadline else None
+            try:
+                pid, page_texts = future.result(timeout=remaining)
+            except FuturesTimeout:
+                raise ValueError('PDF page extraction timed out')
+            results.append(page_texts)
+            with _pool_lock:
+                _pool_counters['ranges'] += 1
+                _pool_pids.add(pid)
+        return results
+    except BrokenProcessPool:
+        # A page worker was killed (RLIMIT_CPU / RLIMIT_AS or a crash in C code); start a fresh pool
+        with _pool_lock:
+            _pool_counters['crashes'] += 1
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False)
+        raise ValueError('PDF page worker crashed while reading this file (it may be malformed or too complex)')
+
+def pool_stats() -> dict:
+    with _pool_lock:
+        return {
+            'workers': _pool_workers(),
+            'started': _pool is not None,
+            'processes_used': len(_pool_pids),
+            **_pool_counters
+        }
+
+def _write_temp(source) -> str:
+    """Write an in-memory document to a temp file the pool workers can open"""
+    with tempfile.NamedTemporaryFile(mode='wb', prefix='pdf-', suffix='.pdf', delete=False,
+                                     dir=os.getenv('UPLOAD_TMP_DIR') or None) as f:
+        f.write(_as_bytes(source))
+        return f.name
+
+# ============================================
+# Extraction
+# ============================================
+
+def extract_pdf_text(source, max_chars: int = None, max_pages: int = None,
+                     backend: str = None, parallel: bool = True) -> dict:
+    """
+    Extract text from a PDF until the character budget is met.
+
+    `source` is a file path, bytes or a binary file object. Small documents
+    are read page by page in-process and reading stops at the first page
+    that fills the budget. Documents with at least PDF_PARALLEL_MIN_PAGES
+    pages to read are split into page ranges extracted in a process pool,
+    one wave of ranges at a time, so the budget still stops the work early.
+    There is one such pool per web process: a parser_pool worker sends its
+    ranges to it through `range_runner` rather than starting its own.
+    """
+    max_chars = max_chars or PDF_MAX_CHARS
+    max_pages = max_pages or PDF_MAX_PAGES
+    backend = get_backend(backend)
+
+    doc = backend.open(source)
+    page_count = backend.page_count(doc)
+    pages_to_read = min(page_count, max_pages)
+
+    parts = []
+    total = 0
+    pages_read = 0
+
+    parallel_min_pages = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 16))
+    workers = _pool_workers()
+    if parallel and workers > 1 and pages_to_read >= parallel_min_pages:
+        # Workers open the file by path; an in-memory document is written to disk once
+        path = source if isinstance(source, str) else _write_temp(source)
+        chunk = int(os.getenv('PDF_PAGES_PER_TASK', 4))
+        runner = range_runner or run_ranges
+
+        try:
+            start = 0
+            while start < pages_to_read and total < max_chars:
+                ranges = []
+                for _ in range(workers):
+                    if start >= pages_to_read:
+                        break
+                    ranges.append((start, min(start + chunk, pages_to_read)))
+                    start = ranges[-1][1]
+
+                for page_texts in runner(backend.name, path, ranges):
+                    for page_text in page_texts:
+                        pages_read += 1
+                        if total >= max_chars:
+                            continue
+                        if page_text:
+                            parts.append(page_text)
+                            total += len(page_text) + 1
+        finally:
+            if path is not source:
+                os.unlink(path)
+    else:
+        for index in range(pages_to_read):
+            page_text = backend.page_text(doc, index)
+            pages_read += 1
+            if page_text:
+                parts.append(page_text)
+                total += len(page_text) + 1
+            if total >= max_chars:
+                break
+
+    text = "\n".join(parts).strip()
+    budget_met = total >= max_chars
+    truncated = budget_met and (len(text) > max_chars or pages_read < page_count)
+    text = text[:max_chars]
+
+    return {
+        'text': text,
+        'backend': backend.name,
+        'page_count': page_count,
+        'pages_read': pages_read,
+        'truncated': truncated,
+        'pages_skipped': page_count > pages_read and not budget_met
+    }
@@ -0,0 +1,122 @@
+import math
+import random
+import bisect
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Keeps a stack of compactors; level h holds items of weight 2**h. When a
+    level exceeds its capacity it is sorted and every other item (random
+    offset) is promoted to the next level. Memory is O(k log(n/k)), rank
+    error is about 1.65 / k, and two sketches merge by concatenating levels.
+    """
+
+    def __init__(self, k: int = 200, c: float = 2 / 3):
+        self.k = k
+        self.c = c
+        self.compactors = [[]]
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._sorted = None  # cached (values, cumulative weights) for queries
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (self.c ** depth))))
+
+    def _size(self) -> int:
+        return sum(len(c) for c in self.compactors)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        self._sorted = None
+        self.compactors[0].append(value)
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self._size() >= self._max_size():
+            self._compress()
+
+    def merge(self, other: 'KLLSketch') -> None:
+        self._sorted = None
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for level in range(len(self.compactors)):
+                if len(self.compactors[level]) >= self._capacity(level):
+                    if level + 1 >= len(self.compactors):
+                        self.compactors.append([])
+                    items = sorted(self.compactors[level])
+                    # Odd leftover stays on this level so total weight is preserved
+                    keep = [items.pop()] if len(items) % 2 else []
+                    offset = random.randint(0, 1)
+                    self.compactors[level + 1].extend(items[offset::2])
+                    self.compactors[level] = keep
+                    break
+
+    def _cumulative(self) -> tuple:
+        """Sorted values with their cumulative weights (cached until the next write)"""
+        if self._sorted is None:
+            weighted = sorted(
+                (value, 2 ** level)
+                for level, items in enumerate(self.compactors)
+                for value in items
+            )
+            values, cumulative, total = [], [], 0
+            for value, weight in weighted:
+                total += weight
+                values.append(value)
+                cumulative.append(total)
+            self._sorted = (values, cumulative)
+        return self._sorted
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of inserted values strictly below `value`"""
+        values, cumulative = self._cumulative()
+        if not values:
+            return 0.0
+        position = bisect.bisect_left(values, value)
+        return (cumulative[position - 1] if position else 0) / cumulative[-1]
+
+    def quantiles(self, fractions: list) -> list:
+        """Approximate values at the given fractions (0-1)"""
+        values, cumulative = self._cumulative()
+        if not values:
+            return [None for _ in fractions]
+
+        results = []
+        for q in fractions:
+            position = min(bisect.bisect_left(cumulative, q * cumulative[-1]), len(values) - 1)
+            results.append(min(max(values[position], self.min), self.max))
+        return results
+
+    def to_dict(self) -> dict:
+        return {
+            'k': self.k,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'compactors': self.compactors
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'KLLSketch':
+        sketch = cls(k=data.get('k', 200))
+        sketch.count = data.get('count', 0)
+        sketch.min = data.get('min')
+        sketch.max = data.get('max')
+        sketch.compactors = data.get('compactors') or [[]]
+        return sketch
@@ -0,0 +1,255 @@
+import os
+import json
+import math
+import time
+import random
+import threading
+from functools import wraps
+from flask import request, jsonify, make_response
+from sqlalchemy.exc import IntegrityError
+from database import db, RateLimitCounter, User
+
+# Requests per window for each plan and route class: {plan: {route_class: [limit, window_seconds]}}
+DEFAULT_PLAN_LIMITS = {
+    'anonymous': {
+        'evaluate': [5, 3600],
+        'ideas': [10, 3600],
+        'upload': [20, 3600],
+        'github': [20, 3600]
+    },
+    'free': {
+        'evaluate': [30, 3600],
+        'ideas': [30, 3600],
+        'upload': [60, 3600],
+        'github': [60, 3600]
+    },
+    'pro': {
+        'evaluate': [300, 3600],
+        'ideas': [300, 3600],
+        'upload': [600, 3600],
+        'github': [600, 3600]
+    }
+}
+
+class MemoryBackend:
+    """Per-process counters; only correct with a single worker"""
+
+    def __init__(self):
+        self.counters = {}  # key -> (count, expires_at)
+        self.lock = threading.Lock()
+
+    def incr(self, key: str, amount: int, ttl: int) -> int:
+        now = time.time()
+        with self.lock:
+            count, expires_at = self.counters.get(key, (0, now + ttl))
+            if expires_at <= now:
+                count, expires_at = 0, now + ttl
+            count += amount
+            self.counters[key] = (count, expires_at)
+
+            if len(self.counters) > 10000:
+                for stale in [k for k, (_, exp) in self.counters.items() if exp <= now]:
+                    del self.counters[stale]
+            return count
+
+    def get(self, key: str) -> int:
+        with self.lock:
+            count, expires_at = self.counters.get(key, (0, 0))
+            return count if expires_at > time.time() else 0
+
+class DatabaseBackend:
+    """
+    Counters in the rate_limit_counters table, shared by every worker.
+
+    Each increment is an atomic UPDATE ... SET count = count + n on its own
+    connection, so it never touches the request's session.
+    """
+
+    def __init__(self):
+        self.table = RateLimitCounter.__table__
+
+    def incr(self, key: str, amount: int, ttl: int) -> int:
+        expires_at = int(time.time()) + ttl
+        for _ in range(2):
+            with db.engine.begin() as conn:
+                updated = conn.execute(
+                    self.table.update()
+                    .where(self.table.c.key == key)
+                    .values(count=self.table.c.count + amount)
+                )
+                if updated.rowcount:
+                    return conn.execute(
+                        db.select(self.table.c.count).where(self.table.c.key == key)
+                    ).scalar()
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(self.table.insert().values(key=key, count=amount, expires_at=expires_at))
+                self._cleanup()
+                return amount
+            except IntegrityError:
+                continue  # another worker created the row first; update it
+        return amount
+
+    def get(self, key: str) -> int:
+        with db.engine.connect() as conn:
+            count = conn.execute(db.select(self.table.c.count).where(self.table.c.key == key)).scalar()
+        return count or 0
+
+    def _cleanup(self):
+        """Occasionally drop expired windows (piggybacks on new-window inserts)"""
+        if random.random() < 0.05:
+            with db.engine.begin() as conn:
+                conn.execute(self.table.delete().where(self.table.c.expires_at < int(time.time())))
+
+class RedisBackend:
+    """Counters in Redis (INCRBY + EXPIRE), shared by every worker"""
+
+    def __init__(self, url: str):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def incr(self, key: str, amount: int, ttl: int) -> int:
+        pipe = self.client.pipeline()
+        pipe.incrby(key, amount)
+        pipe.expire(key, ttl)
+        return int(pipe.execute()[0])
+
+    def get(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value else 0
+
+class RateLimiter:
+    """
+    Sliding-window rate limiting per route class, keyed on the user (when
+    authenticated) or the client IP. A user's plan is read from the users
+    table and cached briefly, so plan changes apply within a minute.
+
+    Uses the sliding window counter approximation: the previous fixed
+    window's count is weighted by how much of it still overlaps the sliding
+    window, plus the current window's count. Two counters per client and
+    route class, one atomic increment per request.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+        self.plans = DEFAULT_PLAN_LIMITS
+        if os.getenv('RATE_LIMIT_PLANS'):
+            self.plans = json.loads(os.getenv('RATE_LIMIT_PLANS'))
+
+        backend = os.getenv('RATE_LIMIT_BACKEND', 'database').lower()
+        if backend == 'redis':
+            self.backend = RedisBackend(os.getenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0'))
+        elif backend == 'memory':
+            self.backend = MemoryBackend()
+        else:
+            self.backend = DatabaseBackend()
+
+        self.plan_ttl = float(os.getenv('RATE_LIMIT_PLAN_CACHE_SECONDS', 60))
+        self.plan_cache = {}  # user_id -> (plan, loaded_at)
+        self.lock = threading.Lock()
+
+    def plan_for(self, user_id: str) -> str:
+        """The user's current plan, from a short-lived cache of the users table"""
+        now = time.time()
+        with self.lock:
+            cached = self.plan_cache.get(user_id)
+        if cached and now - cached[1] < self.plan_ttl:
+            return cached[0]
+
+        with db.engine.connect() as conn:
+            plan = conn.execute(db.select(User.plan).where(User.id == user_id)).scalar()
+        plan = plan or 'free'
+
+        with self.lock:
+            if len(self.plan_cache) > 10000:
+                self.plan_cache.clear()
+            self.plan_cache[user_id] = (plan, now)
+        return plan
+
+    def _limit_for(self, plan: str, route_class: str):
+        limits = self.plans.get(plan) or self.plans.get('free') or {}
+        return limits.get(route_class)
+
+    def hit(self, route_class: str, identity: str, plan: str) -> dict:
+        """Count one request; returns the limit state, with 'allowed' False when over the limit"""
+        rule = self._limit_for(plan, route_class)
+        if not rule:
+            return None
+        limit, window = int(rule[0]), int(rule[1])
+
+        now = time.time()
+        window_start = int(now // window) * window
+        elapsed = (now - window_start) / window
+        current_key = f"{route_class}|{identity}|{window_start}"
+        previous_key = f"{route_class}|{identity}|{window_start - window}"
+
+        current = self.backend.incr(current_key, 1, window * 2)
+        previous = self.backend.get(previous_key)
+        estimate = previous * (1 - elapsed) + current
+
+        allowed = estimate <= limit
+        if not allowed:
+            # Rejected requests don't count against the client
+            current = self.backend.incr(current_key, -1, window * 2)
+            estimate = previous * (1 - elapsed) + current
+
+        return {
+            'allowed': allowed,
+            'limit': limit,
+            'remaining': max(0, int(limit - estimate)),
+            'reset': window_start + window,
+            'retry_after': 0 if allowed else self._retry_after(limit, window, elapsed, previous, current)
+        }
+
+    def _retry_after(self, limit: int, window: int, elapsed: float, previous: int, current: int) -> int:
+        """Seconds until one more request fits under the sliding estimate"""
+        if current < limit and previous > 0:
+            # The previous window's weight decays linearly through this window
+            needed = 1 - (limit - current - 1) / previous
+            return max(1, int(math.ceil((needed - elapsed) * window)))
+        # Wait for the next window, where this window becomes the decaying one
+        needed = 1 - (limit - 1) / current if current else 0
+        return max(1, int(math.ceil((1 - elapsed + max(needed, 0)) * window)))
+
+rate_limiter = RateLimiter()
+
+def rate_limit(route_class: str):
+    """
+    Decorator applying the per-plan limit for a route class. Place it below
+    require_auth / optional_auth so request.user_id is already set.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not rate_limiter.enabled:
+                return f(*args, **kwargs)
+
+            user_id = getattr(request, 'user_id', None)
+            identity = f"user:{user_id}" if user_id else f"ip:{request.remote_addr}"
+
+            try:
+                plan = rate_limiter.plan_for(user_id) if user_id else 'anonymous'
+                state = rate_limiter.hit(route_class, identity, plan)
+            except Exception as e:
+                # Fail open: a broken counter store must not take the API down
+                print(f"Rate limiter error: {str(e)}")
+                state = None
+
+            if state is None:
+                return f(*args, **kwargs)
+
+            if not state['allowed']:
+                response = make_response(jsonify({
+                    'error': 'Rate limit exceeded, please retry later',
+                    'retry_after': state['retry_after']
+                }), 429)
+                response.headers['Retry-After'] = str(state['retry_after'])
+            else:
+                response = make_response(f(*args, **kwargs))
+
+            response.headers['X-RateLimit-Limit'] = str(state['limit'])
+            response.headers['X-RateLimit-Remaining'] = str(state['remaining'])
+            response.headers['X-RateLimit-Reset'] = str(state['reset'])
+            return response
+        return decorated_function
+    return decorator
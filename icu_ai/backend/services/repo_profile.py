@@ -0,0 +1,296 @@
+import os
+import re
+import json
+import tarfile
+from collections import Counter, defaultdict
+from database import db, RepoProfile
+from services.github_client import github_client
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+SKIP_DIRS = {
+    'node_modules', 'vendor', 'vendors', 'third_party', 'third-party', 'bower_components', 'dist', 'build',
+    'out', 'target', '.git', '.next', '.nuxt', '.venv', 'venv', 'env', '__pycache__', '.idea', '.vscode',
+    'coverage', '.pytest_cache', '.mypy_cache', 'site-packages', 'Pods', '.gradle', '.dart_tool'
+}
+
+BINARY_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.svg', '.psd', '.mp3', '.mp4', '.wav', '.mov',
+    '.avi', '.webm', '.ogg', '.pdf', '.zip', '.gz', '.tgz', '.tar', '.rar', '.7z', '.jar', '.war', '.class',
+    '.exe', '.dll', '.so', '.dylib', '.o', '.a', '.pyc', '.whl', '.woff', '.woff2', '.ttf', '.otf', '.eot',
+    '.pkl', '.pt', '.h5', '.onnx', '.npy', '.npz', '.parquet', '.db', '.sqlite', '.bin', '.lock'
+}
+
+LANGUAGES = {
+    '.py': 'Python', '.js': 'JavaScript', '.jsx': 'JavaScript', '.mjs': 'JavaScript', '.ts': 'TypeScript',
+    '.tsx': 'TypeScript', '.java': 'Java', '.kt': 'Kotlin', '.go': 'Go', '.rs': 'Rust', '.rb': 'Ruby',
+    '.php': 'PHP', '.c': 'C', '.h': 'C', '.cpp': 'C++', '.cc': 'C++', '.hpp': 'C++', '.cs': 'C#',
+    '.swift': 'Swift', '.dart': 'Dart', '.scala': 'Scala', '.vue': 'Vue', '.svelte': 'Svelte',
+    '.html': 'HTML', '.css': 'CSS', '.scss': 'CSS', '.sql': 'SQL', '.sh': 'Shell', '.ipynb': 'Jupyter',
+    '.sol': 'Solidity', '.r': 'R', '.lua': 'Lua', '.ex': 'Elixir', '.exs': 'Elixir'
+}
+
+MANIFESTS = {
+    'package.json', 'requirements.txt', 'pyproject.toml', 'Pipfile', 'setup.py', 'go.mod', 'Cargo.toml',
+    'Gemfile', 'pom.xml', 'build.gradle', 'build.gradle.kts', 'composer.json', 'pubspec.yaml', 'environment.yml'
+}
+
+TEST_FILE_PATTERN = re.compile(
+    r'(^test_.*\.py$|_test\.(py|go)$|\.(test|spec)\.(js|jsx|ts|tsx)$|Test\.(java|kt)$|_spec\.rb$)'
+)
+TEST_DIRS = {'test', 'tests', '__tests__', 'spec', 'specs', 'e2e'}
+
+OUTLINE_PATTERNS = {
+    'Python': re.compile(r'^(?:async\s+)?(?:def|class)\s+([A-Za-z_]\w*)', re.M),
+    'JavaScript': re.compile(r'^export\s+(?:default\s+)?(?:async\s+)?(?:function\*?|class|const)\s+([A-Za-z_$][\w$]*)', re.M),
+    'TypeScript': re.compile(r'^export\s+(?:default\s+)?(?:async\s+)?(?:function\*?|class|const|interface|type)\s+([A-Za-z_$][\w$]*)', re.M),
+    'Go': re.compile(r'^func\s+(?:\([^)]*\)\s*)?([A-Z]\w*)', re.M),
+    'Java': re.compile(r'^\s*public\s+(?:abstract\s+|final\s+)?(?:class|interface|enum|record)\s+(\w+)', re.M),
+    'Rust': re.compile(r'^pub\s+(?:fn|struct|enum|trait)\s+(\w+)', re.M)
+}
+
+class _CappedReader:
+    """File-like view of the tarball stream that stops after max_bytes"""
+
+    def __init__(self, raw, max_bytes: int):
+        self.raw = raw
+        self.max_bytes = max_bytes
+        self.read_bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if self.read_bytes >= self.max_bytes:
+            raise _CapReached()
+        if size is None or size < 0:
+            size = self.max_bytes - self.read_bytes
+        data = self.raw.read(min(size, self.max_bytes - self.read_bytes))
+        self.read_bytes += len(data)
+        return data
+
+class _CapReached(Exception):
+    pass
+
+class RepoProfiler:
+    """
+    Compact, code-aware profile of a GitHub repository.
+
+    The tarball of the current commit is streamed through tarfile ('r|gz')
+    and walked once without touching disk; vendored directories and binary
+    files are skipped, and the walk stops at REPO_TARBALL_MAX_MB of
+    compressed input or REPO_MAX_FILES files. Profiles are stored per commit
+    SHA, so re-evaluating an unchanged repo costs one conditional request.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('REPO_PROFILE_ENABLED', 'true').lower() == 'true'
+        self.max_bytes = int(os.getenv('REPO_TARBALL_MAX_MB', 25)) * 1024 * 1024
+        self.max_files = int(os.getenv('REPO_MAX_FILES', 5000))
+        self.max_file_bytes = int(os.getenv('REPO_MAX_FILE_KB', 512)) * 1024
+        self.max_outline_files = 40
+
+    def profile(self, owner: str, repo: str) -> dict:
+        """Profile of the repository's current HEAD, from the cache when possible"""
+        if not self.enabled:
+            return None
+
+        [(status, sha)] = github_client.get_many([(f"/repos/{owner}/{repo}/commits/HEAD", 'application/vnd.github.sha')])
+        if status != 200 or not sha:
+            return None
+        sha = sha.strip()
+
+        key = f"{owner}/{repo}@{sha}"[:255]
+        cached = RepoProfile.query.get(key)
+        if cached:
+            return cached.get_profile()
+
+        profile = self._build(owner, repo, sha)
+        if profile is None:
+            return None
+
+        row = RepoProfile(key=key, owner=owner[:100], repo=repo[:100], sha=sha[:64])
+        row.set_profile(profile)
+        db.session.add(row)
+        try:
+            db.session.commit()
+        except Exception as e:
+            # Another request profiled the same commit concurrently
+            db.session.rollback()
+            print(f"Error caching repo profile: {str(e)}")
+        return profile
+
+    def _build(self, owner: str, repo: str, sha: str) -> dict:
+        response = github_client.stream(f"/repos/{owner}/{repo}/tarball/{sha}")
+        try:
+            if response.status_code != 200:
+                print(f"Tarball fetch failed for {owner}/{repo}: HTTP {response.status_code}")
+                return None
+            response.raw.decode_content = True
+            reader = _CappedReader(response.raw, self.max_bytes)
+            return self._walk(reader, sha)
+        finally:
+            response.close()
+
+    def _walk(self, stream, sha: str) -> dict:
+        loc = Counter()
+        files_by_language = Counter()
+        top_level = defaultdict(lambda: {'files': 0, 'loc': 0})
+        manifests = {}
+        tests = []
+        outline = []
+        flags = set()
+        files = skipped = 0
+        truncated = False
+
+        try:
+            with tarfile.open(fileobj=stream, mode='r|gz') as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    # GitHub tarballs wrap everything in "<owner>-<repo>-<sha>/"
+                    parts = member.name.split('/')[1:]
+                    if not parts or any(part in SKIP_DIRS for part in parts[:-1]):
+                        skipped += 1
+                        continue
+
+                    files += 1
+                    if files > self.max_files:
+                        truncated = True
+                        break
+
+                    path = '/'.join(parts)
+                    name = parts[-1]
+                    extension = os.path.splitext(name)[1].lower()
+                    top = parts[0] if len(parts) > 1 else '.'
+                    top_level[top]['files'] += 1
+                    self._flag(parts, name, flags)
+
+                    if TEST_FILE_PATTERN.search(name) or any(part.lower() in TEST_DIRS for part in parts[:-1]):
+                        tests.append(path)
+
+                    is_manifest = name in MANIFESTS
+                    language = LANGUAGES.get(extension)
+                    if extension in BINARY_EXTENSIONS or member.size > self.max_file_bytes or not (language or is_manifest):
+                        continue
+
+                    data = tar.extractfile(member).read()
+                    if b'\x00' in data[:8192]:
+                        continue
+                    text = data.decode('utf-8', errors='ignore')
+
+                    if is_manifest:
+                        manifests[path] = self._dependencies(name, text)
+                    if language:
+                        lines = sum(1 for line in text.splitlines() if line.strip())
+                        loc[language] += lines
+                        files_by_language[language] += 1
+                        top_level[top]['loc'] += lines
+                        if len(parts) <= 3 and len(outline) < self.max_outline_files and language in OUTLINE_PATTERNS:
+                            names = OUTLINE_PATTERNS[language].findall(text)
+                            if names:
+                                outline.append({'path': path, 'symbols': list(dict.fromkeys(names))[:12]})
+        except (_CapReached, tarfile.ReadError, EOFError):
+            truncated = True
+
+        return {
+            'sha': sha,
+            'files': files,
+            'skipped_files': skipped,
+            'truncated': truncated,
+            'loc': dict(loc.most_common()),
+            'files_by_language': dict(files_by_language.most_common()),
+            'tree': dict(sorted(top_level.items(), key=lambda item: -item[1]['files'])[:20]),
+            'tests': {'present': bool(tests), 'files': len(tests), 'examples': tests[:5]},
+            'manifests': manifests,
+            'outline': outline,
+            'features': sorted(flags)
+        }
+
+    def _flag(self, parts: list, name: str, flags: set):
+        lower = name.lower()
+        if parts[0] == '.github' and len(parts) > 1 and parts[1] == 'workflows':
+            flags.add('ci')
+        if lower in ('dockerfile', 'docker-compose.yml', 'docker-compose.yaml', 'compose.yaml'):
+            flags.add('docker')
+        if lower.startswith('license') and len(parts) == 1:
+            flags.add('license')
+        if lower.startswith('readme') and len(parts) == 1:
+            flags.add('readme')
+
+    def _dependencies(self, name: str, text: str) -> list:
+        """Dependency names declared in a manifest (best effort, capped)"""
+        deps = []
+        try:
+            if name in ('package.json', 'composer.json'):
+                data = json.loads(text)
+                for field in ('dependencies', 'devDependencies', 'require', 'require-dev'):
+                    deps += list((data.get(field) or {}).keys())
+            elif name == 'requirements.txt':
+                for line in text.splitlines():
+                    line = line.split('#')[0].strip()
+                    if line and not line.startswith('-'):
+                        deps.append(re.split(r'[<>=!~\[;\s]', line, 1)[0])
+            elif name in ('pyproject.toml', 'Cargo.toml') and tomllib:
+                data = tomllib.loads(text)
+                if name == 'Cargo.toml':
+                    deps += list((data.get('dependencies') or {}).keys())
+                else:
+                    project_deps = (data.get('project') or {}).get('dependencies') or []
+                    deps += [re.split(r'[<>=!~\[;\s]', d, 1)[0] for d in project_deps]
+                    deps += list(((data.get('tool') or {}).get('poetry') or {}).get('dependencies', {}).keys())
+            elif name == 'go.mod':
+                deps += re.findall(r'^\s*(?:require\s+)?([\w.\-]+\.[\w.\-/]+)\s+v[\w.\-+]+', text, re.M)
+            elif name == 'Gemfile':
+                deps += re.findall(r'''^\s*gem\s+['"]([^'"]+)['"]''', text, re.M)
+            elif name == 'pom.xml':
+                deps += re.findall(r'<artifactId>([^<]+)</artifactId>', text)[1:]
+            elif name.startswith('build.gradle'):
+                deps += re.findall(r'''(?:implementation|api|compile)\s*\(?\s*['"]([^'":]+:[^'":]+)''', text)
+        except (ValueError, AttributeError, TypeError) as e:
+            print(f"Could not read manifest {name}: {str(e)}")
+        return [d for d in dict.fromkeys(deps) if d][:40]
+
+def render_profile(profile: dict, max_chars: int = 3000) -> str:
+    """Compact plain-text rendering of a repo profile for the evaluation prompt"""
+    if not isinstance(profile, dict) or not profile:
+        return ''
+
+    lines = []
+    loc = profile.get('loc') or {}
+    total = sum(v for v in loc.values() if isinstance(v, (int, float)))
+    lines.append(f"Files: {profile.get('files', 0)} ({profile.get('skipped_files', 0)} vendored skipped), non-blank LOC: {total}"
+                 + (" [partial scan]" if profile.get('truncated') else ''))
+    if loc:
+        # The profile may have round-tripped through JSON with sorted keys; order by size again
+        ranked = sorted(loc.items(), key=lambda item: -item[1])
+        lines.append("LOC by language: " + ', '.join(f"{lang} {count}" for lang, count in ranked[:8]))
+
+    tree = profile.get('tree') or {}
+    if tree:
+        ranked = sorted(tree.items(), key=lambda item: -(item[1] or {}).get('files', 0))
+        lines.append("Top-level layout: " + ', '.join(
+            f"{name}/ ({info.get('files', 0)} files, {info.get('loc', 0)} LOC)" if name != '.' else f"root ({info.get('files', 0)} files)"
+            for name, info in ranked[:10]
+        ))
+
+    tests = profile.get('tests') or {}
+    lines.append(f"Tests: {tests.get('files', 0)} test files" if tests.get('present') else "Tests: none found")
+
+    features = profile.get('features') or []
+    if features:
+        lines.append("Project hygiene: " + ', '.join(str(f) for f in features))
+
+    for path, deps in list((profile.get('manifests') or {}).items())[:5]:
+        lines.append(f"Dependencies ({path}): " + (', '.join(str(d) for d in deps[:15]) or 'none'))
+
+    outline = profile.get('outline') or []
+    if outline:
+        lines.append("Module outline:")
+        for entry in outline[:15]:
+            lines.append(f"  {entry.get('path')}: {', '.join(str(s) for s in (entry.get('symbols') or [])[:8])}")
+
+    text = '\n'.join(lines)
+    return text[:max_chars]
+
+repo_profiler = RepoProfiler()
@@ -0,0 +1,164 @@
+import json
+import time
+import uuid
+import hashlib
+import numpy as np
+from datetime import datetime
+from database import db, Evaluation, RescoreJob, json_dumps, json_loads
+from services.scoring_profiles import get_profile, CATEGORY_CRITERIA, CRITERION_DEFAULT, READINESS_LEVELS
+
+CATEGORIES = list(CATEGORY_CRITERIA)
+CRITERIA = [criterion for category in CATEGORIES for criterion in CATEGORY_CRITERIA[category]] + ['wow_factor']
+
+class BulkRescorer:
+    """
+    Recomputes overall_score / readiness_level of stored evaluations for a
+    weighting profile.
+
+    Rows are streamed in primary-key order (keyset pagination), one chunk at a
+    time; each chunk's `detailed` scores are stacked into a matrix and the
+    aggregates are recomputed with NumPy. Changed rows are written back with a
+    single bulk UPDATE per chunk, committed together with the job checkpoint,
+    so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, profile_name: str = None, chunk_size: int = 5000):
+        self.profile_name, self.profile = get_profile(profile_name)
+        self.chunk_size = chunk_size
+
+        # Column positions of each category's criteria in the score matrix
+        self.category_columns = {}
+        for category in CATEGORIES:
+            self.category_columns[category] = [CRITERIA.index(c) for c in CATEGORY_CRITERIA[category]]
+        self.weights = np.array([self.profile['weights'][category] for category in CATEGORIES])
+
+        # Identifies the weights a job was started with, so a resume never mixes two versions
+        self.profile_hash = hashlib.sha256(
+            json.dumps({'profile': self.profile, 'readiness': READINESS_LEVELS}, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    def run(self, restart: bool = False, progress=print) -> dict:
+        """Rescore every evaluation, resuming an unfinished job for the same profile"""
+        job = None
+        if not restart:
+            job = RescoreJob.query.filter_by(profile=self.profile_name, status='running') \
+                .order_by(RescoreJob.started_at.desc()).first()
+        if job and job.profile_hash != self.profile_hash:
+            # SCORING_PROFILES_FILE changed since the job started: rows it already wrote used the old weights
+            progress(f"Profile '{self.profile_name}' changed since job {job.id} started; starting over")
+            job.status = 'superseded'
+            db.session.commit()
+            job = None
+        if job:
+            progress(f"Resuming rescore job {job.id} after {job.processed_count} rows")
+        else:
+            job = RescoreJob(id=str(uuid.uuid4()), profile=self.profile_name, profile_hash=self.profile_hash,
+                             status='running', processed_count=0, updated_count=0)
+            db.session.add(job)
+            db.session.commit()
+
+        started = time.perf_counter()
+        processed = updated = 0
+
+        while True:
+            query = db.session.query(Evaluation.id, Evaluation.scores).order_by(Evaluation.id)
+            if job.last_evaluation_id:
+                query = query.filter(Evaluation.id > job.last_evaluation_id)
+            rows = query.limit(self.chunk_size).all()
+            if not rows:
+                break
+
+            changes = self._rescore_chunk(rows)
+            if changes:
+                db.session.execute(db.update(Evaluation), changes)
+
+            job.last_evaluation_id = rows[-1][0]
+            job.processed_count += len(rows)
+            job.updated_count += len(changes)
+            db.session.commit()
+
+            processed += len(rows)
+            updated += len(changes)
+            elapsed = time.perf_counter() - started
+            progress(f"  {job.processed_count} rows processed, {job.updated_count} updated "
+                     f"({processed / elapsed:,.0f} rows/s)")
+
+            # Release the identity map between chunks
+            db.session.expunge_all()
+            job = RescoreJob.query.get(job.id)
+
+        job.status = 'completed'
+        job.completed_at = datetime.utcnow()
+        db.session.commit()
+
+        elapsed = time.perf_counter() - started
+        return {
+            'job_id': job.id,
+            'profile': self.profile_name,
+            'processed': job.processed_count,
+            'updated': job.updated_count,
+            'seconds': round(elapsed, 2),
+            'rows_per_second': round(processed / elapsed, 1) if elapsed > 0 else None
+        }
+
+    def _rescore_chunk(self, rows: list) -> list:
+        """Return bulk-update parameter dicts for the rows whose aggregates changed"""
+        stored = []
+        matrix = np.full((len(rows), len(CRITERIA)), CRITERION_DEFAULT, dtype=np.float64)
+
+        for i, (evaluation_id, scores_json) in enumerate(rows):
+            try:
+                scores = json_loads(scores_json) if scores_json else None
+            except ValueError:
+                scores = None
+            if not isinstance(scores, dict):
+                scores = {}
+            stored.append(scores)
+
+            detailed = scores.get('detailed')
+            if not isinstance(detailed, dict):
+                detailed = {}
+            for j, criterion in enumerate(CRITERIA):
+                value = detailed.get(criterion)
+                if isinstance(value, (int, float)):
+                    matrix[i, j] = value
+
+        # Category means, weighted overall and wow bonus for the whole chunk at once
+        categories = np.column_stack([
+            matrix[:, self.category_columns[category]].mean(axis=1) for category in CATEGORIES
+        ])
+        overall = categories @ self.weights * 10
+        wow_bonus = np.minimum(matrix[:, CRITERIA.index('wow_factor')] * self.profile['wow_multiplier'],
+                               self.profile['wow_cap'])
+        overall = np.round(np.minimum(overall + wow_bonus, 100))
+        categories = np.round(categories, 1)
+
+        readiness = np.select(
+            [overall >= threshold for threshold, _ in READINESS_LEVELS],
+            [level for _, level in READINESS_LEVELS],
+            default=READINESS_LEVELS[-1][1]
+        )
+
+        changes = []
+        now = datetime.utcnow()
+        for i, (evaluation_id, _) in enumerate(rows):
+            scores = stored[i]
+            if 'detailed' not in scores:
+                continue  # nothing to recompute from
+
+            new_scores = dict(scores)
+            for k, category in enumerate(CATEGORIES):
+                new_scores[category] = float(categories[i, k])
+            new_scores['overall'] = float(overall[i])
+            new_scores['profile'] = self.profile_name
+
+            if new_scores != scores:
+                changes.append({
+                    'id': evaluation_id,
+                    'overall_score': int(overall[i]),
+                    'readiness_level': str(readiness[i]),
+                    'scores': json_dumps(new_scores),
+                    'updated_at': now
+                })
+
+        return changes
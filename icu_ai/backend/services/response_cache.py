@@ -0,0 +1,72 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+class ResponseCache:
+    """
+    Small in-process LRU of serialized JSON payloads with their ETags.
+
+    Meant for records that don't change once written (evaluations, idea
+    sets): the body is serialized and hashed once, and repeat requests are
+    answered from memory without a query or json.dumps.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_ENTRIES', 2048))
+        self.max_bytes = max_bytes or int(os.getenv('RESPONSE_CACHE_MB', 64)) * 1024 * 1024
+        self.entries = OrderedDict()  # key -> (body, etag)
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def serialize(payload: dict) -> tuple:
+        """Canonical JSON body and its strong ETag"""
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, payload: dict) -> tuple:
+        entry = self.serialize(payload)
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous:
+                self.size -= len(previous[0])
+            self.entries[key] = entry
+            self.size += len(entry[0])
+
+            while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+                _, (body, _) = self.entries.popitem(last=False)
+                self.size -= len(body)
+        return entry
+
+    def invalidate(self, key: str = None) -> None:
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+                self.size = 0
+            else:
+                entry = self.entries.pop(key, None)
+                if entry:
+                    self.size -= len(entry[0])
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,168 @@
+import os
+import math
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+PRIORITIES = [INTERACTIVE, BULK]
+
+class SchedulerOverloaded(Exception):
+    """Raised when a request is shed instead of queued; maps to 503 + Retry-After"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class _Ticket:
+    __slots__ = ('user_id', 'priority', 'finish_tag', 'start_tag', 'enqueued_at', 'granted')
+
+    def __init__(self, user_id, priority, start_tag, finish_tag):
+        self.user_id = user_id
+        self.priority = priority
+        self.start_tag = start_tag
+        self.finish_tag = finish_tag
+        self.enqueued_at = time.perf_counter()
+        self.granted = False
+
+class AIScheduler:
+    """
+    In-process admission control in front of AIClient.
+
+    - Two priority classes: interactive requests are always dispatched before
+      bulk work, and bulk work may only use AI_BULK_MAX_IN_FLIGHT slots.
+    - Within a class, users share capacity through start-time fair queuing:
+      each request gets a virtual finish tag of max(virtual time, the user's
+      last finish tag) + cost / weight, and the smallest tag runs next.
+    - At most AI_MAX_IN_FLIGHT provider calls run at once; when a class's
+      queue is full the request is shed with SchedulerOverloaded.
+    """
+
+    def __init__(self):
+        self.max_in_flight = int(os.getenv('AI_MAX_IN_FLIGHT', 8))
+        self.bulk_max_in_flight = int(os.getenv('AI_BULK_MAX_IN_FLIGHT', max(1, self.max_in_flight // 2)))
+        self.max_queue = {
+            INTERACTIVE: int(os.getenv('AI_MAX_QUEUE_INTERACTIVE', 32)),
+            BULK: int(os.getenv('AI_MAX_QUEUE_BULK', 256))
+        }
+        self.queue_timeout = float(os.getenv('AI_QUEUE_TIMEOUT_SECONDS', 60))
+
+        self.cond = threading.Condition()
+        self.sequence = itertools.count()
+        self.queues = {p: [] for p in PRIORITIES}  # heap of (finish_tag, seq, ticket)
+        self.in_flight = {p: 0 for p in PRIORITIES}
+        self.virtual_time = {p: 0.0 for p in PRIORITIES}
+        self.user_finish = {p: {} for p in PRIORITIES}
+
+        # Metrics
+        self.service_time = 10.0  # EWMA of seconds per call, used for Retry-After
+        self.wait_times = {p: deque(maxlen=1000) for p in PRIORITIES}
+        self.counters = {p: {'admitted': 0, 'shed': 0, 'timed_out': 0} for p in PRIORITIES}
+
+    @contextmanager
+    def slot(self, user_id: str = None, priority: str = INTERACTIVE, cost: float = 1.0, weight: float = 1.0):
+        """Block until this request may call a provider; release the slot afterwards"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        user_id = user_id or 'anonymous'
+
+        with self.cond:
+            if len(self.queues[priority]) >= self.max_queue[priority]:
+                self.counters[priority]['shed'] += 1
+                raise SchedulerOverloaded('AI capacity exhausted, please retry later', self._retry_after(priority))
+
+            start_tag = max(self.virtual_time[priority], self.user_finish[priority].get(user_id, 0.0))
+            ticket = _Ticket(user_id, priority, start_tag, start_tag + cost / weight)
+            self.user_finish[priority][user_id] = ticket.finish_tag
+            heapq.heappush(self.queues[priority], (ticket.finish_tag, next(self.sequence), ticket))
+            self._dispatch()
+
+            deadline = time.perf_counter() + self.queue_timeout
+            while not ticket.granted:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._remove(ticket)
+                    self.counters[priority]['timed_out'] += 1
+                    raise SchedulerOverloaded('Timed out waiting for AI capacity', self._retry_after(priority))
+                self.cond.wait(remaining)
+
+            self.wait_times[priority].append(time.perf_counter() - ticket.enqueued_at)
+            self.counters[priority]['admitted'] += 1
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.in_flight[priority] -= 1
+                self.service_time = 0.9 * self.service_time + 0.1 * (time.perf_counter() - started)
+                self._dispatch()
+
+    def _dispatch(self):
+        """Grant free slots to queued tickets (caller holds the lock)"""
+        granted = False
+        while sum(self.in_flight.values()) < self.max_in_flight:
+            if self.queues[INTERACTIVE]:
+                priority = INTERACTIVE
+            elif self.queues[BULK] and self.in_flight[BULK] < self.bulk_max_in_flight:
+                priority = BULK
+            else:
+                break
+
+            _, _, ticket = heapq.heappop(self.queues[priority])
+            ticket.granted = True
+            self.in_flight[priority] += 1
+            self.virtual_time[priority] = max(self.virtual_time[priority], ticket.start_tag)
+            granted = True
+
+        if granted:
+            self._prune(INTERACTIVE)
+            self._prune(BULK)
+            self.cond.notify_all()
+
+    def _prune(self, priority: str):
+        """Forget users whose last finish tag is already behind virtual time"""
+        finish = self.user_finish[priority]
+        if len(finish) > 1000:
+            now = self.virtual_time[priority]
+            for user_id in [u for u, tag in finish.items() if tag <= now]:
+                del finish[user_id]
+
+    def _remove(self, ticket: _Ticket):
+        queue = self.queues[ticket.priority]
+        queue[:] = [entry for entry in queue if entry[2] is not ticket]
+        heapq.heapify(queue)
+
+    def _retry_after(self, priority: str) -> int:
+        """Rough seconds until the queue ahead of a new request drains"""
+        ahead = len(self.queues[INTERACTIVE]) + (len(self.queues[BULK]) if priority == BULK else 0)
+        slots = self.max_in_flight if priority == INTERACTIVE else self.bulk_max_in_flight
+        return max(1, int(math.ceil((ahead + 1) * self.service_time / max(slots, 1))))
+
+    def stats(self) -> dict:
+        """Queue depth, in-flight calls and queue wait percentiles per class"""
+        with self.cond:
+            result = {
+                'max_in_flight': self.max_in_flight,
+                'avg_service_seconds': round(self.service_time, 2)
+            }
+            for priority in PRIORITIES:
+                waits = sorted(self.wait_times[priority])
+                result[priority] = {
+                    'queue_depth': len(self.queues[priority]),
+                    'in_flight': self.in_flight[priority],
+                    **self.counters[priority],
+                    'wait_seconds': {
+                        'p50': round(waits[len(waits) // 2], 3) if waits else 0,
+                        'p95': round(waits[int(len(waits) * 0.95)], 3) if waits else 0,
+                        'max': round(waits[-1], 3) if waits else 0
+                    }
+                }
+            return result
+
+# One scheduler per process, shared by every AIClient
+ai_scheduler = AIScheduler()
@@ -0,0 +1,229 @@
+import os
+import time
+import threading
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from database import db, Evaluation, Project, ScoreSketch, json_loads
+from services.quantile_sketch import KLLSketch
+
+METRICS = ['overall', 'technical', 'innovation', 'impact', 'execution']
+ALL_DOMAINS = '*'
+DISTRIBUTION_FRACTIONS = [0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+def normalize_domain(domain) -> str:
+    """classification.primary_domain as stored on evaluations and used in sketch keys (None if empty)"""
+    domain = str(domain or '').strip()[:100]
+    return domain or None
+
+def analysis_domain(analysis) -> str:
+    """Normalised classification.primary_domain of a model analysis; the model may send null or junk"""
+    classification = analysis.get('classification') if isinstance(analysis, dict) else None
+    return normalize_domain(classification.get('primary_domain') if isinstance(classification, dict) else None)
+
+class ScoreStatsService:
+    """
+    Score distributions kept as mergeable KLL sketches, one per metric,
+    globally and per classification.primary_domain.
+
+    Sketches are updated when an evaluation is stored and persisted in the
+    score_sketches table; reads come from a short-lived in-process cache, so
+    percentile and distribution queries never touch the evaluations table.
+    Rows carry a generation: rebuild() writes a complete new generation and
+    drops the old ones in one commit, and readers and writers always use the
+    newest, so a rebuild never leaves the table empty or half-written.
+    """
+
+    def __init__(self):
+        self.cache_seconds = int(os.getenv('SCORE_STATS_CACHE_SECONDS', 30))
+        self.sketch_k = int(os.getenv('SCORE_SKETCH_K', 200))
+        self.record_attempts = 3
+        self.cache = {}  # key -> (sketch, loaded_at)
+        self.lock = threading.Lock()
+
+    def _key(self, metric: str, domain: str) -> str:
+        return f"{metric}|{domain}"
+
+    def _row_key(self, generation: int, metric: str, domain: str) -> str:
+        return f"{generation}:{metric}|{domain}"
+
+    def _generation(self) -> int:
+        return db.session.query(db.func.max(ScoreSketch.generation)).scalar() or 0
+
+    def record(self, scores: dict, domain: str = None) -> None:
+        """Add one evaluation's scores to the global and domain sketches"""
+        domain = normalize_domain(domain)
+        domains = [ALL_DOMAINS] + ([domain] if domain else [])
+
+        values = {}
+        for metric in METRICS:
+            if isinstance(scores.get(metric), (int, float)):
+                for d in domains:
+                    values[self._key(metric, d)] = (metric, d, scores[metric])
+
+        for attempt in range(self.record_attempts):
+            try:
+                self._record_values(values)
+                return
+            except IntegrityError:
+                # Another worker created one of the same sketch rows first; it exists now, so retry
+                db.session.rollback()
+            except Exception as e:
+                # Stats are best-effort; never fail the evaluation because of them
+                db.session.rollback()
+                print(f"Error recording score stats: {str(e)}")
+                return
+        print(f"Error recording score stats: sketch rows still conflicting after {self.record_attempts} attempts")
+
+    def _record_values(self, values: dict) -> None:
+        generation = self._generation()
+        row_keys = {self._row_key(generation, metric, d): key for key, (metric, d, _) in values.items()}
+
+        # Lock the rows so concurrent workers don't lose each other's updates
+        rows = {row.key: row for row in ScoreSketch.query.filter(
+            ScoreSketch.key.in_(list(row_keys))
+        ).with_for_update().all()}
+
+        sketches = {}
+        for row_key, key in row_keys.items():
+            metric, d, value = values[key]
+            row = rows.get(row_key)
+            if row is None:
+                row = ScoreSketch(key=row_key, generation=generation, metric=metric, domain=d)
+                db.session.add(row)
+                sketch = KLLSketch(k=self.sketch_k)
+            else:
+                sketch = KLLSketch.from_dict(row.get_data())
+            sketch.update(value)
+            row.count = sketch.count
+            row.set_data(sketch.to_dict())
+            sketches[key] = sketch
+
+        db.session.commit()
+        with self.lock:
+            for key, sketch in sketches.items():
+                self.cache[key] = (sketch, time.time())
+
+    def _get_sketch(self, metric: str, domain: str) -> KLLSketch:
+        key = self._key(metric, domain)
+        with self.lock:
+            cached = self.cache.get(key)
+        if cached and time.time() - cached[1] < self.cache_seconds:
+            return cached[0]
+
+        row = ScoreSketch.query.get(self._row_key(self._generation(), metric, domain))
+        sketch = KLLSketch.from_dict(row.get_data()) if row else KLLSketch(k=self.sketch_k)
+        with self.lock:
+            self.cache[key] = (sketch, time.time())
+        return sketch
+
+    def percentile(self, score: float, metric: str = 'overall', domain: str = None) -> dict:
+        """Share of evaluations scoring strictly below `score`"""
+        domain = normalize_domain(domain) or ALL_DOMAINS
+        sketch = self._get_sketch(metric, domain)
+        return {
+            'metric': metric,
+            'domain': domain,
+            'score': score,
+            'percentile': round(sketch.rank(score) * 100, 1),
+            'count': sketch.count
+        }
+
+    def distribution(self, metric: str = 'overall', domain: str = None) -> dict:
+        """Approximate quantiles of a score distribution"""
+        domain = normalize_domain(domain) or ALL_DOMAINS
+        sketch = self._get_sketch(metric, domain)
+        quantiles = sketch.quantiles(DISTRIBUTION_FRACTIONS)
+        return {
+            'metric': metric,
+            'domain': domain,
+            'count': sketch.count,
+            'min': sketch.min,
+            'max': sketch.max,
+            'quantiles': {f"p{int(q * 100)}": v for q, v in zip(DISTRIBUTION_FRACTIONS, quantiles)}
+        }
+
+    def leaderboard(self, limit: int = 10, domain: str = None) -> list:
+        """Top evaluations by overall score, walking the (primary_domain,) overall_score index from the top"""
+        domain = normalize_domain(domain)
+
+        # Only rows above the sketch's estimate of the cut-off can make the board;
+        # fall back to a plain index walk if the estimate was too tight.
+        threshold = None
+        sketch = self._get_sketch('overall', domain or ALL_DOMAINS)
+        if sketch.count > limit * 4:
+            threshold = sketch.quantiles([1 - (limit * 2) / sketch.count])[0]
+
+        board = self._walk_leaderboard(limit, domain, threshold)
+        if threshold is not None and len(board) < limit:
+            board = self._walk_leaderboard(limit, domain, None)
+        return board
+
+    def _walk_leaderboard(self, limit: int, domain: str, threshold) -> list:
+        query = db.session.query(Evaluation.id, Evaluation.project_id, Evaluation.overall_score,
+                                 Evaluation.readiness_level, Project.name) \
+            .join(Project, Project.id == Evaluation.project_id)
+        if domain:
+            query = query.filter(Evaluation.primary_domain == domain)
+        if threshold is not None:
+            query = query.filter(Evaluation.overall_score >= threshold)
+        query = query.order_by(Evaluation.overall_score.desc(), Evaluation.created_at.asc()).limit(limit)
+
+        return [{
+            'rank': rank,
+            'evaluation_id': eval_id,
+            'project_id': project_id,
+            'name': name,
+            'overall_score': overall,
+            'readiness_level': readiness
+        } for rank, (eval_id, project_id, overall, readiness, name) in enumerate(query.all(), start=1)]
+
+    def rebuild(self, chunk_size: int = 5000, progress=print) -> int:
+        """Recompute every sketch from the evaluations table (after bulk re-scoring)"""
+        sketches = {}
+        last_id = None
+        total = 0
+
+        while True:
+            query = db.session.query(Evaluation.id, Evaluation.scores, Evaluation.primary_domain).order_by(Evaluation.id)
+            if last_id:
+                query = query.filter(Evaluation.id > last_id)
+            rows = query.limit(chunk_size).all()
+            if not rows:
+                break
+
+            for _, scores_json, domain in rows:
+                try:
+                    scores = json_loads(scores_json) if scores_json else None
+                except ValueError:
+                    continue
+                if not isinstance(scores, dict):
+                    continue
+                for metric in METRICS:
+                    if not isinstance(scores.get(metric), (int, float)):
+                        continue
+                    for d in [ALL_DOMAINS] + ([domain] if domain else []):
+                        key = self._key(metric, d)
+                        if key not in sketches:
+                            sketches[key] = (metric, d, KLLSketch(k=self.sketch_k))
+                        sketches[key][2].update(scores[metric])
+
+            last_id = rows[-1][0]
+            total += len(rows)
+            progress(f"  {total} evaluations added to score sketches")
+
+        # Write the new generation next to the live one, then retire the old rows in the same commit;
+        # record() keeps updating the live generation until then. An evaluation stored while the scan
+        # runs may be missed or counted twice, which the next rebuild corrects.
+        generation = self._generation() + 1
+        for key, (metric, d, sketch) in sketches.items():
+            row = ScoreSketch(key=self._row_key(generation, metric, d), generation=generation, metric=metric,
+                              domain=d, count=sketch.count, updated_at=datetime.utcnow())
+            row.set_data(sketch.to_dict())
+            db.session.add(row)
+        db.session.flush()
+        ScoreSketch.query.filter(ScoreSketch.generation < generation).delete(synchronize_session=False)
+        db.session.commit()
+
+        with self.lock:
+            self.cache.clear()
+        return total
@@ -0,0 +1,65 @@
+import os
+import json
+
+# Criteria reported by the model, grouped into the four scoring categories
+CATEGORY_CRITERIA = {
+    'technical': ['code_quality', 'technical_complexity', 'tech_stack_modernity', 'implementation_quality'],
+    'innovation': ['originality', 'creative_problem_solving', 'feature_innovation'],
+    'impact': ['real_world_applicability', 'market_potential', 'social_impact', 'scalability'],
+    'execution': ['completeness', 'user_experience', 'presentation_quality', 'documentation']
+}
+CRITERION_DEFAULT = 5
+
+# (minimum overall score, readiness level), checked top to bottom
+READINESS_LEVELS = [
+    (90, 'exceptional'),
+    (76, 'winner_potential'),
+    (61, 'competition_ready'),
+    (41, 'demo_ready'),
+    (0, 'early_prototype')
+]
+
+# Named weighting profiles. Category weights should sum to 1; the wow factor
+# adds wow_factor * wow_multiplier on top, capped at wow_cap.
+SCORING_PROFILES = {
+    'default': {
+        'weights': {'technical': 0.25, 'innovation': 0.25, 'impact': 0.25, 'execution': 0.25},
+        'wow_multiplier': 0.5,
+        'wow_cap': 5
+    },
+    'innovation_focus': {
+        'weights': {'technical': 0.2, 'innovation': 0.35, 'impact': 0.25, 'execution': 0.2},
+        'wow_multiplier': 0.5,
+        'wow_cap': 5
+    },
+    'technical_focus': {
+        'weights': {'technical': 0.4, 'innovation': 0.2, 'impact': 0.2, 'execution': 0.2},
+        'wow_multiplier': 0.3,
+        'wow_cap': 3
+    }
+}
+
+def load_profiles() -> dict:
+    """Built-in profiles plus any defined in the JSON file at SCORING_PROFILES_FILE"""
+    profiles = dict(SCORING_PROFILES)
+
+    path = os.getenv('SCORING_PROFILES_FILE')
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            profiles.update(json.load(f))
+
+    return profiles
+
+def get_profile(name: str = None) -> tuple:
+    """Return (name, profile) for the given or configured (SCORING_PROFILE) profile"""
+    name = name or os.getenv('SCORING_PROFILE', 'default')
+    profiles = load_profiles()
+    if name not in profiles:
+        raise ValueError(f"Unknown scoring profile: {name}. Available: {', '.join(sorted(profiles))}")
+
+    profile = profiles[name]
+    missing = [category for category in CATEGORY_CRITERIA if category not in profile.get('weights', {})]
+    if missing:
+        raise ValueError(f"Scoring profile '{name}' is missing weights for: {', '.join(missing)}")
+
+    return name, profile
@@ -0,0 +1,157 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from services.scheduler import BULK
+from services.idea_generation_service import as_list
+
+# Questionnaire fields that shape the generated ideas the most (and that the
+# prompt requires); once these are known a speculative generation is worth starting.
+SPECULATION_FIELDS = ['skill_level', 'primary_skill', 'languages', 'time_available', 'primary_goal']
+
+# Every questionnaire field the generation prompt is built from (see _build_user_profile)
+PROMPT_FIELDS = [
+    'skill_level', 'primary_skill', 'languages', 'frameworks', 'team_size', 'time_available',
+    'theme', 'required_tech', 'primary_goal', 'domain_interests', 'personal_frustrations',
+    'emerging_tech', 'project_type', 'platform', 'ui_importance', 'ai_preference',
+    'target_audience', 'desired_change'
+]
+LIST_FIELDS = {'languages', 'frameworks', 'domain_interests', 'emerging_tech', 'platform', 'target_audience', 'desired_change'}
+
+class SpeculativeIdeaService:
+    """
+    Starts idea generation while the user is still filling in the questionnaire.
+
+    One speculation is kept per owner (user id or client IP). It is started as
+    soon as the high-signal fields are present. Its answers are the prompt
+    fields answered so far, with list fields counted item by item; answering
+    more keeps it (it is refreshed, once finished, after
+    SPECULATIVE_REFINE_MIN_ANSWERS new answers), and only changing or removing
+    an answer replaces it. The final /api/generate-ideas submit reuses it when
+    its answers are a subset of the complete questionnaire's; match scores are
+    then computed against the full profile.
+    """
+
+    def __init__(self, idea_service):
+        self.idea_service = idea_service
+        self.executor = ThreadPoolExecutor(max_workers=int(os.getenv('SPECULATIVE_MAX_WORKERS', 4)))
+        self.max_per_hour = int(os.getenv('SPECULATIVE_MAX_PER_HOUR', 5))
+        self.ttl_seconds = int(os.getenv('SPECULATIVE_TTL_SECONDS', 600))
+        self.wait_seconds = float(os.getenv('SPECULATIVE_WAIT_SECONDS', 120))
+        self.refine_min_answers = int(os.getenv('SPECULATIVE_REFINE_MIN_ANSWERS', 4))
+
+        self.lock = threading.Lock()
+        self.speculations = {}  # owner -> {'answers', 'future', 'started_at', 'cancelled'}
+        self.spend = {}  # owner -> deque of start timestamps (last hour)
+
+    def speculate(self, owner: str, partial: dict) -> dict:
+        """Start (or keep) a speculative generation for a partial questionnaire"""
+        missing = [field for field in SPECULATION_FIELDS if not partial.get(field)]
+        if missing:
+            return {'status': 'waiting_for_fields', 'missing': missing}
+
+        answers = self._answers(partial)
+        now = time.time()
+
+        with self.lock:
+            self._expire(now)
+
+            current = self.speculations.get(owner)
+            if current and not current['cancelled'] and current['answers'] <= answers:
+                # Same or more answers: the running speculation still fits the final questionnaire
+                new_answers = len(answers - current['answers'])
+                if not current['future'].done():
+                    return {'status': 'running'}
+                if new_answers < self.refine_min_answers:
+                    return {'status': 'ready'}
+
+            starts = self.spend.setdefault(owner, deque())
+            while starts and now - starts[0] > 3600:
+                starts.popleft()
+            if len(starts) >= self.max_per_hour:
+                if current and not current['cancelled'] and current['answers'] <= answers:
+                    # Out of budget for a refresh; the finished speculation is still usable
+                    return {'status': 'ready'}
+                return {'status': 'cap_reached', 'retry_after': int(3600 - (now - starts[0])) + 1}
+            starts.append(now)
+
+            if current:
+                self._cancel(current)
+                del self.speculations[owner]
+
+            speculation = {'answers': answers, 'started_at': now, 'cancelled': False}
+            speculation['future'] = self.executor.submit(self._generate, owner, dict(partial), speculation)
+            self.speculations[owner] = speculation
+
+        print(f"Started speculative idea generation for {owner}")
+        return {'status': 'started'}
+
+    def cancel(self, owner: str) -> bool:
+        """Drop the owner's speculation (an in-flight model call is left to finish and discarded)"""
+        with self.lock:
+            speculation = self.speculations.pop(owner, None)
+            if speculation:
+                self._cancel(speculation)
+        return speculation is not None
+
+    def take(self, owner: str, questionnaire: dict):
+        """Return speculative ideas compatible with the final questionnaire, or None"""
+        with self.lock:
+            self._expire(time.time())
+            speculation = self.speculations.pop(owner, None)
+
+        if not speculation or speculation['cancelled']:
+            return None
+        if not speculation['answers'] <= self._answers(questionnaire):
+            self._cancel(speculation)
+            return None
+
+        try:
+            ideas = speculation['future'].result(timeout=self.wait_seconds)
+        except FutureTimeoutError:
+            self._cancel(speculation)
+            return None
+        except Exception as e:
+            print(f"Speculative generation failed, generating from scratch: {str(e)}")
+            return None
+
+        if not ideas:
+            return None
+
+        # Generated from a subset of the final answers: match scores use the complete profile
+        print(f"Reusing speculative ideas for {owner}")
+        profile = self.idea_service._build_user_profile(questionnaire)
+        return self.idea_service._save_ideas(questionnaire, profile, [dict(idea) for idea in ideas])
+
+    def _generate(self, owner: str, partial: dict, speculation: dict) -> list:
+        if speculation['cancelled']:
+            return None
+
+        profile = self.idea_service._build_user_profile(partial)
+        prompt = self.idea_service._build_generation_prompt(profile)
+        response_text = self.idea_service.ai_client.generate_content(prompt, user_id=owner, priority=BULK)
+
+        if speculation['cancelled']:
+            return None
+        return self.idea_service._parse_ideas(response_text)
+
+    def _cancel(self, speculation: dict) -> None:
+        speculation['cancelled'] = True
+        speculation['future'].cancel()
+
+    def _expire(self, now: float) -> None:
+        """Drop speculations nobody collected (caller holds the lock)"""
+        for owner in [o for o, s in self.speculations.items() if now - s['started_at'] > self.ttl_seconds]:
+            self._cancel(self.speculations.pop(owner))
+
+    def _answers(self, questionnaire: dict) -> frozenset:
+        """The answered prompt fields, normalised: (field, value) pairs, one per item for list fields"""
+        answers = set()
+        for field in PROMPT_FIELDS:
+            value = questionnaire.get(field)
+            for item in (as_list(value) if field in LIST_FIELDS else [value]):
+                item = str(item).strip().lower() if item is not None else ''
+                if item:
+                    answers.add((field, item))
+        return frozenset(answers)
@@ -0,0 +1,158 @@
+import os
+import re
+import numpy as np
+from services.idea_index import tokenize
+
+# Prompt budget for one parsed document, in tokens (~4 characters each)
+SUMMARY_MAX_TOKENS = int(os.getenv('SUMMARY_MAX_TOKENS', 3750))
+CHARS_PER_TOKEN = 4
+
+# Segments longer than this are split at sentence boundaries, shorter ones merged
+SEGMENT_MAX_CHARS = 1200
+SEGMENT_MIN_CHARS = 200
+# Above this many segments the similarity matrix gets expensive; merge neighbours first
+MAX_SEGMENTS = 600
+
+GAP_MARKER = '[...]'
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def segment(text: str) -> list:
+    """Paragraph-sized segments of a document, in order"""
+    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+
+    pieces = []
+    for paragraph in paragraphs:
+        if len(paragraph) <= SEGMENT_MAX_CHARS:
+            pieces.append(paragraph)
+            continue
+        # Long paragraph (or a PDF page without blank lines): cut at sentence ends
+        current = ''
+        for sentence in re.split(r'(?<=[.!?])\s+|\n', paragraph):
+            if current and len(current) + len(sentence) + 1 > SEGMENT_MAX_CHARS:
+                pieces.append(current)
+                current = ''
+            current = f"{current} {sentence}".strip() if current else sentence
+        if current:
+            pieces.append(current)
+
+    # Merge short pieces (headings, list items) into the segment that follows
+    segments = []
+    pending = ''
+    for piece in pieces:
+        pending = f"{pending}\n{piece}" if pending else piece
+        if len(pending) >= SEGMENT_MIN_CHARS:
+            segments.append(pending)
+            pending = ''
+    if pending:
+        if segments and len(segments[-1]) + len(pending) <= SEGMENT_MAX_CHARS:
+            segments[-1] = f"{segments[-1]}\n{pending}"
+        else:
+            segments.append(pending)
+
+    while len(segments) > MAX_SEGMENTS:
+        segments = ['\n'.join(segments[i:i + 2]) for i in range(0, len(segments), 2)]
+    return segments
+
+def score_segments(segments: list, damping: float = 0.85, iterations: int = 30) -> np.ndarray:
+    """
+    TextRank over TF-IDF vectors: a segment is informative when it is similar
+    to many other informative segments. All of it is matrix arithmetic, one
+    (segments x vocabulary) matrix and one (segments x segments) similarity.
+    """
+    n = len(segments)
+    if n == 0:
+        return np.zeros(0)
+
+    vocab = {}
+    rows, cols = [], []
+    for i, seg in enumerate(segments):
+        for token in tokenize(seg):
+            rows.append(i)
+            cols.append(vocab.setdefault(token, len(vocab)))
+    if not vocab:
+        return np.ones(n) / n
+
+    # Sparse (segment, term) counts; only the dense matrix below is materialised
+    vocab_size = len(vocab)
+    pairs, counts = np.unique(np.array(rows, dtype=np.int64) * vocab_size + np.array(cols), return_counts=True)
+    seg_idx, term_idx = pairs // vocab_size, pairs % vocab_size
+
+    df = np.bincount(term_idx, minlength=vocab_size)
+    idf = np.log((1 + n) / (1 + df)) + 1.0
+    values = (np.log1p(counts) * idf[term_idx]).astype(np.float32)
+    norms = np.sqrt(np.bincount(seg_idx, weights=values ** 2, minlength=n)).astype(np.float32)
+    values /= np.where(norms == 0, 1.0, norms)[seg_idx]
+
+    # Terms found in a single segment can't make two segments similar: leave them out of the matrix
+    shared = df[term_idx] > 1
+    columns = np.unique(term_idx[shared])
+    weights = np.zeros((n, len(columns)), dtype=np.float32)
+    weights[seg_idx[shared], np.searchsorted(columns, term_idx[shared])] = values[shared]
+
+    similarity = weights @ weights.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # Row-normalise into a transition matrix; isolated segments jump uniformly
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(out_weight > 0, similarity / np.where(out_weight == 0, 1.0, out_weight), 1.0 / n)
+
+    rank = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ rank)
+        if np.abs(updated - rank).sum() < 1e-6:
+            rank = updated
+            break
+        rank = updated
+    return rank
+
+def summarize(text: str, max_tokens: int = None) -> dict:
+    """
+    The most informative segments of `text` that fit in `max_tokens`, in
+    document order, with GAP_MARKER where segments were dropped. Text that
+    already fits is returned unchanged.
+    """
+    max_tokens = max_tokens or SUMMARY_MAX_TOKENS
+    tokens_in = estimate_tokens(text or '')
+    if tokens_in <= max_tokens:
+        return {'text': text, 'summarized': False, 'tokens_in': tokens_in, 'tokens_out': tokens_in,
+                'segments': None, 'segments_kept': None}
+
+    segments = segment(text)
+    scores = score_segments(segments)
+    # The opening segment (title, abstract, pitch) frames everything else; always keep it
+    if len(scores):
+        scores[0] = scores.max() + 1.0
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    marker_cost = len(GAP_MARKER) + 2
+    chosen = []
+    used = 0
+    for i in np.argsort(-scores, kind='stable'):
+        cost = len(segments[i]) + 2 + marker_cost
+        if used + cost > budget:
+            continue
+        chosen.append(int(i))
+        used += cost
+
+    if not chosen:
+        # Not even the best segment fits: keep its head
+        best = int(np.argmax(scores))
+        chosen = [best]
+        segments[best] = segments[best][:max(budget - marker_cost, 0)]
+
+    chosen.sort()
+    parts = []
+    previous = -1
+    for i in chosen:
+        if i != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(segments[i])
+        previous = i
+    if previous != len(segments) - 1:
+        parts.append(GAP_MARKER)
+
+    summary = '\n\n'.join(parts)
+    return {'text': summary, 'summarized': True, 'tokens_in': tokens_in, 'tokens_out': estimate_tokens(summary),
+            'segments': len(segments), 'segments_kept': len(chosen)}
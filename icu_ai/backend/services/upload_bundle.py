@@ -0,0 +1,200 @@
+import io
+import os
+import tarfile
+import zipfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import RequestEntityTooLarge
+from services.upload_streams import HashingFile, MAX_FILE_SIZE, SPOOL_THRESHOLD, spooled_path
+from services.summarizer import summarize, estimate_tokens, SUMMARY_MAX_TOKENS, CHARS_PER_TOKEN
+from services.repo_profile import SKIP_DIRS
+from services.parser_pool import parser_pool
+
+ARCHIVE_EXTENSIONS = ('.zip', '.tar.gz', '.tgz', '.tar')
+DOCUMENT_EXTENSIONS = ('.pdf', '.docx', '.md', '.txt')
+CODE_EXTENSIONS = ('.py', '.js', '.java', '.cpp', '.html', '.css', '.ts', '.tsx', '.jsx')
+
+ARCHIVE_MAX_ENTRIES = int(os.getenv('ARCHIVE_MAX_ENTRIES', 200))
+ARCHIVE_MAX_TOTAL = int(os.getenv('ARCHIVE_MAX_TOTAL_MB', 100)) * 1024 * 1024
+# Uncompressed / compressed size above which an archive is treated as a zip bomb
+ARCHIVE_MAX_RATIO = int(os.getenv('ARCHIVE_MAX_RATIO', 100))
+# Small archives may legitimately compress very well; the ratio limit applies past this much output
+RATIO_GRACE_BYTES = 1024 * 1024
+# Whole bundle budget, shared between files (defaults to the single-document prompt budget)
+BUNDLE_MAX_TOKENS = int(os.getenv('BUNDLE_MAX_TOKENS', SUMMARY_MAX_TOKENS))
+
+CHUNK_SIZE = 64 * 1024
+
+def is_archive(filename: str) -> bool:
+    return (filename or '').lower().endswith(ARCHIVE_EXTENSIONS)
+
+def is_supported(filename: str) -> bool:
+    return (filename or '').lower().endswith(DOCUMENT_EXTENSIONS + CODE_EXTENSIONS)
+
+def _upload_size(file) -> int:
+    path = spooled_path(file)
+    if path:
+        return os.path.getsize(path)
+    position = file.stream.tell()
+    file.stream.seek(0, os.SEEK_END)
+    size = file.stream.tell()
+    file.stream.seek(position)
+    return size
+
+class ArchiveReader:
+    """
+    Streams the entries of an uploaded .zip or .tar(.gz) one at a time
+    without extracting the archive. Every entry is copied into its own
+    spooled file (memory or temp file, like a direct upload) so it can go
+    to the parser pool; the copy is counted against the entry-count,
+    total-size and compression-ratio limits as it happens.
+    """
+
+    def __init__(self, file: FileStorage):
+        self.file = file
+        self.name = file.filename
+        self.compressed_size = max(_upload_size(file), 1)
+        self.entries = 0
+        self.total = 0
+        self.skipped = []  # manifest rows for entries that were not parsed
+
+    def __iter__(self):
+        self.file.stream.seek(0)
+        if self.name.lower().endswith('.zip'):
+            return self._iter_zip()
+        return self._iter_tar()
+
+    def _iter_zip(self):
+        try:
+            archive = zipfile.ZipFile(spooled_path(self.file) or self.file.stream)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Invalid zip archive {self.name}: {str(e)}")
+        with archive:
+            for info in archive.infolist():
+                if info.is_dir() or not self._accept(info.filename, info.file_size):
+                    continue
+                if info.file_size > RATIO_GRACE_BYTES and info.file_size / max(info.compress_size, 1) > ARCHIVE_MAX_RATIO:
+                    raise RequestEntityTooLarge(f"{self.name}: {info.filename} is compressed suspiciously well (possible zip bomb)")
+                with archive.open(info) as source:
+                    yield self._copy(info.filename, source, info.file_size)
+
+    def _iter_tar(self):
+        try:
+            archive = tarfile.open(fileobj=self.file.stream, mode='r|*')
+        except tarfile.TarError as e:
+            raise ValueError(f"Invalid tar archive {self.name}: {str(e)}")
+        with archive:
+            for member in archive:
+                if not member.isfile() or not self._accept(member.name, member.size):
+                    continue
+                yield self._copy(member.name, archive.extractfile(member), member.size)
+
+    def _accept(self, path: str, size: int) -> bool:
+        """Apply the limits to an entry; unsupported or oversized entries are recorded as skipped"""
+        parts = [part for part in path.split('/') if part]
+        if not parts or parts[0] == '__MACOSX' or parts[-1].startswith('.') or any(part in SKIP_DIRS for part in parts[:-1]):
+            return False
+        if is_archive(path) or not is_supported(path):
+            self.skipped.append({'file': f"{self.name}/{path}", 'status': 'skipped', 'reason': 'unsupported file type'})
+            return False
+        if size > MAX_FILE_SIZE:
+            self.skipped.append({'file': f"{self.name}/{path}", 'status': 'skipped', 'reason': 'file too large'})
+            return False
+
+        self.entries += 1
+        if self.entries > ARCHIVE_MAX_ENTRIES:
+            raise RequestEntityTooLarge(f"{self.name} has more than {ARCHIVE_MAX_ENTRIES} supported files")
+        return True
+
+    def _copy(self, path: str, source, size: int) -> FileStorage:
+        """Copy one entry out of the archive, enforcing the total and ratio limits on the actual bytes"""
+        if size > SPOOL_THRESHOLD:
+            target = tempfile.NamedTemporaryFile(mode='w+b', prefix='upload-', dir=os.getenv('UPLOAD_TMP_DIR') or None)
+        else:
+            target = io.BytesIO()
+        stream = HashingFile(target)
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            self.total += len(chunk)
+            if self.total > ARCHIVE_MAX_TOTAL:
+                raise RequestEntityTooLarge(f"{self.name} expands to more than {ARCHIVE_MAX_TOTAL // (1024*1024)}MB")
+            if self.total > RATIO_GRACE_BYTES and self.total > self.compressed_size * ARCHIVE_MAX_RATIO:
+                raise RequestEntityTooLarge(f"{self.name} is compressed suspiciously well (possible zip bomb)")
+            stream.write(chunk)
+        stream.seek(0)
+        return FileStorage(stream=stream, filename=f"{self.name}/{path}")
+
+def _fit(text: str, filename: str, max_tokens: int) -> str:
+    """Shrink one file's text to its share of the bundle budget"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if filename.lower().endswith(CODE_EXTENSIONS):
+        return text[:max_tokens * CHARS_PER_TOKEN] + "\n[...]"
+    return summarize(text, max_tokens)['text']
+
+def _allocate(sizes: list, budget: int) -> list:
+    """Split a token budget between files: small files get all they need, the rest share what's left evenly"""
+    shares = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for position, i in enumerate(order):
+        shares[i] = min(sizes[i], remaining // (len(sizes) - position))
+        remaining -= shares[i]
+    return shares
+
+def build_bundle(files: list, parse, max_tokens: int = None) -> dict:
+    """
+    Parse several uploads and/or archives into one budgeted text bundle.
+
+    `parse(file) -> (text, cached)` is the upload cache's parse. Files are
+    parsed in parallel (up to the parser pool size) while the archives are
+    still being read. Returns the combined text, a per-file manifest and
+    whether every file came from the cache.
+    """
+    max_tokens = max_tokens or BUNDLE_MAX_TOKENS
+    manifest = []
+    opened = []
+
+    def parse_entry(entry):
+        try:
+            text, cached = parse(entry)
+            return {'file': entry.filename, 'status': 'parsed', 'cached': cached}, text
+        except Exception as e:
+            return {'file': entry.filename, 'status': 'error', 'reason': str(e)}, ''
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(parser_pool.size, 1)) as executor:
+            futures = []
+            for file in files:
+                if not is_archive(file.filename):
+                    if len(futures) >= ARCHIVE_MAX_ENTRIES:
+                        raise RequestEntityTooLarge(f"More than {ARCHIVE_MAX_ENTRIES} files in one upload")
+                    futures.append(executor.submit(parse_entry, file))
+                    continue
+                reader = ArchiveReader(file)
+                for entry in reader:
+                    opened.append(entry)
+                    futures.append(executor.submit(parse_entry, entry))
+                manifest.extend(reader.skipped)
+            results = [future.result() for future in futures]
+    finally:
+        for entry in opened:
+            entry.close()
+
+    parsed = [(row, text) for row, text in results if row['status'] == 'parsed' and text.strip()]
+    shares = _allocate([estimate_tokens(text) for _, text in parsed], max_tokens)
+
+    sections = []
+    for (row, text), share in zip(parsed, shares):
+        fitted = _fit(text, row['file'], share)
+        row.update({'chars': len(text), 'tokens': estimate_tokens(fitted), 'condensed': fitted != text})
+        sections.append(f"=== {row['file']} ===\n{fitted}")
+    manifest = [row for row, _ in results] + manifest
+
+    if not parsed:
+        raise ValueError('No readable files found in the upload')
+    return {
+        'text': '\n\n'.join(sections),
+        'manifest': manifest,
+        'cached': all(row.get('cached') for row, _ in parsed)
+    }
@@ -0,0 +1,120 @@
+import os
+import hashlib
+import tempfile
+import threading
+from services.file_parser import parse_file, PARSER_VERSION
+from services.upload_streams import upload_digest
+
+class UploadCache:
+    """
+    On-disk cache of parsed upload text keyed by content hash.
+
+    The key is SHA-256(upload bytes) + PARSER_VERSION + file extension, so
+    a parser change invalidates old entries. Entries are plain files written
+    atomically (shared safely by all workers on the host); a hit refreshes
+    the file's mtime and the oldest-mtime entries are evicted once the
+    directory grows past UPLOAD_CACHE_MB.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('UPLOAD_CACHE_ENABLED', 'true').lower() == 'true'
+        self.directory = os.getenv('UPLOAD_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'icu_ai_upload_cache'))
+        self.max_bytes = int(os.getenv('UPLOAD_CACHE_MB', 256)) * 1024 * 1024
+        self.lock = threading.Lock()
+        self.size = None  # bytes on disk, computed lazily
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key_for(self, file) -> str:
+        extension = os.path.splitext(file.filename.lower())[1]
+        return hashlib.sha256(f"{upload_digest(file)}|{PARSER_VERSION}|{extension}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(path)  # LRU: a hit makes the entry recent again
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        data = text.encode('utf-8')
+
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self.lock:
+            if self.size is None:
+                self.size = self._scan_size()
+            else:
+                self.size += len(data)
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def parse(self, file) -> tuple:
+        """Parsed text for an upload and whether it came from the cache"""
+        if not self.enabled:
+            return parse_file(file), False
+
+        key = self.key_for(file)
+        text = self.get(key)
+        if text is not None:
+            return text, True
+
+        text = parse_file(file)
+        try:
+            self.put(key, text)
+        except OSError as e:
+            print(f"Error writing upload cache: {str(e)}")
+        return text, False
+
+    def _entries(self) -> list:
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.txt')]
+        except OSError:
+            return []
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is at 90% of its limit (caller holds the lock)"""
+        entries = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self._entries()))
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+                self.evictions += 1
+            except OSError:
+                pass
+        self.size = size
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'bytes': self.size
+            }
@@ -0,0 +1,108 @@
+import io
+import os
+import mmap
+import hashlib
+import tempfile
+from functools import wraps
+from flask import Request, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE_MB', 25)) * 1024 * 1024
+# Uploads bigger than this (or of unknown size) go straight to a temp file on disk
+SPOOL_THRESHOLD = int(os.getenv('UPLOAD_SPOOL_THRESHOLD_KB', 512)) * 1024
+
+class HashingFile:
+    """
+    Wraps the file Werkzeug spools an upload into and hashes every chunk as
+    it is written, so the SHA-256 of an upload is known when parsing of the
+    request body finishes, without reading the file a second time. Writing
+    past MAX_FILE_SIZE_MB aborts the upload with 413.
+    """
+
+    def __init__(self, file, max_size: int = None):
+        self._file = file
+        self._sha256 = hashlib.sha256()
+        self.max_size = max_size or MAX_FILE_SIZE
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise RequestEntityTooLarge(f'File too large. Max size: {self.max_size // (1024*1024)}MB')
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+class UploadRequest(Request):
+    """
+    Request class for file uploads: small files stay in memory, larger ones
+    are written to a named temp file as they arrive (deleted when the request
+    closes), and every upload is hashed and size-checked on the way in.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        size = content_length or total_content_length
+        if size is not None and size <= SPOOL_THRESHOLD:
+            return HashingFile(io.BytesIO())
+        return HashingFile(tempfile.NamedTemporaryFile(
+            mode='w+b', prefix='upload-', dir=os.getenv('UPLOAD_TMP_DIR') or None
+        ))
+
+def receive_uploads(f):
+    """
+    Decorator for upload routes: parse the multipart body (spooling files to
+    disk) before the route runs, so size errors become a 413 instead of
+    surfacing inside the route's error handling. Place it below require_auth /
+    optional_auth and rate_limit, so rejected callers never get a body parsed.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.mimetype == 'multipart/form-data':
+            request.files
+        return f(*args, **kwargs)
+    return decorated_function
+
+def upload_digest(file) -> str:
+    """SHA-256 of an uploaded FileStorage (hashes the stream if it wasn't hashed on arrival)"""
+    if isinstance(file.stream, HashingFile):
+        return file.stream.hexdigest()
+
+    sha256 = hashlib.sha256()
+    file.stream.seek(0)
+    for chunk in iter(lambda: file.stream.read(1024 * 1024), b''):
+        sha256.update(chunk)
+    file.stream.seek(0)
+    return sha256.hexdigest()
+
+def spooled_path(file):
+    """Path of the temp file an upload was spooled to, or None if it is in memory"""
+    name = getattr(file.stream, 'name', None)
+    if isinstance(name, str) and os.path.exists(name):
+        file.stream.flush()
+        return name
+    return None
+
+def read_upload_bytes(file, limit: int) -> bytes:
+    """
+    Up to `limit` bytes of an upload without copying the rest: a memory map
+    of the spooled file, or a slice of the in-memory buffer.
+    """
+    path = spooled_path(file)
+    if path:
+        if os.path.getsize(path) == 0:
+            return b''
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return m[:limit]
+
+    file.stream.seek(0)
+    data = file.stream.read(limit)
+    file.stream.seek(0)
+    return data
@@ -0,0 +1,48 @@
+"""
+Test script to verify that large PDFs parsed in the parser pool use the
+shared PDF page pool (more than one page worker)
+"""
+import os
+import io
+
+os.environ['PARSER_POOL_ENABLED'] = 'true'
+os.environ['PDF_EXTRACT_WORKERS'] = '4'
+os.environ['PDF_PARALLEL_MIN_PAGES'] = '16'
+os.environ['PDF_PAGES_PER_TASK'] = '2'
+
+from werkzeug.datastructures import FileStorage
+from benchmarks.make_pdf_corpus import build_pdf
+from services import file_parser, pdf_extraction
+from services.parser_pool import parser_pool
+
+def test_parser_pool_pdf():
+    """Parse a 40 page PDF through parser_pool and check the page workers that read it"""
+    print("=" * 60)
+    print("Testing PDF page parallelism through the parser pool")
+    print("=" * 60)
+
+    data = build_pdf(pages=40, lines=50, words_per_line=13, seed=7)
+
+    try:
+        text = parser_pool.parse('parse_pdf', FileStorage(stream=io.BytesIO(data), filename='report.pdf'))
+        stats = pdf_extraction.pool_stats()
+        print(f"\n[OK] Parsed {len(text)} characters in the parser pool")
+        print(f"[OK] Page pool: {stats}")
+
+        os.environ['PDF_EXTRACT_WORKERS'] = '1'
+        expected = file_parser.parse_pdf(FileStorage(stream=io.BytesIO(data), filename='report.pdf'))
+        assert text == expected, "parser pool text differs from serial extraction"
+        assert stats['ranges'] > 1, "page ranges were not sent to the shared page pool"
+        assert stats['processes_used'] > 1, "only one page worker was used"
+
+        print(f"\n[SUCCESS]! {stats['ranges']} page ranges read by {stats['processes_used']} page workers")
+        return True
+    except Exception as e:
+        print(f"\n[FAILED]!")
+        print(f"Error: {str(e)}")
+        return False
+    finally:
+        parser_pool.shutdown()
+
+if __name__ == "__main__":
+    raise SystemExit(0 if test_parser_pool_pdf() else 1)
@@ -37,10 +37,14 @@ interface SavedProject {
     idea_id?: string;
 }
 
+const SAVED_PAGE_SIZE = 20;
+
 export default function Dashboard() {
     const { user, token } = useAuth();
     const [tasks, setTasks] = useState<Task[]>([]);
     const [savedProjects, setSavedProjects] = useState<SavedProject[]>([]);
+    const [savedCursor, setSavedCursor] = useState<string | null>(null);
+    const [loadingMoreSaved, setLoadingMoreSaved] = useState(false);
     const [loading, setLoading] = useState(true);
     const [activeView, setActiveView] = useState<'grid' | 'list'>('grid');
 
@@ -49,9 +53,15 @@ export default function Dashboard() {
         loadSavedProjects();
     }, []);
 
-    const loadSavedProjects = async () => {
+    // Saved items are cursor paginated: the first page on load, later pages from "Load more"
+    const loadSavedProjects = async (cursor?: string) => {
+        const params = new URLSearchParams({ limit: String(SAVED_PAGE_SIZE) });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        setLoadingMoreSaved(true);
         try {
-            const response = await fetch('http://localhost:5000/api/saved-projects', {
+            const response = await fetch(`http://localhost:5000/api/saved-projects?${params}`, {
                 headers: {
                     'Authorization': `Bearer ${token}`,
                 },
@@ -59,10 +69,14 @@ export default function Dashboard() {
 
             if (response.ok) {
                 const data = await response.json();
-                setSavedProjects(data.saved_projects || []);
+                const page: SavedProject[] = data.saved_projects || [];
+                setSavedProjects(previous => (cursor ? [...previous, ...page] : page));
+                setSavedCursor(data.next_cursor || null);
             }
         } catch (error) {
             console.error('Error loading saved projects:', error);
+        } finally {
+            setLoadingMoreSaved(false);
         }
     };
 
@@ -213,7 +227,7 @@ export default function Dashboard() {
                             <p className="text-gray-400 text-sm">No saved items yet</p>
                         ) : (
                             <div className="space-y-2 max-h-64 overflow-y-auto">
-                                {savedProjects.slice(0, 5).map((saved) => (
+                                {savedProjects.map((saved) => (
                                     <div
                                         key={saved.id}
                                         className="bg-gray-600 bg-opacity-50 rounded p-3 hover:bg-opacity-70 transition cursor-pointer"
@@ -243,10 +257,14 @@ export default function Dashboard() {
                                         </div>
                                     </div>
                                 ))}
-                                {savedProjects.length > 5 && (
-                                    <p className="text-gray-400 text-xs text-center pt-2">
-                                        +{savedProjects.length - 5} more
-                                    </p>
+                                {savedCursor && (
+                                    <button
+                                        className="w-full text-gray-400 hover:text-white text-xs text-center pt-2 transition disabled:opacity-50"
+                                        disabled={loadingMoreSaved}
+                                        onClick={() => loadSavedProjects(savedCursor)}
+                                    >
+                                        {loadingMoreSaved ? 'Loading...' : 'Load more'}
+                                    </button>
                                 )}
                             </div>
                         )}
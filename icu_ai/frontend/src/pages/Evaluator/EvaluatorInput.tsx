@@ -1,7 +1,7 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Upload, FileText, Github, Zap, Loader2 } from 'lucide-react';
-import { evaluateProject, uploadFile, fetchGithubRepo, type ProjectEvaluationRequest } from '../../services/api';
+import { evaluateProject, uploadFiles, fetchGithubRepo, fetchUploadLimits, type ProjectEvaluationRequest, type UploadLimits } from '../../services/api';
 import { useDropzone } from 'react-dropzone';
 
 export default function EvaluatorInput() {
@@ -28,12 +28,24 @@ export default function EvaluatorInput() {
     const [quickSolution, setQuickSolution] = useState('');
     const [quickFeatures, setQuickFeatures] = useState('');
 
+    // Server defaults until GET /api/upload/limits answers
+    const [uploadLimits, setUploadLimits] = useState<UploadLimits>({ max_file_mb: 25, max_request_mb: 100 });
+    useEffect(() => {
+        fetchUploadLimits().then(setUploadLimits).catch(() => undefined);
+    }, []);
+
     const { getRootProps, getInputProps, isDragActive } = useDropzone({
         onDrop: (acceptedFiles) => {
-            setUploadedFiles([...uploadedFiles, ...acceptedFiles]);
+            const files = [...uploadedFiles, ...acceptedFiles];
+            const totalBytes = files.reduce((sum, file) => sum + file.size, 0);
+            if (totalBytes > uploadLimits.max_request_mb * 1024 * 1024) {
+                setError(`Files exceed the ${uploadLimits.max_request_mb}MB upload limit`);
+                return;
+            }
+            setUploadedFiles(files);
         },
         maxFiles: 10,
-        maxSize: 25 * 1024 * 1024, // 25MB
+        maxSize: uploadLimits.max_file_mb * 1024 * 1024,
     });
 
     const handleSubmit = async (e: React.FormEvent) => {
@@ -46,10 +58,8 @@ export default function EvaluatorInput() {
 
             // Handle file uploads
             if (activeTab === 'upload' && uploadedFiles.length > 0) {
-                const fileTexts = await Promise.all(
-                    uploadedFiles.map(file => uploadFile(file))
-                );
-                projectData.description = fileTexts.map(f => f.text).join('\n\n');
+                const bundle = await uploadFiles(uploadedFiles);
+                projectData.description = bundle.text;
             }
 
             // Handle GitHub URL
@@ -243,9 +253,9 @@ export default function EvaluatorInput() {
                             <Upload className="h-12 w-12 mx-auto mb-4 text-gray-400" />
                             <p className="text-lg mb-2">Drag & drop files here, or click to browse</p>
                             <p className="text-sm text-gray-500">
-                                Supported: .md, .txt, .pdf, .docx, code files (.py, .js, etc.)
+                                Supported: .md, .txt, .pdf, .docx, code files (.py, .js, etc.), .zip / .tar.gz archives
                             </p>
-                            <p className="text-sm text-gray-500">Max 10 files, 25MB total</p>
+                            <p className="text-sm text-gray-500">Max 10 files, {uploadLimits.max_file_mb}MB per file, {uploadLimits.max_request_mb}MB total</p>
                         </div>
 
                         {uploadedFiles.length > 0 && (
@@ -1,7 +1,10 @@
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { ChevronRight, ChevronLeft, Loader2 } from 'lucide-react';
-import { generateIdeas, type QuestionnaireData } from '../../services/api';
+import { generateIdeas, speculateIdeas, cancelSpeculation, type QuestionnaireData } from '../../services/api';
+
+// Wait for the answers to settle before asking the server to generate ahead
+const SPECULATE_DEBOUNCE_MS = 1500;
 
 export default function Questionnaire() {
     const navigate = useNavigate();
@@ -32,6 +35,21 @@ export default function Questionnaire() {
 
     const totalSteps = 5;
 
+    // Generate ideas in the background while the rest of the questionnaire is filled in
+    const submitted = useRef(false);
+    useEffect(() => {
+        if (!formData.primary_skill || !formData.primary_goal || !formData.languages?.length) return;
+        const timer = setTimeout(() => {
+            speculateIdeas(formData).catch(() => undefined); // best effort; submit generates anyway
+        }, SPECULATE_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [formData]);
+
+    // Leaving without submitting: let the server drop the speculation
+    useEffect(() => () => {
+        if (!submitted.current) cancelSpeculation().catch(() => undefined);
+    }, []);
+
     const validateStep = (step: number): string | null => {
         switch (step) {
             case 1:
@@ -80,10 +98,12 @@ export default function Questionnaire() {
                 return;
             }
 
+            submitted.current = true;
             const result = await generateIdeas(formData as QuestionnaireData);
             navigate(`/ideas/${result.id}`, { state: { ideas: result } });
 
         } catch (err: any) {
+            submitted.current = false;
             setError(err.response?.data?.error || err.message || 'Failed to generate ideas');
         } finally {
             setLoading(false);
@@ -9,6 +9,16 @@ const api = axios.create({
     },
 });
 
+// Send the logged-in user's token on every request, so rate limits apply per user and plan
+// instead of per IP (calls that pass their own Authorization header keep it)
+api.interceptors.request.use((config) => {
+    const token = localStorage.getItem('auth_token');
+    if (token && !config.headers.Authorization) {
+        config.headers.Authorization = `Bearer ${token}`;
+    }
+    return config;
+});
+
 export interface ProjectEvaluationRequest {
     name: string;
     description: string;
@@ -136,6 +146,20 @@ export const generateIdeas = async (data: QuestionnaireData): Promise<IdeaRespon
     return response.data;
 };
 
+export type SpeculationStatus = 'started' | 'running' | 'ready' | 'waiting_for_fields' | 'cap_reached';
+
+// Start generating ideas from the answers so far; the final generateIdeas call reuses the result
+export const speculateIdeas = async (data: Partial<QuestionnaireData>): Promise<{ status: SpeculationStatus }> => {
+    const response = await api.post('/api/generate-ideas/speculate', data, {
+        validateStatus: (status) => status < 300 || status === 429,
+    });
+    return response.data;
+};
+
+export const cancelSpeculation = async (): Promise<void> => {
+    await api.delete('/api/generate-ideas/speculate');
+};
+
 export const uploadFile = async (file: File): Promise<{ text: string }> => {
     const formData = new FormData();
     formData.append('file', file);
@@ -147,7 +171,40 @@ export const uploadFile = async (file: File): Promise<{ text: string }> => {
     return response.data;
 };
 
-export const fetchGithubRepo = async (url: string): Promise<{ readme: string; languages: string[] }> => {
+export interface UploadManifestEntry {
+    file: string;
+    status: 'parsed' | 'skipped' | 'error';
+    reason?: string;
+    cached?: boolean;
+    chars?: number;
+    tokens?: number;
+    condensed?: boolean;
+}
+
+// Several files and/or .zip / .tar.gz archives parsed into one budgeted text bundle
+export const uploadFiles = async (files: File[]): Promise<{ text: string; cached: boolean; manifest?: UploadManifestEntry[] }> => {
+    const formData = new FormData();
+    files.forEach(file => formData.append('file', file));
+    const response = await api.post('/api/upload', formData, {
+        headers: {
+            'Content-Type': 'multipart/form-data',
+        },
+    });
+    return response.data;
+};
+
+// Size limits the server enforces on /api/upload (MAX_FILE_SIZE_MB, MAX_REQUEST_SIZE_MB)
+export interface UploadLimits {
+    max_file_mb: number;
+    max_request_mb: number;
+}
+
+export const fetchUploadLimits = async (): Promise<UploadLimits> => {
+    const response = await api.get('/api/upload/limits');
+    return response.data;
+};
+
+export const fetchGithubRepo = async (url: string): Promise<{ readme: string; languages: string[]; profile?: Record<string, unknown> | null }> => {
     const response = await api.post('/api/github-fetch', { url });
     return response.data;
 };
@@ -180,7 +237,7 @@ export const saveProject = async (data: {
     return response.data;
 };
 
-export const getSavedProjects = async (token: string): Promise<{
+export const getSavedProjects = async (token: string, cursor?: string, limit?: number): Promise<{
     saved_projects: Array<{
         id: string;
         type: string;
@@ -188,8 +245,10 @@ export const getSavedProjects = async (token: string): Promise<{
         created_at: string;
         task_id?: string;
     }>;
+    next_cursor: string | null;
 }> => {
     const response = await api.get('/api/saved-projects', {
+        params: { cursor, limit },
         headers: {
             'Authorization': `Bearer ${token}`,
         },